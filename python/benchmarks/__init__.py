@@ -0,0 +1,6 @@
+"""
+SDK-side performance benchmarks, they don't need Applitools server.
+
+Every module is runnable, e.g. ``python -m benchmarks.json_codec``
+from the ``python`` directory.
+"""
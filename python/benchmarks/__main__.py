@@ -0,0 +1,106 @@
+"""
+Runs benchmark scenarios against the fake universal server.
+
+Results are saved as json files to benchmarks/results (or --save directory)
+and can be compared with a previous run::
+
+    python -m benchmarks
+    python -m benchmarks --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from .scenarios import DEFAULT_PARAMETERS, QUICK_PARAMETERS, SCENARIOS
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def run(names, quick=False):
+    # type: (list, bool) -> dict
+    parameters = QUICK_PARAMETERS if quick else DEFAULT_PARAMETERS
+    # silence test results printed by Eyes.close
+    with redirect_stdout(io.StringIO()):
+        return {name: SCENARIOS[name](**parameters[name]) for name in names}
+
+
+def environment():
+    # type: () -> dict
+    try:
+        revision = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(__file__),
+            stderr=subprocess.DEVNULL,
+        )
+        revision = revision.decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def save(report, directory):
+    # type: (dict, str) -> str
+    os.makedirs(directory, exist_ok=True)
+    name = "{}-{}.json".format(
+        report["environment"]["date"].replace(":", ""),
+        report["environment"]["revision"] or "unknown",
+    )
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return path
+
+
+def format_results(results, baseline=None):
+    # type: (dict, dict) -> str
+    lines = []
+    for scenario, values in sorted(results.items()):
+        for metric, value in sorted(values.items()):
+            line = "{:<28} {:<36} {:>14.3f}".format(scenario, metric, value)
+            previous = (baseline or {}).get(scenario, {}).get(metric)
+            if previous:
+                line += " {:>+8.1f}%".format((value - previous) / previous * 100)
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Measures SDK-side overhead without Applitools server."
+    )
+    parser.add_argument(
+        "scenarios", nargs="*", choices=[[]] + sorted(SCENARIOS), default=[]
+    )
+    parser.add_argument("--quick", action="store_true", help="smoke run")
+    parser.add_argument("--save", default=RESULTS_DIR, help="results directory")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--compare", help="results file of a previous run")
+    args = parser.parse_args(args)
+
+    report = {
+        "environment": environment(),
+        "results": run(args.scenarios or sorted(SCENARIOS), args.quick),
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print(format_results(report["results"], baseline))
+    if not args.no_save and not args.quick:
+        print("Saved to", save(report, args.save), file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    main()
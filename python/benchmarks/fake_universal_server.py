@@ -0,0 +1,285 @@
+"""
+In-process stand-in of the universal server for SDK-side benchmarks.
+
+It speaks just enough of the websocket protocol and of the universal server
+commands to run Eyes without Applitools backend, answering with canned
+results::
+
+    with FakeUniversalServer() as server, server.installed():
+        runner = ClassicRunner()  # connected to the fake server
+"""
+import json
+import os
+import socket
+import struct
+from base64 import b64encode
+from contextlib import contextmanager
+from hashlib import sha1
+from threading import Condition, Lock, Thread, Timer
+from uuid import uuid4
+
+from applitools.selenium import command_executor, connection
+
+from .payloads import close_manager_result, test_results_payload
+
+_WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OPCODE_TEXT = 0x1
+_OPCODE_BINARY = 0x2
+_OPCODE_CLOSE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+
+
+class FakeUniversalServer(object):
+    """Listens on localhost, each client connection is served by its own thread.
+
+    The server object can be passed to USDKConnection.create as it provides
+    the `port` and `socket_path` attributes, or installed as the default
+    universal server. With socket_path it listens on a unix domain socket
+    instead of a TCP port.
+    """
+
+    def __init__(self, steps_per_test=20, socket_path=None, close_delay=0):
+        # type: (int, str, float) -> None
+        """With close_delay, Eyes.close and Eyes.abort are answered after it,
+        as if their tests were rendered meanwhile, and closeManager waits for
+        them the same way the real server waits for unfinished tests."""
+        self.steps_per_test = steps_per_test
+        self.close_delay = close_delay
+        self.commands = {}  # command name -> number of received commands
+        self.closed_results = []  # results of Eyes.close and Eyes.abort
+        self._user_test_ids = {}  # eyes ref id -> userTestId sent by openEyes
+        # Size of image targets of the commands, base64 images or file paths
+        self.received_image_bytes = 0
+        self._unfinished = Condition()
+        self._unfinished_closes = 0
+        self.port = self.socket_path = None
+        if socket_path:
+            self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._listener.bind(socket_path)
+            self.socket_path = socket_path
+        else:
+            self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._listener.bind(("127.0.0.1", 0))
+            self.port = self._listener.getsockname()[1]
+        self._listener.listen(16)
+        self._accept_thread = Thread(target=self._accept_loop, name="Fake USDK")
+        self._accept_thread.daemon = True
+        self._accept_thread.start()
+
+    def close(self):
+        self._listener.close()
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def installed(self):
+        """Makes runners and Eyes created in the context use this server."""
+        get_instance = connection.get_instance
+        instances = dict(command_executor._instances)
+        connection.get_instance = lambda: self
+        command_executor._instances.clear()
+        try:
+            yield self
+        finally:
+            connection.get_instance = get_instance
+            command_executor._instances.clear()
+            command_executor._instances.update(instances)
+
+    def respond(self, name, payload):
+        # type: (str, dict) -> object
+        """Returns the result of a command, raised exceptions are sent as errors."""
+        if name == "Core.makeManager":
+            return {"applitools-ref-id": str(uuid4())}
+        elif name == "EyesManager.openEyes":
+            ref_id = str(uuid4())
+            open_config = (payload.get("config") or {}).get("open", {})
+            self._user_test_ids[ref_id] = open_config.get("userTestId")
+            return {"applitools-ref-id": ref_id}
+        elif name == "Eyes.check":
+            return [{"asExpected": True, "windowId": str(uuid4())}]
+        elif name in ("Eyes.close", "Eyes.abort"):
+            # delayed closes are answered by several timer threads at once
+            with self._unfinished:
+                result = test_results_payload(
+                    self.steps_per_test, "Test {}".format(len(self.closed_results))
+                )
+                self.closed_results.append(result)
+            ref_id = payload["eyes"]["applitools-ref-id"]
+            result["userTestId"] = self._user_test_ids.get(ref_id) or str(uuid4())
+            return [result]
+        elif name == "EyesManager.closeManager":
+            with self._unfinished:
+                while self._unfinished_closes:
+                    self._unfinished.wait()
+            summary = close_manager_result(1, self.steps_per_test)
+            if self.closed_results:
+                renderer = summary["results"][0]["renderer"]
+                summary["results"] = [
+                    {"result": r, "renderer": renderer, "userTestId": r["userTestId"]}
+                    for r in self.closed_results
+                ]
+                summary["passed"] = len(self.closed_results)
+            return summary
+        elif name == "Server.getInfo":
+            return {"logsDir": "/tmp"}
+        else:
+            return None
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                break
+            thread = Thread(target=self._serve, args=(client,), name="Fake USDK Client")
+            thread.daemon = True
+            thread.start()
+
+    def _serve(self, client):
+        # type: (socket.socket) -> None
+        if client.family != socket.AF_UNIX:
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        stream = client.makefile("rb")
+        lock = Lock()  # delayed responses are written by other threads
+        try:
+            _handshake(client, stream)
+            while True:
+                opcode, data = _read_frame(stream)
+                if opcode == _OPCODE_CLOSE:
+                    with lock:
+                        _write_frame(client, _OPCODE_CLOSE, data)
+                    break
+                elif opcode == _OPCODE_PING:
+                    with lock:
+                        _write_frame(client, _OPCODE_PONG, data)
+                elif opcode in (_OPCODE_TEXT, _OPCODE_BINARY):
+                    self._handle(client, lock, json.loads(data))
+        except (EOFError, OSError):
+            pass
+        finally:
+            stream.close()
+            client.close()
+
+    def _handle(self, client, lock, message):
+        # type: (socket.socket, Lock, dict) -> None
+        name = message["name"]
+        self.commands[name] = self.commands.get(name, 0) + 1
+        target = message.get("payload", {}).get("target")
+        if isinstance(target, dict) and "image" in target:
+            self.received_image_bytes += len(target["image"])
+        if "key" not in message:
+            return
+        if self.close_delay and name in ("Eyes.close", "Eyes.abort"):
+            with self._unfinished:
+                self._unfinished_closes += 1
+            timer = Timer(
+                self.close_delay, self._respond_closed, (client, lock, message)
+            )
+            timer.daemon = True
+            timer.start()
+        elif name == "EyesManager.closeManager":
+            # Does not block the client connection, closes are answered meanwhile
+            thread = Thread(target=self._respond, args=(client, lock, message))
+            thread.daemon = True
+            thread.start()
+        else:
+            self._respond(client, lock, message)
+
+    def _respond_closed(self, client, lock, message):
+        try:
+            self._respond(client, lock, message)
+        finally:
+            with self._unfinished:
+                self._unfinished_closes -= 1
+                self._unfinished.notify_all()
+
+    def _respond(self, client, lock, message):
+        # type: (socket.socket, Lock, dict) -> None
+        name = message["name"]
+        response = {"name": name, "key": message["key"], "payload": {}}
+        try:
+            result = self.respond(name, message["payload"])
+        except Exception as exc:  # reported the same way as the real server does
+            response["payload"]["error"] = {"message": str(exc), "stack": repr(exc)}
+        else:
+            if result is not None:
+                response["payload"]["result"] = result
+        try:
+            with lock:
+                _write_frame(client, _OPCODE_TEXT, json.dumps(response).encode("utf-8"))
+        except OSError:
+            pass  # the client has disconnected meanwhile
+
+
+def _handshake(client, stream):
+    key = None
+    while True:
+        line = stream.readline()
+        if not line:
+            raise EOFError
+        if line in (b"\r\n", b"\n"):
+            break
+        header, _, value = line.partition(b":")
+        if header.strip().lower() == b"sec-websocket-key":
+            key = value.strip()
+    accept = b64encode(sha1(key + _WEBSOCKET_GUID).digest())
+    client.sendall(
+        b"HTTP/1.1 101 Switching Protocols\r\n"
+        b"Upgrade: websocket\r\n"
+        b"Connection: Upgrade\r\n"
+        b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+    )
+
+
+def _read_exactly(stream, size):
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError
+    return data
+
+
+def _read_frame(stream):
+    """Reads a message, continuation frames are joined."""
+    chunks, opcode = [], None
+    while True:
+        first, second = _read_exactly(stream, 2)
+        if first & 0x0F:  # continuation frames have zero opcode
+            opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", _read_exactly(stream, 2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", _read_exactly(stream, 8))
+        mask = _read_exactly(stream, 4) if second & 0x80 else None
+        data = _read_exactly(stream, length)
+        if mask:
+            data = _unmask(data, mask)
+        chunks.append(data)
+        if first & 0x80:
+            return opcode, b"".join(chunks)
+
+
+def _unmask(data, mask):
+    # XOR of big integers is much faster than a byte by byte python loop
+    repeated = (mask * (len(data) // 4 + 1))[: len(data)]
+    unmasked = int.from_bytes(data, "big") ^ int.from_bytes(repeated, "big")
+    return unmasked.to_bytes(len(data), "big")
+
+
+def _write_frame(client, opcode, data):
+    length = len(data)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    client.sendall(header + data)
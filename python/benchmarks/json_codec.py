@@ -0,0 +1,48 @@
+"""
+Compares JSON codecs of the USDK connection on representative payloads.
+
+Every case includes the conversion to or from the bytes of websocket frame,
+the way USDKConnection sends and receives the messages::
+
+    python -m benchmarks.json_codec [--number N] [--repeat N]
+"""
+import argparse
+import timeit
+
+from applitools.selenium.json_codec import available_codecs
+
+from .payloads import check_payload, close_manager_response
+
+
+def _to_bytes(data):
+    return data if isinstance(data, bytes) else data.encode("utf-8")
+
+
+def measure(codec, number, repeat):
+    # type: (...) -> dict
+    check = check_payload()
+    close_manager = _to_bytes(codec.dumps(close_manager_response()))
+    cases = {
+        "dumps Eyes.check": lambda: _to_bytes(codec.dumps(check)),
+        "loads EyesManager.closeManager": lambda: codec.loads(close_manager),
+    }
+    return {
+        case: min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        for case, func in cases.items()
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(args)
+
+    print("{:<8} {:<32} {:>10}".format("codec", "case", "ms"))
+    for name, codec in sorted(available_codecs().items()):
+        for case, seconds in measure(codec, args.number, args.repeat).items():
+            print("{:<8} {:<32} {:>10.3f}".format(name, case, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Representative universal server command payloads."""
+from base64 import b64encode
+from os import urandom
+from uuid import uuid4
+
+
+def check_payload(image_size=2 * 1024 * 1024):
+    # type: (int) -> dict
+    """Eyes.check command of eyes-images with base64 encoded image."""
+    from applitools.common.selenium import Configuration
+    from applitools.images import Target
+    from applitools.selenium.schema import (
+        marshal_check_settings,
+        marshal_configuration,
+        marshal_image_target,
+    )
+
+    config = Configuration(app_name="Benchmark", test_name="Check")
+    image = b64encode(urandom(image_size)).decode("ascii")
+    check_settings = Target.image(image).with_name("Step")
+    return {
+        "name": "Eyes.check",
+        "key": str(uuid4()),
+        "payload": {
+            "eyes": {"applitools-ref-id": str(uuid4())},
+            "target": marshal_image_target(image),
+            "settings": marshal_check_settings(check_settings),
+            "config": marshal_configuration(config),
+        },
+    }
+
+
+def test_results_payload(steps=20, name="Test"):
+    # type: (int, str) -> dict
+    """TestResults as returned by the universal server."""
+    session = "https://eyes.applitools.com/app/batches/{}/{}".format(
+        uuid4().int, uuid4().int
+    )
+    api = "https://eyesapi.applitools.com/api/sessions/batches/{}".format(uuid4().int)
+    return {
+        "id": str(uuid4()),
+        "name": name,
+        "secretToken": uuid4().hex,
+        "status": "Passed",
+        "appName": "Benchmark",
+        "batchName": "Benchmark",
+        "batchId": str(uuid4()),
+        "branchName": "default",
+        "hostOS": "Linux",
+        "hostApp": "Chrome",
+        "hostDisplaySize": {"width": 1280, "height": 800},
+        "startedAt": "2022-11-07T12:00:00.000Z",
+        "duration": 42,
+        "isNew": False,
+        "isDifferent": False,
+        "isAborted": False,
+        "isEmpty": False,
+        "appUrls": {"batch": session, "session": session},
+        "apiUrls": {"batch": api, "session": api},
+        "steps": steps,
+        "matches": steps,
+        "mismatches": 0,
+        "missing": 0,
+        "exactMatches": 0,
+        "strictMatches": steps,
+        "contentMatches": 0,
+        "layoutMatches": 0,
+        "noneMatches": 0,
+        "url": session,
+        "stepsInfo": [
+            {
+                "name": "Step {}".format(i),
+                "isDifferent": False,
+                "hasBaselineImage": True,
+                "hasCurrentImage": True,
+                "hasCheckpointImage": True,
+                "apiUrls": {
+                    "baselineImage": "{}/steps/{}/images/baseline".format(api, i),
+                    "currentImage": "{}/steps/{}/images/checkpoint".format(api, i),
+                    "checkpointImage": "{}/steps/{}/images/checkpoint".format(api, i),
+                    "checkpointImageThumbnail": "{}/steps/{}/thumbnail".format(api, i),
+                    "diffImage": "{}/steps/{}/images/diff".format(api, i),
+                },
+                "appUrls": {
+                    "step": "{}/steps/{}".format(session, i),
+                    "stepEditor": "{}/steps/{}/edit".format(session, i),
+                },
+            }
+            for i in range(1, steps + 1)
+        ],
+    }
+
+
+def close_manager_result(tests=50, steps=20):
+    # type: (int, int) -> dict
+    """EyesManager.closeManager response result."""
+    return {
+        "results": [
+            {
+                "result": test_results_payload(steps, "Test {}".format(i)),
+                "renderer": {"name": "chrome", "width": 1280, "height": 800},
+                "userTestId": str(uuid4()),
+            }
+            for i in range(tests)
+        ],
+        "passed": tests,
+        "unresolved": 0,
+        "failed": 0,
+        "exceptions": 0,
+        "mismatches": 0,
+        "missing": 0,
+        "matches": tests * steps,
+    }
+
+
+def close_manager_response(tests=50, steps=20):
+    # type: (int, int) -> dict
+    return {
+        "name": "EyesManager.closeManager",
+        "key": str(uuid4()),
+        "payload": {"result": close_manager_result(tests, steps)},
+    }
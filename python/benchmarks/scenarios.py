@@ -0,0 +1,422 @@
+"""
+Benchmark scenarios, each returns a flat dict of measured values.
+
+Every value name ends with its unit so results of different runs can be
+compared without knowing the scenario internals.
+"""
+import gc
+import os
+import socket
+import tempfile
+import timeit
+import tracemalloc
+from io import BytesIO
+from os import urandom
+from time import perf_counter
+
+from PIL import Image
+
+from applitools.common import AccessibilityRegionType
+from applitools.common import Configuration as BaseConfiguration
+from applitools.common import (
+    FloatingBounds,
+    FloatingMatchSettings,
+    FrozenFloatingMatchSettings,
+    FrozenPoint,
+    FrozenRegion,
+    ImageMatchSettings,
+    Point,
+    Region,
+)
+from applitools.common.selenium import BrowserType, Configuration, ImageTransfer
+from applitools.images import Eyes as ImagesEyes
+from applitools.images import Target as ImagesTarget
+from applitools.images import image_cache
+from applitools.selenium import ClassicRunner
+from applitools.selenium import Eyes as SeleniumEyes
+from applitools.selenium import Target, schema
+from applitools.selenium.schema import (
+    ConfigurationMarshaler,
+    demarshal_close_manager_results,
+    marshal_check_settings,
+    marshal_configuration,
+)
+from applitools.selenium.schema_compiler import compile_dumper, compile_loader
+from applitools.selenium.schema_fields import check_error
+
+from .fake_universal_server import FakeUniversalServer
+from .payloads import close_manager_result
+
+# Number of iterations, sizes etc. of every scenario, overridden in quick runs
+DEFAULT_PARAMETERS = {
+    "images_check_throughput": {"checks": 30, "width": 1280, "height": 800},
+    "selenium_check_throughput": {"checks": 300},
+    "marshaling": {"number": 500},
+    "memory_per_open_eyes": {"eyes": 50},
+    "close_manager_demarshal": {"tests": 50, "steps": 20, "number": 5},
+    "transport_throughput": {"checks": 20, "width": 1920, "height": 1080},
+    "check_settings_regions": {"regions": 300, "number": 20},
+    "repeated_image_checks": {"checks": 20, "width": 1920, "height": 1080},
+    "png_encoding": {"width": 1920, "height": 1080, "number": 3},
+    "geometry_objects": {"objects": 100000},
+    "configuration_clone": {"browsers": 40, "number": 200},
+}
+QUICK_PARAMETERS = {
+    "images_check_throughput": {"checks": 2, "width": 64, "height": 64},
+    "selenium_check_throughput": {"checks": 5},
+    "marshaling": {"number": 5},
+    "memory_per_open_eyes": {"eyes": 2},
+    "close_manager_demarshal": {"tests": 2, "steps": 2, "number": 1},
+    "transport_throughput": {"checks": 2, "width": 64, "height": 64},
+    "check_settings_regions": {"regions": 3, "number": 1},
+    "repeated_image_checks": {"checks": 2, "width": 64, "height": 64},
+    "png_encoding": {"width": 64, "height": 64, "number": 1},
+    "geometry_objects": {"objects": 100},
+    "configuration_clone": {"browsers": 2, "number": 2},
+}
+
+
+class FakeDriver(object):
+    """Has only the attributes needed to reference selenium driver."""
+
+    class _CommandExecutor(object):
+        _url = "http://localhost:4444/wd/hub"
+
+    session_id = "benchmark-session"
+    command_executor = _CommandExecutor()
+    capabilities = {"browserName": "chrome", "platformName": "linux"}
+
+
+def png_image(width, height):
+    # type: (int, int) -> bytes
+    """Noise PNG, so its compression ratio is close to a real screenshot."""
+    image = Image.frombytes("RGB", (width, height), urandom(width * height * 3))
+    stream = BytesIO()
+    image.save(stream, format="PNG")
+    return stream.getvalue()
+
+
+def rich_check_settings():
+    """Selenium check settings with several regions of every kind."""
+    regions = [Region(10 * i, 10 * i, 100, 50) for i in range(10)]
+    return (
+        Target.window()
+        .fully()
+        .with_name("Step")
+        .ignore(*regions)
+        .layout(*regions)
+        .strict(*regions)
+        .content(*regions)
+        .floating(5, *regions[:3])
+        .ignore_displacements()
+    )
+
+
+def rich_configuration():
+    config = Configuration(app_name="Benchmark", test_name="Marshaling")
+    config.add_property("team", "benchmark")
+    for width in range(800, 1600, 100):
+        config.add_browser(width, 800, BrowserType.CHROME)
+    return config
+
+
+def images_check_throughput(checks, width, height):
+    image = png_image(width, height)
+    results = {"image_bytes": len(image)}
+    with FakeUniversalServer() as server, server.installed():
+        for transfer in ImageTransfer:
+            eyes = ImagesEyes()
+            eyes.configure.set_image_transfer(transfer)
+            eyes.open("Benchmark", "Images check throughput")
+            started = perf_counter()
+            for _ in range(checks):
+                eyes.check("Step", ImagesTarget.image(image))
+            elapsed = perf_counter() - started
+            eyes.close(False)
+            key = "checks_{}_per_second".format(transfer.value.replace("-", "_"))
+            results[key] = checks / elapsed
+    return results
+
+
+def selenium_check_throughput(checks):
+    with FakeUniversalServer() as server, server.installed():
+        eyes = SeleniumEyes(ClassicRunner())
+        eyes.open(FakeDriver(), "Benchmark", "Selenium check throughput")
+        started = perf_counter()
+        for _ in range(checks):
+            eyes.check(rich_check_settings())
+        elapsed = perf_counter() - started
+        eyes.close(False)
+    return {"checks_per_second": checks / elapsed}
+
+
+def marshaling(number):
+    config = rich_configuration()
+    marshaler = ConfigurationMarshaler()
+    check_settings = rich_check_settings()
+
+    def per_call_us(func):
+        return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+    return {
+        "configuration_us": per_call_us(lambda: marshal_configuration(config)),
+        "cached_configuration_us": per_call_us(lambda: marshaler(config)),
+        "check_settings_us": per_call_us(
+            lambda: marshal_check_settings(check_settings)
+        ),
+    }
+
+
+def memory_per_open_eyes(eyes):
+    results = {}
+    with FakeUniversalServer() as server, server.installed():
+        runner = ClassicRunner()
+        opened = []
+
+        def open_selenium_eyes():
+            selenium_eyes = SeleniumEyes(runner)
+            selenium_eyes.open(FakeDriver(), "Benchmark", "Memory")
+            return selenium_eyes
+
+        def open_images_eyes():
+            images_eyes = ImagesEyes()
+            images_eyes.open("Benchmark", "Memory")
+            return images_eyes
+
+        for name, open_eyes in (
+            ("selenium", open_selenium_eyes),
+            ("images", open_images_eyes),
+        ):
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            opened.extend(open_eyes() for _ in range(eyes))
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            allocated = sum(s.size_diff for s in after.compare_to(before, "filename"))
+            results["{}_bytes_per_eyes".format(name)] = allocated / eyes
+        for opened_eyes in opened:
+            opened_eyes.abort()
+    return results
+
+
+def close_manager_demarshal(tests, steps, number):
+    result = close_manager_result(tests, steps)
+    config = BaseConfiguration()
+
+    def per_call_ms(func):
+        return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+    return {
+        "demarshal_ms": per_call_ms(
+            lambda: demarshal_close_manager_results(result, config)
+        ),
+        "lazy_demarshal_ms": per_call_ms(
+            lambda: demarshal_close_manager_results(result, config, lazy=True)
+        ),
+    }
+
+
+def transport_throughput(checks, width, height):
+    """Base64 encoded screenshots sent over TCP loopback and unix socket."""
+    image = png_image(width, height)
+    results = {"image_bytes": len(image)}
+    transports = [("tcp", None)]
+    if hasattr(socket, "AF_UNIX"):
+        directory = tempfile.mkdtemp()
+        transports.append(("uds", os.path.join(directory, "usdk.sock")))
+    for transport, socket_path in transports:
+        with FakeUniversalServer(socket_path=socket_path) as server:
+            with server.installed():
+                eyes = ImagesEyes()
+                eyes.open("Benchmark", "Transport throughput")
+                started = perf_counter()
+                for _ in range(checks):
+                    eyes.check("Step", ImagesTarget.image(image))
+                elapsed = perf_counter() - started
+                eyes.close(False)
+        results["checks_{}_per_second".format(transport)] = checks / elapsed
+        results["{}_megabytes_per_second".format(transport)] = (
+            checks * len(image) / elapsed / 1e6
+        )
+    if len(transports) > 1:
+        os.rmdir(directory)
+    return results
+
+
+def check_settings_regions(regions, number):
+    """Marshmallow and compiled schemas on check settings with many regions."""
+    boxes = [Region(i % 1000, i // 1000 * 10, 20, 10) for i in range(regions)]
+    check_settings = (
+        Target.window().with_name("Step").ignore(*boxes).floating(5, *boxes)
+    )
+    for box in boxes:
+        check_settings.accessibility(box, AccessibilityRegionType.RegularText)
+    check_settings = check_settings.values
+    dump = compile_dumper(schema.CheckSettings)
+    result = close_manager_result(regions // 10 or 1, 10)
+    load = compile_loader(schema.TestResultsSummary)
+
+    def per_call_us(func):
+        return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+    return {
+        "marshmallow_dump_us": per_call_us(
+            lambda: check_error(schema.CheckSettings().dump(check_settings))
+        ),
+        "compiled_dump_us": per_call_us(lambda: dump(check_settings)),
+        "marshmallow_load_us": per_call_us(
+            lambda: check_error(schema.TestResultsSummary().load(result))
+        ),
+        "compiled_load_us": per_call_us(lambda: load(result)),
+    }
+
+
+def repeated_image_checks(checks, width, height):
+    """Same PIL image checked repeatedly, without and with the image caches."""
+    image = Image.frombytes("RGB", (width, height), urandom(width * height * 3))
+    results = {}
+    max_size = image_cache.encoded_images.max_size
+    cached_size = image_cache.DEFAULT_IMAGE_CACHE_SIZE
+    for name, transfer, cache_size in (
+        ("uncached", ImageTransfer.BASE64, 0),
+        ("cached", ImageTransfer.BASE64, cached_size),
+        ("content_addressed", ImageTransfer.CONTENT_ADDRESSED, cached_size),
+    ):
+        image_cache.encoded_images.max_size = cache_size
+        try:
+            with FakeUniversalServer() as server, server.installed():
+                eyes = ImagesEyes()
+                eyes.configure.set_image_transfer(transfer)
+                eyes.open("Benchmark", "Repeated image checks")
+                started = perf_counter()
+                for i in range(checks):
+                    eyes.check("Step {}".format(i), ImagesTarget.image(image))
+                elapsed = perf_counter() - started
+                eyes.close(False)
+        finally:
+            image_cache.encoded_images.max_size = max_size
+            image_cache.encoded_images.clear()
+            image_cache.image_files.clear()
+        results["{}_checks_per_second".format(name)] = checks / elapsed
+        results["{}_sent_megabytes".format(name)] = server.received_image_bytes / 1e6
+    return results
+
+
+def png_encoding(width, height, number):
+    """Pillow and numpy array encoders at several compression levels."""
+    try:
+        import numpy
+    except ImportError:
+        return {}
+    from applitools.images.png import encode_png
+
+    # Flat areas with text-like noise, compresses like a real screenshot
+    array = numpy.full((height, width, 3), 240, numpy.uint8)
+    noise = numpy.frombuffer(urandom(height * width // 4 * 3), numpy.uint8)
+    array[: height // 2, : width // 2] = noise.reshape(height // 2, width // 2, 3)
+    image = Image.fromarray(array)
+    encoders = [
+        ("pil_level_{}".format(level), lambda level=level: _pil_png(image, level))
+        for level in (1, 6)
+    ] + [
+        (
+            "array_level_{}_threads_{}".format(level, threads),
+            lambda level=level, threads=threads: encode_png(array, level, threads),
+        )
+        for level in (1, 6, 9)
+        for threads in (1, 4)
+    ]
+    results = {}
+    for name, encode in encoders:
+        elapsed = min(timeit.repeat(encode, number=number, repeat=3)) / number
+        results[name + "_ms"] = elapsed * 1000
+        results[name + "_kilobytes"] = len(encode()) / 1e3
+    return results
+
+
+def _pil_png(image, level):
+    stream = BytesIO()
+    image.save(stream, format="PNG", compress_level=level)
+    return stream.getvalue()
+
+
+def geometry_objects(objects):
+    """Memory and creation time of geometry and match settings objects."""
+    bounds = FloatingBounds(1, 2, 3, 4)
+    # same small coordinates, so only the objects themselves are measured
+    factories = [
+        ("point", lambda: Point(1, 2)),
+        ("frozen_point", lambda: FrozenPoint(1, 2)),
+        ("region", lambda: Region(1, 2, 3, 4)),
+        ("frozen_region", lambda: FrozenRegion(1, 2, 3, 4)),
+        (
+            "floating_match_settings",
+            lambda: FloatingMatchSettings(Region(1, 2, 3, 4), bounds),
+        ),
+        (
+            "frozen_floating_match_settings",
+            lambda: FrozenFloatingMatchSettings(Region(1, 2, 3, 4), bounds),
+        ),
+        ("image_match_settings", ImageMatchSettings),
+    ]
+    results = {}
+    for name, factory in factories:
+        gc.collect()
+        tracemalloc.start()
+        created = [factory() for _ in range(objects)]
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del created
+        elapsed = min(timeit.repeat(factory, number=objects, repeat=3))
+        results[name + "_bytes"] = allocated / objects
+        results[name + "_create_us"] = elapsed / objects * 1e6
+    region = Region(1, 2, 3, 4)
+    number = objects * 10
+    results["region_item_access_ns"] = (
+        min(timeit.repeat(lambda: region["width"], number=number, repeat=3))
+        / number
+        * 1e9
+    )
+    return results
+
+
+def configuration_clone(browsers, number):
+    """Base configuration with many browsers cloned and marshaled per test."""
+    config = rich_configuration()
+    for i in range(browsers):
+        config.add_browser(800 + i, 600, BrowserType.CHROME)
+
+    def per_call_us(func):
+        return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+    def clone_and_marshal():
+        clone = config.clone()
+        clone.set_test_name("Test")
+        marshal_configuration(clone)
+
+    def clone_and_modify():
+        config.clone().add_property("step", "1").add_browser(
+            1024, 768, BrowserType.FIREFOX
+        )
+
+    return {
+        "clone_us": per_call_us(config.clone),
+        "clone_and_marshal_us": per_call_us(clone_and_marshal),
+        "clone_and_modify_us": per_call_us(clone_and_modify),
+    }
+
+
+SCENARIOS = {
+    "images_check_throughput": images_check_throughput,
+    "selenium_check_throughput": selenium_check_throughput,
+    "marshaling": marshaling,
+    "memory_per_open_eyes": memory_per_open_eyes,
+    "close_manager_demarshal": close_manager_demarshal,
+    "transport_throughput": transport_throughput,
+    "check_settings_regions": check_settings_regions,
+    "repeated_image_checks": repeated_image_checks,
+    "png_encoding": png_encoding,
+    "geometry_objects": geometry_objects,
+    "configuration_clone": configuration_clone,
+}
@@ -27,9 +27,15 @@ from .errors import (  # noqa
 from .geometry import (  # noqa
     AccessibilityRegion,
     CoordinatesType,
+    FrozenPoint,
+    FrozenRectangle,
+    FrozenRectangleSize,
+    FrozenRegion,
     Point,
     RectangleSize,
     Region,
+    RegionIndex,
+    RegionSet,
     SubregionForStitching,
 )
 from .logger import FileLogger, StdoutLogger  # noqa
@@ -37,13 +43,19 @@ from .match import (  # noqa
     ExactMatchSettings,
     FloatingBounds,
     FloatingMatchSettings,
+    FrozenFloatingMatchSettings,
     ImageMatchSettings,
     MatchLevel,
     MatchResult,
 )
 from .selenium import StitchMode  # noqa
 from .server import FailureReports, ServerInfo, SessionType  # noqa
-from .test_results import TestResultContainer, TestResults, TestResultsSummary  # noqa
+from .test_results import (  # noqa
+    LazyTestResults,
+    TestResultContainer,
+    TestResults,
+    TestResultsSummary,
+)
 from .ultrafastgrid.config import (  # noqa
     AndroidDeviceName,
     AndroidVersion,
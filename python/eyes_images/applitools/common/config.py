@@ -1,5 +1,5 @@
 import uuid
-from copy import copy, deepcopy
+from copy import copy
 from datetime import datetime
 from typing import TYPE_CHECKING, Set
 
@@ -15,7 +15,14 @@ from applitools.common.server import FailureReports, SessionType
 from applitools.common.utils import argument_guard
 from applitools.common.utils.converters import str2bool
 from applitools.common.utils.datetime_utils import UTC
-from applitools.common.utils.general_utils import get_env_with_prefix
+from applitools.common.utils.general_utils import (
+    CopiedOnWriteView,
+    content_key,
+    copied_on_write,
+    get_env_with_prefix,
+    owned,
+    share_copied_on_write,
+)
 
 if TYPE_CHECKING:
     from typing import TYPE_CHECKING, Dict, List, Optional, Text, TypeVar
@@ -131,6 +138,7 @@ class ProxySettings(object):
         return None
 
 
+@copied_on_write("batch", "properties", "default_match_settings")
 @attr.s
 class Configuration(object):
     batch = attr.ib(factory=BatchInfo)  # type: BatchInfo
@@ -189,42 +197,43 @@ class Configuration(object):
     @property
     def enable_patterns(self):
         # type: () -> bool
-        return self.default_match_settings.enable_patterns
+        return CopiedOnWriteView(self).default_match_settings.enable_patterns
 
     @enable_patterns.setter
     def enable_patterns(self, enable_patterns):
         # type: (bool) -> None
-        self.default_match_settings.enable_patterns = enable_patterns
+        owned(self, "default_match_settings").enable_patterns = enable_patterns
 
     @property
     def use_dom(self):
         # type: () -> bool
-        return self.default_match_settings.use_dom
+        return CopiedOnWriteView(self).default_match_settings.use_dom
 
     @use_dom.setter
     def use_dom(self, use_dom):
         # type: (bool) -> None
-        self.default_match_settings.use_dom = use_dom
+        owned(self, "default_match_settings").use_dom = use_dom
 
     @property
     def match_level(self):
         # type: () -> MatchLevel
-        return self.default_match_settings.match_level
+        return CopiedOnWriteView(self).default_match_settings.match_level
 
     @match_level.setter
     def match_level(self, match_level):
         # type: (MatchLevel) -> None
-        self.default_match_settings.match_level = match_level
+        owned(self, "default_match_settings").match_level = match_level
 
     @property
     def ignore_displacements(self):
         # type: () -> bool
-        return self.default_match_settings.ignore_displacements
+        return CopiedOnWriteView(self).default_match_settings.ignore_displacements
 
     @ignore_displacements.setter
     def ignore_displacements(self, ignore_displacements):
         # type: (bool) -> None
-        self.default_match_settings.ignore_displacements = ignore_displacements
+        match_settings = owned(self, "default_match_settings")
+        match_settings.ignore_displacements = ignore_displacements
 
     def set_batch(self, batch):
         # type: (Self, BatchInfo) -> Self
@@ -290,11 +299,11 @@ class Configuration(object):
     @property
     def ignore_caret(self):
         # type: () -> bool
-        return self.default_match_settings.ignore_caret
+        return CopiedOnWriteView(self).default_match_settings.ignore_caret
 
     def set_ignore_caret(self, ignore_caret):
         # type: (Self, bool) -> Self
-        self.default_match_settings.ignore_caret = ignore_caret
+        owned(self, "default_match_settings").ignore_caret = ignore_caret
         return self
 
     def set_host_app(self, host_app):
@@ -411,6 +420,16 @@ class Configuration(object):
 
         raise ValueError("Wrong viewport type settled")
 
+    def _state_key(self):
+        # type: () -> tuple
+        """
+        Changes whenever the configuration is modified, including in-place
+        changes of its batch, lists and other nested values.
+        """
+        # read from __dict__, it doesn't copy values shared with clones
+        values = self.__dict__
+        return tuple(content_key(values[a.name]) for a in attr.fields(type(self)))
+
     @property
     def is_send_dom(self):
         # type: () -> bool
@@ -418,13 +437,15 @@ class Configuration(object):
 
     def clone(self):
         # type: () -> Self
-        # TODO: Remove this huck when get rid of Python2
-        # deepcopy on python 2 raise an exception so construct manually
+        """
+        Batch, properties, match settings and other nested values are shared
+        with the clone until either configuration accesses them. The values
+        already handed out, like the batch read or set by the caller, are
+        copied for the clone right away.
+        """
         conf = copy(self)
-        conf.batch = deepcopy(conf.batch)
         conf.viewport_size = copy(conf.viewport_size)
-        conf.properties = deepcopy(conf.properties)
-        conf.default_match_settings = deepcopy(conf.default_match_settings)
+        share_copied_on_write(self, conf)
         return conf
 
     def add_property(self, name, value):
@@ -434,7 +455,7 @@ class Configuration(object):
         :param name: (string) The property name.
         :param value: (string) The property value
         """
-        self.properties.append({"name": name, "value": value})
+        owned(self, "properties").append({"name": name, "value": value})
         return self
 
     def clear_properties(self):
@@ -442,7 +463,7 @@ class Configuration(object):
         """
         Clears the list of custom properties.
         """
-        del self.properties[:]
+        del owned(self, "properties")[:]
         return self
 
     def set_proxy(self, proxy):
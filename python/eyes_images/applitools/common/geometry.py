@@ -1,6 +1,8 @@
 from __future__ import absolute_import
 
 import math
+from array import array
+from collections import OrderedDict
 from enum import Enum
 from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union, overload
 
@@ -12,14 +14,22 @@ from .utils import argument_guard
 from .utils.converters import round_converter
 
 if TYPE_CHECKING:
+    from typing import Any, Iterable, Iterator, Sequence
+
     from .ultrafastgrid.render_browser_info import IRenderBrowserinfo
     from .utils.custom_types import CodedRegionPadding, Num
 
 __all__ = (
+    "FrozenPoint",
+    "FrozenRectangle",
+    "FrozenRectangleSize",
+    "FrozenRegion",
     "Point",
     "Region",
     "CoordinatesType",
     "RectangleSize",
+    "RegionIndex",
+    "RegionSet",
     "SubregionForStitching",
     "AccessibilityRegion",
 )
@@ -56,15 +66,52 @@ class CoordinatesType(Enum):
 class DictAccessMixin(object):
     """Make dict-like object from attrs class"""
 
+    __slots__ = ()  # otherwise every instance of slotted subclasses has __dict__
+
     def __getitem__(self, item):
-        fields = [a.name for a in attr.fields(self.__class__)]
+        fields = _FIELD_NAMES.get(self.__class__) or _field_names(self.__class__)
         if isinstance(item, int):
             item = fields[item]
         if item not in fields:
-            raise KeyError("item: {}, fields: {}".format(item, fields))
+            raise KeyError("item: {}, fields: {}".format(item, list(fields)))
         return getattr(self, item)
 
 
+_FIELD_NAMES = {}  # type: Dict[type, Tuple[str, ...]]
+
+
+def _field_names(cls):
+    # type: (type) -> Tuple[str, ...]
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(a.name for a in attr.fields(cls))
+    return names
+
+
+class Frozen(object):
+    """Makes slotted attrs class immutable and hashable by value.
+
+    Attributes are set with `_freeze` by __init__ of the frozen class, later
+    writes raise FrozenInstanceError. Operations like offset or scale return
+    mutable objects.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise attr.exceptions.FrozenInstanceError()
+
+    def __delattr__(self, name):
+        raise attr.exceptions.FrozenInstanceError()
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in _field_names(type(self))))
+
+
+# Sets attributes of frozen objects in their __init__
+_freeze = object.__setattr__
+
+
 @attr.s(slots=True, eq=False, hash=True, init=False)
 class RectangleSize(DictAccessMixin):
     """Represents a 2D size"""
@@ -485,7 +532,9 @@ class Region(Rectangle):
     ):
         # type: (...) -> None
         super(Region, self).__init__(left, top, width, height)
-        self.coordinates_type = CoordinatesType(coordinates_type)
+        if coordinates_type.__class__ is not CoordinatesType:
+            coordinates_type = CoordinatesType(coordinates_type)
+        self.coordinates_type = coordinates_type
 
     def __str__(self):
         return "Region({left}, {top}, {width} x {height}, {type})".format(
@@ -649,6 +698,586 @@ class Region(Rectangle):
         )
 
 
+class FrozenRectangleSize(Frozen, RectangleSize):
+    __slots__ = ()
+
+    def __init__(self, width, height):
+        # type: (Num, Num) -> None
+        _freeze(self, "width", round_converter(width))
+        _freeze(self, "height", round_converter(height))
+
+
+class FrozenPoint(Frozen, Point):
+    __slots__ = ()
+
+    def __init__(self, x, y):
+        # type: (Num, Num) -> None
+        _freeze(self, "x", round_converter(x))
+        _freeze(self, "y", round_converter(y))
+
+
+class FrozenRectangle(Frozen, Rectangle):
+    __slots__ = ()
+
+    def __init__(self, left, top, width, height):
+        # type: (Num, Num, Num, Num) -> None
+        _freeze(self, "left", round_converter(left))
+        _freeze(self, "top", round_converter(top))
+        _freeze(self, "width", round_converter(width))
+        _freeze(self, "height", round_converter(height))
+
+
+class FrozenRegion(Frozen, Region):
+    __slots__ = ()
+
+    def __init__(
+        self,
+        left,  # type: Num
+        top,  # type: Num
+        width,  # type: Num
+        height,  # type: Num
+        coordinates_type=CoordinatesType.SCREENSHOT_AS_IS,  # type: CoordinatesType
+    ):
+        # type: (...) -> None
+        if coordinates_type.__class__ is not CoordinatesType:
+            coordinates_type = CoordinatesType(coordinates_type)
+        _freeze(self, "left", round_converter(left))
+        _freeze(self, "top", round_converter(top))
+        _freeze(self, "width", round_converter(width))
+        _freeze(self, "height", round_converter(height))
+        _freeze(self, "coordinates_type", coordinates_type)
+
+
+class RegionSet(object):
+    """Regions of the same coordinates type stored in a single int array.
+
+    Bulk operations are vectorized with numpy when it is installed and loop
+    over the array otherwise, regions are boxed into Region objects only when
+    the set is iterated or indexed. Operations have the semantics of the
+    respective Region methods and return new sets, checks return lists of
+    bools which can be passed to `select`.
+    """
+
+    __slots__ = ("_data", "coordinates_type")
+    __hash__ = None  # type: ignore
+
+    def __init__(
+        self,
+        regions=(),  # type: Iterable[Union[Rectangle, Sequence[Num]]]
+        coordinates_type=CoordinatesType.SCREENSHOT_AS_IS,  # type: CoordinatesType
+    ):
+        # type: (...) -> None
+        self._data = array("i")  # left, top, width, height of every region
+        for region in regions:
+            if isinstance(region, Rectangle):
+                left, top, width, height = (
+                    region.left,
+                    region.top,
+                    region.width,
+                    region.height,
+                )
+            else:
+                left, top, width, height = (round_converter(v) for v in region)
+            self._data.extend((left, top, width, height))
+        self.coordinates_type = CoordinatesType(coordinates_type)
+
+    @classmethod
+    def from_columns(
+        cls,
+        left,  # type: Sequence[Num]
+        top,  # type: Sequence[Num]
+        width,  # type: Sequence[Num]
+        height,  # type: Sequence[Num]
+        coordinates_type=CoordinatesType.SCREENSHOT_AS_IS,  # type: CoordinatesType
+    ):
+        # type: (...) -> RegionSet
+        """Creates the set from same length sequences or numpy arrays."""
+        np = _numpy()
+        if np is None:
+            return cls(zip(left, top, width, height), coordinates_type)
+        region_set = cls((), coordinates_type)
+        columns = np.column_stack([left, top, width, height])
+        if len(columns):
+            region_set._data = _array_from(np, np.rint(columns))
+        return region_set
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._data) // 4
+
+    def __iter__(self):
+        # type: () -> Iterator[Region]
+        data, coordinates_type = self._data, self.coordinates_type
+        for i in range(0, len(data), 4):
+            yield Region(
+                data[i], data[i + 1], data[i + 2], data[i + 3], coordinates_type
+            )
+
+    @overload
+    def __getitem__(self, index):
+        # type: (int) -> Region
+        pass
+
+    @overload
+    def __getitem__(self, index):
+        # type: (slice) -> RegionSet
+        pass
+
+    def __getitem__(self, index):  # noqa
+        if isinstance(index, slice):
+            indices = range(len(self))[index]
+            return self._with(array("i", (v for i in indices for v in self._values(i))))
+        if not -len(self) <= index < len(self):
+            raise IndexError("RegionSet index out of range")
+        left, top, width, height = self._values(index % len(self))
+        return Region(left, top, width, height, self.coordinates_type)
+
+    def __eq__(self, other):
+        # type: (Any) -> bool
+        return (
+            isinstance(other, RegionSet)
+            and self.coordinates_type == other.coordinates_type
+            and self._data == other._data
+        )
+
+    def __ne__(self, other):
+        # type: (Any) -> bool
+        return not self == other
+
+    def __repr__(self):
+        return "RegionSet({} regions, {})".format(
+            len(self), self.coordinates_type.value
+        )
+
+    def tolist(self):
+        # type: () -> List[List[int]]
+        """Returns [left, top, width, height] list of every region."""
+        np = _numpy()
+        if np is None:
+            return [self._values(i).tolist() for i in range(len(self))]
+        return self._columns(np).tolist()
+
+    def select(self, mask):
+        # type: (Iterable[bool]) -> RegionSet
+        """Returns the regions which mask value is true."""
+        np = _numpy()
+        if np is None:
+            return self._with(
+                array(
+                    "i",
+                    (
+                        v
+                        for i, selected in enumerate(mask)
+                        if selected
+                        for v in self._values(i)
+                    ),
+                )
+            )
+        if not hasattr(mask, "__len__"):
+            mask = list(mask)
+        return self._with_columns(np, self._columns(np)[np.asarray(mask, bool)])
+
+    @overload  # noqa
+    def offset(self, location):
+        # type: (Point) -> RegionSet
+        pass
+
+    @overload  # noqa
+    def offset(self, dx, dy):
+        # type: (int, int) -> RegionSet
+        pass
+
+    def offset(self, location_or_dx, dy=None):  # noqa
+        # type: (Union[Point, int], Optional[int]) -> RegionSet
+        dx, dy = dx_and_dy(location_or_dx, dy)
+        dx, dy = round_converter(dx), round_converter(dy)
+        np = _numpy()
+        if np is None:
+            data = array("i", self._data)
+            data[0::4] = array("i", [left + dx for left in data[0::4]])
+            data[1::4] = array("i", [top + dy for top in data[1::4]])
+            return self._with(data)
+        return self._with_columns(np, self._columns(np) + (dx, dy, 0, 0))
+
+    def scale(self, scale_ratio):
+        # type: (float) -> RegionSet
+        """Scales locations and sizes of the regions, same as Region.scale."""
+        np = _numpy()
+        if np is None:
+            return self._with(
+                array("i", [int(math.ceil(v * scale_ratio)) for v in self._data])
+            )
+        return self._with_columns(np, np.ceil(self._columns(np) * scale_ratio))
+
+    def intersect(self, other):
+        # type: (Region) -> RegionSet
+        """Intersections of every region with other, empty if they don't overlap."""
+        np = _numpy()
+        if np is None:
+            data = array("i")
+            for region, overlaps in zip(self, self.overlaps(other)):
+                if overlaps:
+                    region = region.intersect(other)
+                    data.extend((region.left, region.top, region.width, region.height))
+                else:
+                    data.extend((0, 0, 0, 0))
+            return self._with(data)
+        left, top, right, bottom = self._edges(np)
+        left = np.maximum(left, other.left)
+        top = np.maximum(top, other.top)
+        width = np.minimum(right, other.right) - left
+        height = np.minimum(bottom, other.bottom) - top
+        columns = np.column_stack([left, top, width, height])
+        columns[~np.asarray(self.overlaps(other), bool)] = 0
+        return self._with_columns(np, columns)
+
+    def clip(self, bounds):
+        # type: (Region) -> RegionSet
+        """Intersections with bounds, regions outside of them are dropped."""
+        intersections = self.intersect(bounds)
+        return intersections.select(
+            width > 0 and height > 0 for _, _, width, height in intersections.tolist()
+        )
+
+    def overlaps(self, other):
+        # type: (Region) -> List[bool]
+        np = _numpy()
+        if np is None:
+            return [region.overlaps(other) for region in self]
+        left, top, right, bottom = self._edges(np)
+        horizontal = ((left <= other.left) & (other.left <= right)) | (
+            (other.left <= left) & (left <= other.right)
+        )
+        vertical = ((top <= other.top) & (other.top <= bottom)) | (
+            (other.top <= top) & (top <= other.bottom)
+        )
+        return (horizontal & vertical).tolist()
+
+    def contains(self, other):
+        # type: (Union[Point, Region]) -> List[bool]
+        """Whether every region contains other point or region."""
+        np = _numpy()
+        if np is None:
+            return [region.contains(other) for region in self]
+        left, top, right, bottom = self._edges(np)
+        if isinstance(other, Point):
+            x, y = other
+            return ((left <= x) & (x <= right) & (top <= y) & (y <= bottom)).tolist()
+        return (
+            (top <= other.top)
+            & (left <= other.left)
+            & (bottom >= other.bottom)
+            & (right >= other.right)
+        ).tolist()
+
+    def contained_in(self, other):
+        # type: (Region) -> List[bool]
+        """Whether every region is contained in other region."""
+        np = _numpy()
+        if np is None:
+            return [other.contains(region) for region in self]
+        left, top, right, bottom = self._edges(np)
+        return (
+            (other.top <= top)
+            & (other.left <= left)
+            & (other.bottom >= bottom)
+            & (other.right >= right)
+        ).tolist()
+
+    def coalesced(self):
+        # type: () -> RegionSet
+        """Regions covering the same area, no more of them than in the set.
+
+        Duplicates are dropped and overlapping or adjacent regions are merged
+        with a sweep-line. A group of connected regions is replaced only when
+        its union takes fewer regions than the group, so the result is never
+        longer than the set and may still contain overlapping regions, like
+        a cross of two regions. Empty regions are kept as is.
+        """
+        regions = list(OrderedDict.fromkeys(tuple(r) for r in self.tolist()))
+        result = []
+        for group in _connected_groups(regions):
+            union = _union(group) if len(group) > 1 else group
+            result.extend(union if len(union) < len(group) else group)
+        return self._with(array("i", (v for region in result for v in region)))
+
+    def _values(self, index):
+        # type: (int) -> array
+        return self._data[slice(4 * index, 4 * index + 4)]
+
+    def _with(self, data):
+        # type: (array) -> RegionSet
+        region_set = RegionSet((), self.coordinates_type)
+        region_set._data = data
+        return region_set
+
+    def _columns(self, np):
+        if not self._data:  # older numpy can't make arrays of empty buffers
+            return np.zeros((0, 4), np.intc)
+        return np.frombuffer(self._data, np.intc).reshape(-1, 4)
+
+    def _with_columns(self, np, columns):
+        return self._with(_array_from(np, columns) if len(columns) else array("i"))
+
+    def _edges(self, np):
+        columns = self._columns(np).astype(np.int64)  # sums don't overflow
+        left, top, width, height = columns.T
+        return left, top, left + width, top + height
+
+
+class RegionIndex(object):
+    """Grid of buckets finding regions, text regions etc. by their location.
+
+    Every item is put into the buckets of the grid cells it touches, so a query
+    checks only the items sharing a cell with the queried region instead of all
+    of them. Items spanning too many cells are kept aside and checked on every
+    query. Queries have the semantics of the respective Region methods: edges
+    are inclusive and regions touching each other overlap. Results are in the
+    order the items were added.
+    """
+
+    # Items covering more cells are not put into buckets
+    MAX_ITEM_CELLS = 64
+
+    def __init__(self, items=(), cell_size=None):
+        # type: (Iterable[Rectangle], Optional[int]) -> None
+        """Cell size defaults to the average size of the items."""
+        self._items = []  # type: List[Rectangle]
+        self._edges = []  # type: List[Tuple[int, int, int, int]]
+        self._buckets = {}  # type: Dict[Tuple[int, int], List[int]]
+        self._large = []  # type: List[int]  # indices of the items not in buckets
+        items = list(items)
+        if cell_size is None:
+            sizes = [max(item.width, item.height) for item in items]
+            cell_size = sum(sizes) // len(sizes) if sizes else 1
+        if cell_size < 1:
+            cell_size = 1
+        self.cell_size = cell_size  # type: int
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        # type: () -> Iterator[Rectangle]
+        return iter(self._items)
+
+    def add(self, item):
+        # type: (Rectangle) -> None
+        index = len(self._items)
+        edges = (item.left, item.top, item.left + item.width, item.top + item.height)
+        self._items.append(item)
+        self._edges.append(edges)
+        columns, rows = self._cells(edges)
+        if len(columns) * len(rows) > self.MAX_ITEM_CELLS:
+            self._large.append(index)
+            return
+        for column in columns:
+            for row in rows:
+                self._buckets.setdefault((column, row), []).append(index)
+
+    def intersecting(self, other):
+        # type: (Rectangle) -> List[Rectangle]
+        """Items overlapping other region."""
+        return [self._items[i] for i in self._intersecting(other)]
+
+    def containing(self, other):
+        # type: (Union[Point, Rectangle]) -> List[Rectangle]
+        """Items containing other point or region."""
+        if isinstance(other, Point):
+            other = Rectangle(other.x, other.y, 0, 0)
+        left, top, right, bottom = _edges_of(other)
+        return [
+            self._items[i]
+            for i in self._candidates(left, top, right, bottom)
+            if _contains(self._edges[i], (left, top, right, bottom))
+        ]
+
+    def contained_in(self, other):
+        # type: (Rectangle) -> List[Rectangle]
+        """Items inside other region."""
+        edges = _edges_of(other)
+        return [
+            self._items[i]
+            for i in self._candidates(*edges)
+            if _contains(edges, self._edges[i])
+        ]
+
+    def intersecting_pairs(self, others=None):
+        # type: (Optional[Iterable[Rectangle]]) -> List[Tuple[Rectangle, Rectangle]]
+        """Pairs of overlapping items, or of an item and one of other regions.
+
+        Without others every pair of the items is returned once, the item added
+        first goes first. Otherwise pairs are an item and other region it
+        overlaps, in the order of others.
+        """
+        if others is not None:
+            return [
+                (self._items[i], other)
+                for other in others
+                for i in self._intersecting(other)
+            ]
+        return [
+            (self._items[i], self._items[j])
+            for i in range(len(self._items))
+            for j in self._intersecting(self._items[i])
+            if j > i
+        ]
+
+    def _intersecting(self, other):
+        # type: (Rectangle) -> List[int]
+        left, top, right, bottom = _edges_of(other)
+        return [
+            i
+            for i in self._candidates(left, top, right, bottom)
+            if _overlaps(self._edges[i], (left, top, right, bottom))
+        ]
+
+    def _candidates(self, left, top, right, bottom):
+        # type: (int, int, int, int) -> List[int]
+        """Sorted indices of the items sharing a cell with the region."""
+        columns, rows = self._cells((left, top, right, bottom))
+        if len(columns) * len(rows) > len(self._buckets):
+            # cheaper to look at every bucket than at every cell
+            candidates = set(
+                i
+                for (column, row), bucket in self._buckets.items()
+                if column in columns and row in rows
+                for i in bucket
+            )
+        else:
+            candidates = set(
+                i
+                for column in columns
+                for row in rows
+                for i in self._buckets.get((column, row), ())
+            )
+        candidates.update(self._large)
+        return sorted(candidates)
+
+    def _cells(self, edges):
+        # type: (Tuple[int, int, int, int]) -> Tuple[range, range]
+        left, top, right, bottom = edges
+        size = self.cell_size
+        return (
+            range(int(left // size), int(right // size) + 1),
+            range(int(top // size), int(bottom // size) + 1),
+        )
+
+
+def _edges_of(region):
+    # type: (Rectangle) -> Tuple[int, int, int, int]
+    return (
+        region.left,
+        region.top,
+        region.left + region.width,
+        region.top + region.height,
+    )
+
+
+def _overlaps(edges, other):
+    # type: (Tuple[int, int, int, int], Tuple[int, int, int, int]) -> bool
+    """Same as Region.overlaps on the left, top, right and bottom edges."""
+    left, top, right, bottom = edges
+    other_left, other_top, other_right, other_bottom = other
+    return (left <= other_left <= right or other_left <= left <= other_right) and (
+        top <= other_top <= bottom or other_top <= top <= other_bottom
+    )
+
+
+def _contains(edges, other):
+    # type: (Tuple[int, int, int, int], Tuple[int, int, int, int]) -> bool
+    """Same as Region.contains on the left, top, right and bottom edges."""
+    return (
+        edges[0] <= other[0]
+        and edges[1] <= other[1]
+        and edges[2] >= other[2]
+        and edges[3] >= other[3]
+    )
+
+
+def _connected_groups(regions):
+    # type: (List[Tuple[int, int, int, int]]) -> List[List[Tuple[int, int, int, int]]]
+    """Splits regions into groups connected by overlapping or touching."""
+    parents = list(range(len(regions)))
+
+    def root(i):
+        while parents[i] != i:
+            parents[i] = i = parents[parents[i]]
+        return i
+
+    active = []  # indices of the regions not ended left of the current one
+    for i in sorted(range(len(regions)), key=lambda i: regions[i][0]):
+        left, top, width, height = regions[i]
+        if width <= 0 or height <= 0:
+            continue
+        active = [j for j in active if regions[j][0] + regions[j][2] >= left]
+        for j in active:
+            other_top, other_height = regions[j][1], regions[j][3]
+            if top <= other_top + other_height and other_top <= top + height:
+                parents[root(j)] = root(i)
+        active.append(i)
+    groups = OrderedDict()  # type: Dict[int, List[Tuple[int, int, int, int]]]
+    for i, region in enumerate(regions):
+        groups.setdefault(root(i), []).append(region)
+    return list(groups.values())
+
+
+def _union(regions):
+    # type: (List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]
+    """Sweeps a vertical line over the regions, returns rectangles of the union.
+
+    Between two consecutive vertical edges the line crosses the same merged
+    spans, a span becomes a rectangle when the line stops crossing it.
+    """
+    edges = sorted({r[0] for r in regions} | {r[0] + r[2] for r in regions})
+    starting = sorted(regions, reverse=True)  # popped in the order of left
+    crossed = []  # type: List[Tuple[int, int, int, int]]
+    opened = {}  # type: Dict[Tuple[int, int], int]  # span -> its left
+    result = []
+    for x in edges:
+        while starting and starting[-1][0] == x:
+            crossed.append(starting.pop())
+        crossed = [r for r in crossed if r[0] + r[2] > x]
+        spans = set()
+        top = bottom = None
+        for span_top, span_bottom in sorted((r[1], r[1] + r[3]) for r in crossed):
+            if bottom is not None and span_top <= bottom:
+                bottom = max(bottom, span_bottom)
+                continue
+            if bottom is not None:
+                spans.add((top, bottom))
+            top, bottom = span_top, span_bottom
+        if bottom is not None:
+            spans.add((top, bottom))
+        for span in sorted(set(opened) - spans):
+            left = opened.pop(span)
+            result.append((left, span[0], x - left, span[1] - span[0]))
+        for span in spans - set(opened):
+            opened[span] = x
+    return sorted(result)
+
+
+def _array_from(np, columns):
+    # type: (Any, Any) -> array
+    return array("i", columns.astype(np.intc).tobytes())
+
+
+_numpy_module = []  # imported on first use, numpy is optional
+
+
+def _numpy():
+    # type: () -> Any
+    if not _numpy_module:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy_module.append(numpy)
+    return _numpy_module[0]
+
+
 @attr.s
 class SubregionForStitching(object):
     scroll_to = attr.ib()  # type: Point
@@ -5,7 +5,7 @@ from enum import Enum
 import attr
 
 from .accessibility import AccessibilitySettings
-from .geometry import AccessibilityRegion, Rectangle, Region
+from .geometry import AccessibilityRegion, Frozen, Rectangle, Region, _freeze
 from .utils.general_utils import DynamicEnumGetter
 
 if typing.TYPE_CHECKING:
@@ -17,6 +17,7 @@ __all__ = (
     "MatchLevel",
     "MatchResult",
     "FloatingMatchSettings",
+    "FrozenFloatingMatchSettings",
     "ExactMatchSettings",
     "ImageMatchSettings",
     "FloatingBounds",
@@ -68,7 +69,7 @@ class MatchResult(object):
     )
 
 
-@attr.s(eq=False)
+@attr.s(eq=False, slots=True)
 class FloatingMatchSettings(Rectangle):
     _region = attr.ib()  # type: Region
     _bounds = attr.ib()  # type: FloatingBounds
@@ -126,6 +127,38 @@ class FloatingMatchSettings(Rectangle):
         return FloatingMatchSettings(r, self._bounds)
 
 
+class FrozenFloatingMatchSettings(Frozen, FloatingMatchSettings):
+    __slots__ = ()
+
+    def __init__(self, region, bounds):
+        # type: (Region, FloatingBounds) -> None
+        _freeze(self, "_region", region)
+        _freeze(self, "_bounds", bounds)
+        _freeze(self, "left", region.left)
+        _freeze(self, "top", region.top)
+        _freeze(self, "width", region.width)
+        _freeze(self, "height", region.height)
+        _freeze(self, "max_up_offset", bounds.max_up_offset)
+        _freeze(self, "max_down_offset", bounds.max_down_offset)
+        _freeze(self, "max_left_offset", bounds.max_left_offset)
+        _freeze(self, "max_right_offset", bounds.max_right_offset)
+
+    def __hash__(self):
+        # region and bounds are mutable, the copied values are not
+        return hash(
+            (
+                self.left,
+                self.top,
+                self.width,
+                self.height,
+                self.max_up_offset,
+                self.max_down_offset,
+                self.max_left_offset,
+                self.max_right_offset,
+            )
+        )
+
+
 @attr.s
 class ExactMatchSettings(object):
     """
@@ -148,7 +181,7 @@ class ExactMatchSettings(object):
         )
 
 
-@attr.s
+@attr.s(slots=True)
 class ImageMatchSettings(object):
     """
     Encapsulates match settings for the a session.
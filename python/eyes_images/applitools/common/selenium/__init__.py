@@ -1,4 +1,4 @@
 from .config import Configuration
-from .misc import BrowserType, StitchMode
+from .misc import BrowserType, ImageTransfer, StitchMode
 
-__all__ = ("StitchMode", "BrowserType", "Configuration")
+__all__ = ("StitchMode", "BrowserType", "Configuration", "ImageTransfer")
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from typing import TYPE_CHECKING, List, Optional, Text, Tuple, Union, overload
 
 import attr
@@ -16,9 +15,10 @@ from applitools.common.ultrafastgrid import (
     VisualGridOption,
 )
 from applitools.common.utils import argument_guard
+from applitools.common.utils.general_utils import copied_on_write, owned
 from applitools.common.validators import is_list_or_tuple
 
-from .misc import BrowserType, StitchMode
+from .misc import BrowserType, ImageTransfer, StitchMode
 
 if TYPE_CHECKING:
     from applitools.common.ultrafastgrid import DeviceName
@@ -27,6 +27,7 @@ if TYPE_CHECKING:
 __all__ = ("Configuration",)
 
 
+@copied_on_write("browsers_info", "visual_grid_options")
 @attr.s
 class Configuration(ConfigurationBase):
     force_full_page_screenshot = attr.ib(default=None)  # type: bool
@@ -52,6 +53,15 @@ class Configuration(ConfigurationBase):
     scale_ratio = attr.ib(default=None)  # type: Optional[float]
     cut_provider = attr.ib(default=None)  # type: Optional[CutProvider]
     rotation = attr.ib(default=None)  # type: Optional[int]
+    image_transfer = attr.ib(default=None)  # type: Optional[ImageTransfer]
+    # eyes-images crops in-memory images to the target region before sending
+    crop_images_locally = attr.ib(default=None)  # type: Optional[bool]
+    # zlib level of PNG images encoded by eyes-images, from 0 (none) to 9 (best)
+    png_compression_level = attr.ib(default=None)  # type: Optional[int]
+    # Threads compressing a numpy image array, images are split into strips
+    png_encoder_threads = attr.ib(default=None)  # type: Optional[int]
+    # Merge overlapping and adjacent ignore, layout, strict and content regions
+    coalesce_regions = attr.ib(default=None)  # type: Optional[bool]
 
     def set_force_full_page_screenshot(self, force_full_page_screenshot):
         # type: (bool) -> Configuration
@@ -102,6 +112,36 @@ class Configuration(ConfigurationBase):
         self.dont_use_cookies = dont_use_cookies
         return self
 
+    def set_image_transfer(self, image_transfer):
+        # type: (ImageTransfer) -> Configuration
+        argument_guard.is_a(image_transfer, ImageTransfer)
+        self.image_transfer = image_transfer
+        return self
+
+    def set_crop_images_locally(self, crop_images_locally):
+        # type: (bool) -> Configuration
+        self.crop_images_locally = crop_images_locally
+        return self
+
+    def set_png_compression_level(self, png_compression_level):
+        # type: (int) -> Configuration
+        if png_compression_level not in range(10):
+            raise ValueError("PNG compression level should be from 0 to 9")
+        self.png_compression_level = png_compression_level
+        return self
+
+    def set_png_encoder_threads(self, png_encoder_threads):
+        # type: (int) -> Configuration
+        if png_encoder_threads < 1:
+            raise ValueError("PNG encoder threads number should be positive")
+        self.png_encoder_threads = png_encoder_threads
+        return self
+
+    def set_coalesce_regions(self, coalesce_regions):
+        # type: (bool) -> Configuration
+        self.coalesce_regions = coalesce_regions
+        return self
+
     @overload
     def set_layout_breakpoints(self, enabled):
         # type: (bool) -> Configuration
@@ -160,7 +200,7 @@ class Configuration(ConfigurationBase):
                 baseline_env_name = args[3]
             else:
                 baseline_env_name = self.baseline_env_name
-            self.browsers_info.append(
+            owned(self, "browsers_info").append(
                 DesktopBrowserInfo(args[0], args[1], args[2], baseline_env_name)
             )
         else:
@@ -195,7 +235,9 @@ class Configuration(ConfigurationBase):
     def add_device_emulation(self, device_name, orientation=ScreenOrientation.PORTRAIT):
         # type: (DeviceName, ScreenOrientation) -> Configuration
         argument_guard.not_none(device_name)
-        self.add_browser(ChromeEmulationInfo(device_name, orientation))
+        owned(self, "browsers_info").append(
+            ChromeEmulationInfo(device_name, orientation)
+        )
         return self
 
     def add_mobile_device(self, mobile_device_info):
@@ -205,11 +247,3 @@ class Configuration(ConfigurationBase):
     def add_mobile_devices(self, *mobile_device_infos):
         # type: (*Union[IosDeviceInfo, AndroidDeviceInfo]) -> Configuration
         return self.add_browsers(*mobile_device_infos)
-
-    def clone(self):
-        # type: () -> Configuration
-        # TODO: Remove this huck when get rid of Python2
-        conf = super(Configuration, self).clone()
-        conf.browsers_info = deepcopy(self.browsers_info)
-        conf.visual_grid_options = deepcopy(self.visual_grid_options)
-        return conf
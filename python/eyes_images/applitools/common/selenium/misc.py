@@ -43,3 +43,17 @@ class StitchMode(Enum):
 
     Scroll = "Scroll"
     CSS = "CSS"
+
+
+class ImageTransfer(Enum):
+    """
+    The way in-memory images are passed to the local universal server.
+    """
+
+    # Image is base64 encoded and embedded into the command
+    BASE64 = "base64"
+    # Image is written to a shared memory file and only its path is sent
+    SHARED_MEMORY = "shared-memory"
+    # Same as SHARED_MEMORY, but the file named by the image hash is written
+    # once and reused while the image is checked again
+    CONTENT_ADDRESSED = "content-addressed"
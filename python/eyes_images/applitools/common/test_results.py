@@ -2,7 +2,7 @@ from __future__ import absolute_import
 
 from collections import namedtuple
 from enum import Enum
-from typing import TYPE_CHECKING, List, Optional, Text, Tuple
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Text, Tuple
 
 import attr
 
@@ -15,6 +15,7 @@ if TYPE_CHECKING:
     from . import ProxySettings
 
 __all__ = (
+    "LazyTestResults",
     "TestResults",
     "TestResultsStatus",
     "TestResultsSummary",
@@ -157,6 +158,43 @@ class TestResults(object):
         cmd.core_delete_test(marshaled)
 
 
+class LazyTestResults(TestResults):
+    """
+    Eyes test results which attributes are de-serialized from the universal
+    server response on first access.
+    """
+
+    __test__ = False
+
+    def __init__(self, data, load_attribute):
+        # type: (dict, Callable[[Text, dict, Any], Any]) -> None
+        """load_attribute(name, data, default) returns de-serialized attribute."""
+        self._data = data
+        self._load_attribute = load_attribute
+        self._connection_config = _TEST_RESULTS_DEFAULTS["_connection_config"]
+
+    def __getattr__(self, name):
+        # called only for the attributes that are not loaded yet
+        if name not in _TEST_RESULTS_DEFAULTS:
+            raise AttributeError(name)
+        value = self._load_attribute(name, self._data, _TEST_RESULTS_DEFAULTS[name])
+        self.__dict__[name] = value
+        return value
+
+    def materialize(self):
+        # type: () -> TestResults
+        """Returns TestResults with all the attributes loaded."""
+        return TestResults(
+            **{
+                a.name.lstrip("_"): getattr(self, a.name)
+                for a in attr.fields(TestResults)
+            }
+        )
+
+
+_TEST_RESULTS_DEFAULTS = {a.name: a.default for a in attr.fields(TestResults)}
+
+
 @attr.s(repr=False, str=False)
 class TestResultContainer(object):
     test_results = attr.ib(default=None, type=TestResults)  # type: TestResults
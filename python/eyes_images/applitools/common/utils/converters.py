@@ -5,6 +5,8 @@ from typing import Text
 
 def round_converter(x):
     # type: (float) -> int
+    if x.__class__ is int:  # geometry objects are mostly created from ints
+        return x
     return int(round(x))
 
 
@@ -3,7 +3,7 @@ from __future__ import absolute_import
 from typing import TYPE_CHECKING, Dict, List, Text, Union
 
 if TYPE_CHECKING:
-    from applitools.common.geometry import RectangleSize, Region
+    from applitools.common.geometry import RectangleSize, Region, RegionSet
     from applitools.core.triggers import ActionTrigger
     from applitools.selenium.optional_deps import AppiumWebElement, WebElement
 
@@ -25,4 +25,6 @@ if TYPE_CHECKING:
     BySelector = List[SeleniumBy, Text]  # typedef
     CssSelector = Text  # typedef
     REGION_VALUES = Union[Region, CssSelector, AnyWebElement, BySelector]  # typedef
-    FLOATING_VALUES = Union[Region, CssSelector, AnyWebElement, BySelector]  # typedef
+    FLOATING_VALUES = Union[
+        Region, RegionSet, CssSelector, AnyWebElement, BySelector
+    ]  # typedef
@@ -2,6 +2,15 @@ from __future__ import absolute_import
 
 import os
 import typing
+from copy import deepcopy
+from datetime import datetime
+from enum import Enum
+from functools import wraps
+from operator import attrgetter
+from threading import Lock
+
+import attr
+import six
 
 """
 General purpose utilities.
@@ -9,7 +18,7 @@ General purpose utilities.
 
 
 if typing.TYPE_CHECKING:
-    from typing import Any, Callable, List, Optional, Text
+    from typing import Any, Callable, Iterable, List, Optional, Text, Type
 
     T = typing.TypeVar("T")
 
@@ -62,3 +71,166 @@ class DynamicEnumGetter(object):
 
     def __get__(self, instance, ownerclass=None):
         return self.fget(ownerclass)
+
+
+_SCALAR_TYPES = frozenset(
+    [bool, float, type(None), datetime] + list(six.integer_types + six.string_types)
+)
+_content_getters = {}  # type: dict
+
+
+def _content_getter(cls):
+    # type: (type) -> Optional[Callable[[Any], Iterable]]
+    names = [a.name for a in getattr(cls, "__attrs_attrs__", ())]
+    if len(names) > 1:
+        getter = attrgetter(*names)
+    elif names:
+        getter = lambda obj, name=names[0]: (getattr(obj, name),)  # noqa: E731
+    elif issubclass(cls, (list, tuple)):
+        getter = iter
+    elif issubclass(cls, dict):
+        getter = dict.items
+    elif issubclass(cls, (Enum, type)) or not getattr(cls, "__dictoffset__", 0):
+        getter = None
+    else:
+        getter = lambda obj: vars(obj).items()  # noqa: E731
+    _content_getters[cls] = getter
+    return getter
+
+
+def content_key(value):
+    # type: (Any) -> Any
+    """
+    Returns nested tuples of the value's contents, equal to the previous key
+    until any attribute, list item or dict item within the value is modified.
+    Values of other types are compared as they are.
+    """
+    cls = type(value)
+    if cls in _SCALAR_TYPES:
+        return value
+    try:
+        getter = _content_getters[cls]
+    except KeyError:
+        getter = _content_getter(cls)
+    if getter is None:
+        return value
+    return (cls,) + tuple(
+        v if type(v) in _SCALAR_TYPES else content_key(v) for v in getter(value)
+    )
+
+
+_copy_on_write_lock = Lock()
+
+
+class _CopiedOnWrite(object):
+    """
+    Attribute shared with clones until it is accessed, then deep copied.
+
+    The value handed out by the getter or set from outside may be modified in
+    place by whoever holds it, so once exposed it is deep copied for a clone
+    when the clone is made instead of being shared. Methods of the class
+    modify the value through `owned` and read-only consumers read it through
+    CopiedOnWriteView, neither of them exposes it.
+    """
+
+    def __init__(self, name):
+        # type: (Text) -> None
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        values = instance.__dict__
+        value = _owned(values, self.name)
+        values.setdefault("_exposed", set()).add(self.name)
+        return value
+
+    def __set__(self, instance, value):
+        values = instance.__dict__
+        values[self.name] = value
+        values.get("_shared", set()).discard(self.name)
+        values.setdefault("_exposed", set()).add(self.name)
+
+
+def _owned(values, name):
+    # type: (dict, Text) -> Any
+    if name in values.get("_shared", ()):
+        with _copy_on_write_lock:
+            if name in values["_shared"]:
+                # the copy is stored before the value stops being shared
+                values[name] = deepcopy(values[name])
+                values["_shared"].discard(name)
+    return values[name]
+
+
+def owned(obj, name):
+    # type: (Any, Text) -> Any
+    """
+    Returns copied on write attribute of the object, not shared with its
+    clones, to be modified by the object itself without exposing it.
+    """
+    return _owned(obj.__dict__, name)
+
+
+def copied_on_write(*names):
+    # type: (*Text) -> Callable[[Type[T]], Type[T]]
+    """
+    Class decorator, the named attributes of the attrs class are shared by its
+    objects and their clones made with `share_copied_on_write` until accessed.
+    Only the values passed to the constructor are exposed by it, defaults are
+    not handed out to anyone.
+    """
+
+    def decorate(cls):
+        for name in names:
+            setattr(cls, name, _CopiedOnWrite(name))
+        cls._copied_on_write = getattr(cls, "_copied_on_write", ()) + names
+        init = cls.__init__
+        init_names = [a.name for a in attr.fields(cls) if a.init]
+
+        def __init__(self, *args, **kwargs):
+            init(self, *args, **kwargs)
+            passed = set(init_names[: len(args)]).union(kwargs)
+            self.__dict__["_exposed"] = passed.intersection(cls._copied_on_write)
+
+        cls.__init__ = wraps(init)(__init__)
+        return cls
+
+    return decorate
+
+
+def share_copied_on_write(obj, clone):
+    # type: (Any, Any) -> None
+    """
+    Makes shallow copy of the object share its copied on write attributes,
+    the exposed ones are deep copied for the clone right away.
+    """
+    values, clone_values = obj.__dict__, clone.__dict__
+    with _copy_on_write_lock:
+        exposed = values.get("_exposed", set())
+        shared = set()
+        for name in obj._copied_on_write:
+            if name in exposed:
+                clone_values[name] = deepcopy(values[name])
+            else:
+                shared.add(name)
+        values["_shared"] = values.get("_shared", set()) | shared
+        clone_values["_shared"] = shared
+        clone_values["_exposed"] = set()
+
+
+class CopiedOnWriteView(object):
+    """
+    Reads attributes of the object, copied on write ones without copying them.
+    Used by read-only consumers like marshaling.
+    """
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getattr__(self, name):
+        if name in getattr(type(self._obj), "_copied_on_write", ()):
+            return self._obj.__dict__[name]
+        return getattr(self._obj, name)
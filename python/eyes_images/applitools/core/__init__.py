@@ -6,9 +6,11 @@ from .fluent import (
     CheckSettings,
     CheckSettingsValues,
     FloatingRegionByRectangle,
+    FloatingRegionsByRectangles,
     GetFloatingRegion,
     GetRegion,
     RegionByRectangle,
+    RegionsByRectangles,
 )
 from .locators import VisualLocator, VisualLocatorSettings
 from .triggers import MouseTrigger, TextTrigger
@@ -25,7 +27,9 @@ __all__ = (
     "GetRegion",
     "GetFloatingRegion",
     "FloatingRegionByRectangle",
+    "FloatingRegionsByRectangles",
     "RegionByRectangle",
+    "RegionsByRectangles",
     "BatchClose",
     "VisualLocator",
     "VisualLocatorSettings",
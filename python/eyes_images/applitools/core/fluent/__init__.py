@@ -2,10 +2,12 @@ from .check_settings import CheckSettings, CheckSettingsValues
 from .region import (
     AccessibilityRegionByRectangle,
     FloatingRegionByRectangle,
+    FloatingRegionsByRectangles,
     GetAccessibilityRegion,
     GetFloatingRegion,
     GetRegion,
     RegionByRectangle,
+    RegionsByRectangles,
 )
 
 __all__ = (
@@ -14,7 +16,9 @@ __all__ = (
     "GetRegion",
     "GetFloatingRegion",
     "FloatingRegionByRectangle",
+    "FloatingRegionsByRectangles",
     "RegionByRectangle",
+    "RegionsByRectangles",
     "GetAccessibilityRegion",
     "AccessibilityRegionByRectangle",
 )
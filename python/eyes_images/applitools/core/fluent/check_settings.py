@@ -5,16 +5,18 @@ from six import raise_from
 
 from applitools.common import FloatingBounds, MatchLevel
 from applitools.common.accessibility import AccessibilityRegionType
-from applitools.common.geometry import AccessibilityRegion, Rectangle, Region
+from applitools.common.geometry import AccessibilityRegion, Rectangle, Region, RegionSet
 from applitools.common.utils import argument_guard
 
 from .region import (
     AccessibilityRegionByRectangle,
     FloatingRegionByRectangle,
+    FloatingRegionsByRectangles,
     GetAccessibilityRegion,
     GetFloatingRegion,
     GetRegion,
     RegionByRectangle,
+    RegionsByRectangles,
 )
 
 if TYPE_CHECKING:
@@ -76,7 +78,7 @@ class CheckSettings(object):
         return self
 
     def layout(self, *regions, **kwargs):
-        # type: (Self, *Region, **Optional[CodedRegionPadding])  -> Self
+        # type: (Self, *Union[Region, RegionSet], **Optional[CodedRegionPadding])  -> Self
         """Shortcut to set the match level to :py:attr:`MatchLevel.LAYOUT`."""
         if not regions:
             self.values.match_level = MatchLevel.LAYOUT
@@ -98,7 +100,7 @@ class CheckSettings(object):
         return self
 
     def strict(self, *regions, **kwargs):
-        # type: (Self, *Region, **Optional[CodedRegionPadding])  -> Self
+        # type: (Self, *Union[Region, RegionSet], **Optional[CodedRegionPadding])  -> Self
         """Shortcut to set the match level to :py:attr:`MatchLevel.STRICT` if no args"""
         if not regions:
             self.values.match_level = MatchLevel.STRICT
@@ -115,7 +117,7 @@ class CheckSettings(object):
         return self
 
     def content(self, *regions, **kwargs):
-        # type: (Self, *Region, **Optional[CodedRegionPadding])  -> Self
+        # type: (Self, *Union[Region, RegionSet], **Optional[CodedRegionPadding])  -> Self
         """Shortcut to set the match level to :py:attr:`MatchLevel.CONTENT` if no args"""
         if not regions:
             self.values.match_level = MatchLevel.CONTENT
@@ -132,7 +134,7 @@ class CheckSettings(object):
         return self
 
     def ignore(self, *regions, **kwargs):
-        # type: (Self, *Region, **Union[CodedRegionPadding, Text])  -> Self
+        # type: (Self, *Union[Region, RegionSet], **Union[CodedRegionPadding, Text])  -> Self
         """Adds one or more ignore regions."""
         try:
             self.values.ignore_regions = self.__regions(
@@ -169,7 +171,7 @@ class CheckSettings(object):
 
     @overload  # noqa
     def floating(self, max_offset, region):
-        # type: (Self, int, Region) -> Self
+        # type: (Self, int, Union[Region, RegionSet]) -> Self
         pass
 
     @overload  # noqa
@@ -304,6 +306,8 @@ class CheckSettings(object):
     def _region_provider_from(self, region, method_name, padding, region_id):
         if isinstance(region, Region):
             return RegionByRectangle(region)
+        elif isinstance(region, RegionSet):
+            return RegionsByRectangles(region)
         raise TypeError(
             "Unsupported region: \n\ttype: {} \n\tvalue: {}".format(
                 type(region), region
@@ -313,6 +317,8 @@ class CheckSettings(object):
     def _floating_provider_from(self, region, bounds):
         if isinstance(region, Region):
             return FloatingRegionByRectangle(Region.from_(region), bounds)
+        elif isinstance(region, RegionSet):
+            return FloatingRegionsByRectangles(region, bounds)
         raise TypeError(
             "Unsupported floating region: \n\ttype: {} \n\tvalue: {}".format(
                 type(region), region
@@ -4,7 +4,7 @@ import attr
 
 from applitools.common import FloatingBounds
 from applitools.common.accessibility import AccessibilityRegionType
-from applitools.common.geometry import AccessibilityRegion, Rectangle, Region
+from applitools.common.geometry import AccessibilityRegion, Rectangle, Region, RegionSet
 
 if typing.TYPE_CHECKING:
     from typing import List, Optional, Union
@@ -15,7 +15,9 @@ __all__ = (
     "GetFloatingRegion",
     "GetRegion",
     "RegionByRectangle",
+    "RegionsByRectangles",
     "FloatingRegionByRectangle",
+    "FloatingRegionsByRectangles",
     "GetAccessibilityRegion",
     "AccessibilityRegionByRectangle",
 )
@@ -38,6 +40,13 @@ class RegionByRectangle(GetRegion):
     _region = attr.ib()  # type: Union[Region, Rectangle]
 
 
+@attr.s
+class RegionsByRectangles(GetRegion):
+    """All the regions of the set, marshaled without creating Region objects."""
+
+    _regions = attr.ib()  # type: RegionSet
+
+
 @attr.s
 class FloatingRegionByRectangle(GetFloatingRegion):
     _rect = attr.ib()  # type: Union[Region, Rectangle]
@@ -48,6 +57,18 @@ class FloatingRegionByRectangle(GetFloatingRegion):
         return self._bounds
 
 
+@attr.s
+class FloatingRegionsByRectangles(GetFloatingRegion):
+    """All the regions of the set with the same floating bounds."""
+
+    _regions = attr.ib()  # type: RegionSet
+    _bounds = attr.ib()  # type: FloatingBounds
+
+    @property
+    def floating_bounds(self):
+        return self._bounds
+
+
 @attr.s
 class AccessibilityRegionByRectangle(GetAccessibilityRegion):
     _rect = attr.ib()  # type: Union[Region, Rectangle, AccessibilityRegion]
@@ -1,3 +1,5 @@
+from six import PY2
+
 from applitools.common import (
     BatchInfo,
     Configuration,
@@ -15,7 +17,13 @@ from applitools.common.accessibility import (
     AccessibilityRegionType,
     AccessibilitySettings,
 )
-from applitools.common.geometry import AccessibilityRegion, RectangleSize, Region
+from applitools.common.geometry import (
+    AccessibilityRegion,
+    RectangleSize,
+    Region,
+    RegionIndex,
+    RegionSet,
+)
 from applitools.core.batch_close import BatchClose
 from applitools.core.cut import (
     FixedCutProvider,
@@ -32,6 +40,8 @@ __all__ = (
     "Eyes",
     "BatchInfo",
     "Region",
+    "RegionIndex",
+    "RegionSet",
     "MatchLevel",
     "logger",
     "StdoutLogger",
@@ -55,3 +65,8 @@ __all__ = (
     "OCRRegion",
     "TextRegionSettings",
 )
+
+if not PY2:
+    from .async_eyes import AsyncEyes
+
+    __all__ += ("AsyncEyes",)
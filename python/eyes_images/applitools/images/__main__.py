@@ -0,0 +1,123 @@
+from __future__ import absolute_import, print_function
+
+import io
+import sys
+from argparse import ArgumentParser
+
+from applitools.common import BatchInfo, MatchLevel
+from applitools.common.selenium import Configuration
+
+from .bulk import (
+    DEFAULT_PATTERN,
+    DEFAULT_WORKERS,
+    BulkChecker,
+    Checkpoint,
+    JsonLinesReport,
+    JUnitReport,
+    NamePattern,
+    is_passed,
+    read_manifest,
+    scan_directory,
+)
+
+
+def cli_parser():
+    parser = ArgumentParser(
+        prog="python -m applitools.images",
+        description="Check image files with Applitools Eyes",
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("directory", nargs="?", help="Directory tree of images")
+    source.add_argument(
+        "--manifest",
+        help="File listing an image path or a json object with path, app, test "
+        "and step names per line",
+    )
+    parser.add_argument(
+        "--pattern",
+        default=DEFAULT_PATTERN,
+        help="Maps image path without extension to {app}, {test} and {step} "
+        "names (default: %(default)s)",
+    )
+    parser.add_argument("--app-name", help="Default app name")
+    parser.add_argument("--batch-name", help="Batch name")
+    parser.add_argument("--branch-name", help="Branch name")
+    parser.add_argument(
+        "--match-level", choices=[m.value for m in MatchLevel], help="Match level"
+    )
+    parser.add_argument("--server-url", help="Eyes server URL")
+    parser.add_argument("--api-key", help="Defaults to APPLITOOLS_API_KEY")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Number of tests checked at once (default: %(default)s)",
+    )
+    parser.add_argument("--junit", help="JUnit xml report file")
+    parser.add_argument("--jsonl", help="Json lines report file")
+    parser.add_argument(
+        "--checkpoint",
+        help="File recording finished tests, they are skipped when it exists",
+    )
+    return parser
+
+
+def configuration_from(namespace):
+    config = Configuration()
+    if namespace.batch_name:
+        config.set_batch(BatchInfo(namespace.batch_name))
+    if namespace.branch_name:
+        config.set_branch_name(namespace.branch_name)
+    if namespace.match_level:
+        config.set_match_level(MatchLevel(namespace.match_level))
+    if namespace.server_url:
+        config.set_server_url(namespace.server_url)
+    if namespace.api_key:
+        config.set_api_key(namespace.api_key)
+    return config
+
+
+def main(args=None):
+    namespace = cli_parser().parse_args(args)
+    pattern = NamePattern(namespace.pattern)
+    if namespace.manifest:
+        tests, unmatched = read_manifest(
+            namespace.manifest, pattern, namespace.app_name
+        )
+    else:
+        tests, unmatched = scan_directory(
+            namespace.directory, pattern, namespace.app_name
+        )
+    for path in unmatched:
+        print("Skipped image not matching the pattern:", path, file=sys.stderr)
+    reports, files = [], []
+    if namespace.jsonl:
+        files.append(io.open(namespace.jsonl, "w", encoding="utf-8"))
+        reports.append(JsonLinesReport(files[-1]))
+    if namespace.junit:
+        files.append(io.open(namespace.junit, "w", encoding="utf-8"))
+        reports.append(JUnitReport(files[-1]))
+    checkpoint = namespace.checkpoint and Checkpoint(namespace.checkpoint)
+    checker = BulkChecker(configuration_from(namespace), namespace.workers)
+    try:
+        records = checker.run(tests, reports, checkpoint)
+    finally:
+        for report in reports:
+            report.close()
+        for f in files:
+            f.close()
+        if checkpoint:
+            checkpoint.close()
+    failed = [r for r in records if not is_passed(r)]
+    print(
+        "{} tests checked, {} failed".format(len(records), len(failed)),
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        sys.exit(130)
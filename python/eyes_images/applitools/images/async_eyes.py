@@ -0,0 +1,140 @@
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, ByteString, Union
+
+from applitools.common import EyesError, Region
+from applitools.common.selenium import Configuration
+from applitools.images.eyes import Eyes
+from applitools.images.fluent import Image, ImagesCheckSettings, Target, is_same_image
+from applitools.selenium.async_runner import AsyncClassicRunner
+from applitools.selenium.schema import (
+    ConfigurationMarshaler,
+    demarshal_locate_text_result,
+    marshal_check_settings,
+    marshal_image_target,
+    marshal_ocr_extract_settings,
+    marshal_ocr_search_settings,
+)
+
+if TYPE_CHECKING:
+    from typing import Iterable, List, Optional, Text
+
+    from applitools.common import MatchResult, TestResults
+    from applitools.common.utils.custom_types import ViewPort
+
+    from ..core.extract_text import PATTERN_TEXT_REGIONS
+    from .extract_text import OCRRegion, TextRegionSettings
+
+
+class AsyncEyes(Eyes):
+    """Images Eyes which methods communicating with Eyes server should be awaited."""
+
+    def __init__(self, runner=None):
+        # type: (Optional[AsyncClassicRunner]) -> None
+        self.configure = Configuration()
+        self._configuration_marshaler = ConfigurationMarshaler()
+        self._runner = runner or AsyncClassicRunner()
+        self._commands = self._runner._commands  # noqa
+        self._eyes_ref = None
+
+    async def open(self, app_name, test_name, dimension=None):
+        # type: (Text, Text, Optional[ViewPort]) -> None
+        self._update_open_configuration(app_name, test_name, dimension)
+        self._runner._set_connection_config(self.configure)  # noqa, friend
+        self._eyes_ref = await self._commands.manager_open_eyes(
+            await self._runner._get_ref(),  # noqa
+            config=self._marshaled_configuration(),
+        )
+
+    async def check(self, check_settings, name=None):
+        # type: (ImagesCheckSettings, Optional[Text]) -> bool
+        check_settings = self._check_settings_from(check_settings, name)
+        check_settings = self._locally_cropped(check_settings)
+        with self._transferred_image(check_settings.values.image) as image:
+            results = await self._commands.eyes_check(
+                self._eyes_ref,
+                target=marshal_image_target(image),
+                settings=marshal_check_settings(
+                    check_settings, self.configure.coalesce_regions
+                ),
+                config=self._marshaled_configuration(),
+            )
+        return self._match_result_from(results).as_expected
+
+    async def check_many(self, check_settings):
+        # type: (Iterable[ImagesCheckSettings]) -> List[MatchResult]
+        """Checks several images in one pipelined batch.
+
+        All the checkpoints are sent with the same marshaled configuration
+        before awaiting any of them, the results are returned in order.
+        """
+        config = self._marshaled_configuration()
+        with ExitStack() as transfers:
+            checks = self._marshaled_checks(check_settings, transfers)
+            results = await self._commands.eyes_check_many(
+                self._eyes_ref, checks, config
+            )
+        return [self._match_result_from(r) for r in results]
+
+    async def check_image(self, image, tag=None):
+        # type: (Union[ByteString, Text, Image], Optional[Text]) -> bool
+        return await self.check(tag, Target.image(image))
+
+    async def check_region(self, image, region, tag=None):
+        # type: (Union[ByteString, Text, Image], Region, Optional[Text]) -> bool
+        return await self.check(tag, Target.region(image, region))
+
+    async def extract_text(self, *regions):
+        # type: (*OCRRegion) -> List[Text]
+        image = regions[0].image
+        assert all(is_same_image(r.image, image) for r in regions), "All images same"
+        with self._transferred_image(image) as image:
+            return await self._commands.eyes_extract_text(
+                self._eyes_ref,
+                target=marshal_image_target(image),
+                settings=marshal_ocr_extract_settings(regions),
+                config=self._marshaled_configuration(),
+            )
+
+    async def extract_text_regions(self, config):
+        # type: (TextRegionSettings) -> PATTERN_TEXT_REGIONS
+        return await self.locate_text(config)
+
+    async def locate_text(self, config):
+        # type: (TextRegionSettings) -> PATTERN_TEXT_REGIONS
+        image = config._image  # noqa
+        with self._transferred_image(image) as image:
+            result = await self._commands.eyes_locate_text(
+                self._eyes_ref,
+                target=marshal_image_target(image),
+                settings=marshal_ocr_search_settings(config),
+                config=self._marshaled_configuration(),
+            )
+        return demarshal_locate_text_result(result)
+
+    async def close(self, raise_ex=True):
+        # type: (bool) -> Optional[TestResults]
+        """
+        Ends the test.
+
+        :param raise_ex: If true, an exception will be raised for failed/new tests.
+        :return: The test results.
+        """
+        if not self.is_open:
+            raise EyesError("Eyes not open")
+        results = await self._commands.eyes_close_eyes(
+            self._eyes_ref,
+            {"throwErr": raise_ex},
+            self._marshaled_configuration(),
+            True,
+        )
+        self._eyes_ref = None
+        return self._close_results_from(results)
+
+    async def abort(self):
+        # type: () -> Optional[TestResults]
+        if self.configure.is_disabled:
+            return None
+        elif self.is_open:
+            results = await self._commands.eyes_abort_eyes(self._eyes_ref, True)
+            self._eyes_ref = None
+            return self._abort_results_from(results)
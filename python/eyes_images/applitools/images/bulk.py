@@ -0,0 +1,360 @@
+"""
+Bulk checks of image files, used by ``python -m applitools.images``.
+
+Images are grouped into tests by the names mapped from their paths. Every test
+is checked by one of the worker threads with its own Eyes, all of them sharing
+a single ClassicRunner. Results are reported as soon as each test is closed and
+appended to the checkpoint file, so an interrupted run can be resumed without
+checking the finished tests again.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import io
+import json
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from string import Formatter
+from time import time
+from typing import TYPE_CHECKING
+from xml.sax.saxutils import escape, quoteattr
+
+import attr
+from six import text_type
+
+from applitools.common.selenium import Configuration
+from applitools.selenium import ClassicRunner
+
+from .eyes import Eyes
+from .fluent import Target
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Optional, Text, Tuple
+
+DEFAULT_PATTERN = "{test}/{step}"
+DEFAULT_WORKERS = 4
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+# Statuses of the reported tests, besides TestResultsStatus values
+NEW = "New"
+ERROR = "Error"
+PASSED_STATUSES = ("Passed", NEW)
+
+
+@attr.s(frozen=True)
+class BulkStep(object):
+    path = attr.ib()  # type: Text
+    name = attr.ib()  # type: Text
+
+
+@attr.s
+class BulkTest(object):
+    app_name = attr.ib()  # type: Text
+    test_name = attr.ib()  # type: Text
+    steps = attr.ib(factory=list)  # type: List[BulkStep]
+
+    @property
+    def key(self):
+        # type: () -> Tuple[Text, Text]
+        return self.app_name, self.test_name
+
+
+class NamePattern(object):
+    """Maps the path of an image, relative to the scanned root, to its names.
+
+    The pattern is matched against the path without extension, `{app}` and
+    `{step}` match a single directory or file name, `{test}` one or several.
+    The step is named after the file when the pattern has no `{step}`.
+    """
+
+    _NAMES = {"app": "[^/]+", "test": ".+", "step": "[^/]+"}
+
+    def __init__(self, pattern):
+        # type: (Text) -> None
+        regex = ""
+        try:
+            for literal, name, _, _ in Formatter().parse(pattern):
+                regex += re.escape(literal)
+                if name is not None:
+                    regex += "(?P<{}>{})".format(name, self._NAMES[name])
+            self._regex = re.compile(regex + "$")
+        except (KeyError, ValueError, re.error):
+            raise ValueError("Invalid name pattern", pattern)
+        if "test" not in self._regex.groupindex:
+            raise ValueError("Name pattern should contain {test}", pattern)
+
+    def names(self, relative_path):
+        # type: (Text) -> Optional[Dict[Text, Text]]
+        stem = os.path.splitext(relative_path.replace(os.sep, "/"))[0]
+        match = self._regex.match(stem)
+        if match is None:
+            return None
+        names = {"step": stem.rsplit("/", 1)[-1]}
+        names.update(match.groupdict())
+        return names
+
+
+def scan_directory(root, pattern, app_name=None):
+    # type: (Text, NamePattern, Optional[Text]) -> Tuple[List[BulkTest], List[Text]]
+    """Finds images in the directory tree, returns tests and unmatched images.
+
+    App name defaults to the name of the directory.
+    """
+    entries = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        entries.extend(
+            {"path": os.path.join(directory, f)}
+            for f in sorted(files)
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+    app_name = app_name or os.path.basename(os.path.abspath(root))
+    return _grouped(entries, root, pattern, app_name)
+
+
+def read_manifest(manifest, pattern, app_name=None):
+    # type: (Text, NamePattern, Optional[Text]) -> Tuple[List[BulkTest], List[Text]]
+    """Reads image list, returns tests and unmatched images.
+
+    Every line is either an image path or a json object with "path" and
+    optional "app", "test" and "step" names overriding the mapped ones.
+    Relative paths are relative to the manifest directory.
+    """
+    root = os.path.dirname(os.path.abspath(manifest))
+    entries = []
+    with io.open(manifest, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line) if line.startswith("{") else {"path": line}
+            entry["path"] = os.path.join(root, entry["path"])
+            entries.append(entry)
+    app_name = app_name or os.path.basename(root)
+    return _grouped(entries, root, pattern, app_name)
+
+
+def _grouped(entries, root, pattern, app_name):
+    # type: (Iterable[dict], Text, NamePattern, Text) -> Tuple[List[BulkTest], List[Text]]
+    tests = OrderedDict()  # type: OrderedDict[Tuple[Text, Text], BulkTest]
+    unmatched = []
+    for entry in entries:
+        names = pattern.names(os.path.relpath(entry["path"], root)) or {}
+        names.update((k, entry[k]) for k in ("app", "test", "step") if entry.get(k))
+        if "test" not in names:
+            unmatched.append(entry["path"])
+            continue
+        test = BulkTest(names.get("app", app_name), names["test"])
+        test = tests.setdefault(test.key, test)
+        step_name = names.get("step") or os.path.basename(entry["path"])
+        test.steps.append(BulkStep(entry["path"], step_name))
+    return list(tests.values()), unmatched
+
+
+class Checkpoint(object):
+    """Records of the reported tests, appended to the file as json lines."""
+
+    def __init__(self, path):
+        # type: (Text) -> None
+        self.path = path
+        self.records = OrderedDict()  # type: OrderedDict[Tuple[Text, Text], dict]
+        needs_newline = False
+        if os.path.exists(path):
+            with io.open(path, encoding="utf-8") as f:
+                for line in f:
+                    needs_newline = not line.endswith("\n")
+                    try:
+                        record = json.loads(line)
+                    except ValueError:  # the last line written when interrupted
+                        continue
+                    self.records[(record["app"], record["test"])] = record
+        self._file = io.open(path, "a", encoding="utf-8")
+        if needs_newline:
+            self._file.write("\n")
+
+    def is_finished(self, test):
+        # type: (BulkTest) -> bool
+        """Tests failed with an error are checked again."""
+        record = self.records.get(test.key)
+        return record is not None and record["status"] != ERROR
+
+    def add(self, record):
+        # type: (dict) -> None
+        self.records[(record["app"], record["test"])] = record
+        self._file.write(_json_line(record))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        # type: () -> None
+        self._file.close()
+
+
+class JsonLinesReport(object):
+    """Writes a json line per test."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def add(self, record):
+        # type: (dict) -> None
+        self._stream.write(_json_line(record))
+        self._stream.flush()
+
+    def close(self):
+        # type: () -> None
+        pass
+
+
+class JUnitReport(object):
+    """Writes JUnit xml testcase elements as soon as tests finish.
+
+    The document is complete only after close.
+    """
+
+    def __init__(self, stream, name="applitools.images"):
+        self._stream = stream
+        self._stream.write(
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            "<testsuite name={}>\n".format(quoteattr(name))
+        )
+
+    def add(self, record):
+        # type: (dict) -> None
+        case = "  <testcase classname={} name={} time={}".format(
+            quoteattr(record["app"]),
+            quoteattr(record["test"]),
+            quoteattr("{:.3f}".format(record["duration"])),
+        )
+        status = record["status"]
+        if status in PASSED_STATUSES:
+            case += "/>\n"
+        elif status == ERROR:
+            case += ">\n    <error message={}/>\n  </testcase>\n".format(
+                quoteattr(record["error"])
+            )
+        else:
+            message = "{}: {} mismatches".format(status, record["mismatches"])
+            case += ">\n    <failure message={} type={}>{}</failure>\n".format(
+                quoteattr(message), quoteattr(status), escape(record["url"] or "")
+            )
+            case += "  </testcase>\n"
+        self._stream.write(case)
+        self._stream.flush()
+
+    def close(self):
+        # type: () -> None
+        self._stream.write("</testsuite>\n")
+        self._stream.flush()
+
+
+class BulkChecker(object):
+    """Checks tests in a pool of worker threads sharing the runner."""
+
+    def __init__(self, configuration=None, workers=DEFAULT_WORKERS, runner=None):
+        # type: (Optional[Configuration], int, Optional[ClassicRunner]) -> None
+        if workers < 1:
+            raise ValueError("Number of workers should be positive", workers)
+        self.configuration = configuration or Configuration()
+        self.workers = workers
+        self.runner = runner or ClassicRunner()
+
+    def run(self, tests, reports=(), checkpoint=None):
+        # type: (Iterable[BulkTest], Iterable[object], Optional[Checkpoint]) -> List[dict]
+        """Checks the tests not finished according to the checkpoint.
+
+        Records of the finished tests are reported first, the rest are reported
+        and added to the checkpoint in the order of finishing. Returns all the
+        reported records.
+        """
+        records = []
+
+        def report(record):
+            records.append(record)
+            for r in reports:
+                r.add(record)
+
+        pending = []
+        for test in tests:
+            if checkpoint and checkpoint.is_finished(test):
+                report(checkpoint.records[test.key])
+            else:
+                pending.append(test)
+        executor = ThreadPoolExecutor(self.workers)
+        futures = [executor.submit(self.check, test) for test in pending]
+        finished = set()
+
+        def finish(future):
+            finished.add(future)
+            record = future.result()
+            if checkpoint:
+                checkpoint.add(record)
+            report(record)
+
+        try:
+            for future in as_completed(futures):
+                finish(future)
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            # tests already being checked are finished and recorded
+            for future in wait(futures).done - finished:
+                if not future.cancelled():
+                    finish(future)
+            raise
+        finally:
+            executor.shutdown()
+        self.runner.get_all_test_results(False)
+        return records
+
+    def check(self, test):
+        # type: (BulkTest) -> dict
+        """Checks all the steps of the test, returns its record."""
+        started = time()
+        eyes = Eyes(self.runner)
+        eyes.configure = self.configuration.clone()
+        try:
+            eyes.open(test.app_name, test.test_name)
+            eyes.check_many(
+                Target.image(step.path).with_name(step.name) for step in test.steps
+            )
+            results = eyes.close(False)
+        except Exception as exc:
+            try:
+                eyes.abort()
+            except Exception:
+                pass  # the error of the check is reported
+            return _record(test, time() - started, error=exc)
+        return _record(test, time() - started, results)
+
+
+def is_passed(record):
+    # type: (dict) -> bool
+    return record["status"] in PASSED_STATUSES
+
+
+def _record(test, duration, results=None, error=None):
+    record = {
+        "app": test.app_name,
+        "test": test.test_name,
+        "steps": len(test.steps),
+        "duration": round(duration, 3),
+    }
+    if results is None and error is None:  # eyes aborted by closed runner
+        error = "No test results"
+    elif error is None and not results.is_new and results.status is None:
+        error = "No test status"
+    if error is not None:
+        record.update(status=ERROR, error=text_type(error))
+    else:
+        record.update(
+            status=NEW if results.is_new else results.status.value,
+            mismatches=results.mismatches,
+            url=results.url,
+        )
+    return record
+
+
+def _json_line(record):
+    # type: (dict) -> Text
+    return text_type(json.dumps(record, sort_keys=True)) + "\n"
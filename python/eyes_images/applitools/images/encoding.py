@@ -0,0 +1,146 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from copy import copy
+from typing import TYPE_CHECKING
+
+from six import BytesIO
+
+from applitools.common.geometry import Region
+from applitools.common.selenium.misc import ImageTransfer
+
+from .fluent import (
+    Image,
+    ImagesCheckSettings,
+    image_path_or_bytes,
+    is_in_memory_image,
+    ndarray,
+    open_image,
+    png_bytes,
+)
+from .image_cache import encoded_images, image_files, image_key
+
+if TYPE_CHECKING:
+    from typing import ByteString, Iterator, Optional, Text, Tuple, Union
+
+SHARED_MEMORY_DIR = "/dev/shm"
+
+
+@contextmanager
+def transferred_image(
+    image,  # type: Union[ByteString, Image, ndarray, Text, None]
+    image_transfer=None,  # type: Optional[ImageTransfer]
+    compression_level=None,  # type: Optional[int]
+    threads=None,  # type: Optional[int]
+):
+    # type: (...) -> Iterator[Optional[Text]]
+    """Yields the value of the image to be sent to the universal server.
+
+    With SHARED_MEMORY transfer in-memory images are written to a temporary file,
+    preferably located in shared memory, and only the file path is sent instead
+    of the base64 encoded image. The file is removed on exit from the context,
+    so the command using the image should be completed by that moment.
+
+    With CONTENT_ADDRESSED transfer the file is named by hash of the image and
+    is kept in image_files cache, so the same image is written once. Base64
+    encoded images are cached in encoded_images cache, if it is enabled.
+
+    PIL images and numpy arrays are encoded to PNG with given zlib compression
+    level, arrays are compressed by given number of threads.
+    """
+    if image is None:
+        yield None
+    elif not is_in_memory_image(image):
+        yield image_path_or_bytes(image)
+    elif image_transfer is ImageTransfer.CONTENT_ADDRESSED and image_files.max_size:
+        with image_files.pinned(
+            image_key(image), lambda: _image_file(image, compression_level, threads)
+        ) as path:
+            yield path
+    elif image_transfer in (
+        ImageTransfer.SHARED_MEMORY,
+        ImageTransfer.CONTENT_ADDRESSED,  # when the cache is disabled
+    ):
+        fd, path = tempfile.mkstemp(prefix="applitools-", dir=_shared_memory_dir())
+        try:
+            with os.fdopen(fd, "wb") as f:
+                _write_image(image, f, compression_level, threads)
+            yield path
+        finally:
+            os.remove(path)
+    elif encoded_images.max_size:
+        yield encoded_images.get_or_encode(
+            image_key(image), lambda: _encoded(image, compression_level, threads)
+        )
+    else:
+        yield image_path_or_bytes(image, compression_level, threads)
+
+
+def cropped_check_settings(check_settings):
+    # type: (ImagesCheckSettings) -> ImagesCheckSettings
+    """Crops in-memory image of the check settings to its target region.
+
+    The universal server crops the image to the target region before
+    matching, so the other regions of the check settings are already relative
+    to the target region and are kept as is. Images given by path or url are
+    read by the server itself and are not cropped.
+    """
+    values = check_settings.values
+    region = values.target_region
+    if not isinstance(region, Region) or not is_in_memory_image(values.image):
+        return check_settings
+    image = values.image
+    if isinstance(image, ndarray):
+        height, width = image.shape[:2]
+    else:
+        if not isinstance(image, Image):
+            image = open_image(BytesIO(image))
+        width, height = image.size
+    left, top = max(int(round(region.left)), 0), max(int(round(region.top)), 0)
+    right = min(int(round(region.left + region.width)), width)
+    bottom = min(int(round(region.top + region.height)), height)
+    if right <= left or bottom <= top:
+        return check_settings  # let the server report the invalid region
+    values = copy(values)
+    if isinstance(image, ndarray):
+        values.image = image[top:bottom, left:right]  # a view, not a copy
+    else:
+        values.image = image.crop((left, top, right, bottom))
+    values.target_region = None
+    check_settings = copy(check_settings)
+    check_settings.values = values
+    return check_settings
+
+
+def _encoded(image, compression_level, threads):
+    # type: (Union[ByteString, Image, ndarray], Optional[int], Optional[int]) -> Tuple[Text, int]
+    encoded = image_path_or_bytes(image, compression_level, threads)
+    return encoded, len(encoded)
+
+
+def _image_file(image, compression_level, threads):
+    # type: (Union[ByteString, Image, ndarray], Optional[int], Optional[int]) -> Tuple[Text, int]
+    """Writes the image to a new file named by its content hash."""
+    # Unique, so the file of the image evicted meanwhile is not overwritten
+    fd, path = tempfile.mkstemp(
+        ".png", "applitools-{}-".format(image_key(image)), _shared_memory_dir()
+    )
+    with os.fdopen(fd, "wb") as f:
+        _write_image(image, f, compression_level, threads)
+        size = f.tell()
+    return path, size
+
+
+def _write_image(image, stream, compression_level=None, threads=None):
+    if isinstance(image, (Image, ndarray)):
+        stream.write(png_bytes(image, compression_level, threads))
+    else:
+        stream.write(image)
+
+
+def _shared_memory_dir():
+    # type: () -> Text
+    if os.path.isdir(SHARED_MEMORY_DIR) and os.access(SHARED_MEMORY_DIR, os.W_OK):
+        return SHARED_MEMORY_DIR
+    else:
+        return tempfile.gettempdir()
@@ -4,14 +4,14 @@ from applitools.common import Region
 from applitools.core import TextRegionSettings as TextRegionSettingsBase
 from applitools.core.extract_text import OCRRegion as BaseOCRRegion
 
-from .fluent import Image, image_path_or_bytes
+from .fluent import Image, image_or_path_of
 
 
 class OCRRegion(BaseOCRRegion):
     def __init__(self, image, region_in_image=None):
         # type: (Union[Image, Text], Optional[Region]) -> None
         super(OCRRegion, self).__init__(region_in_image)
-        self.image = image_path_or_bytes(image)
+        self.image = image_or_path_of(image)
 
 
 class TextRegionSettings(TextRegionSettingsBase):
@@ -23,5 +23,5 @@ class TextRegionSettings(TextRegionSettingsBase):
     def image(self, image):
         # type: (Union[Image, Text]) -> TextRegionSettings
         cloned = self._clone()
-        cloned._image = image_path_or_bytes(image)
+        cloned._image = image_or_path_of(image)
         return cloned
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, ByteString, Union, overload
 
-from six import string_types
+from six import PY2, string_types
 
 from applitools.common import (
     EyesError,
@@ -10,54 +10,58 @@ from applitools.common import (
     deprecated,
 )
 from applitools.common.selenium import Configuration
+from applitools.images.encoding import cropped_check_settings, transferred_image
 from applitools.images.extract_text import OCRRegion, TextRegionSettings
-from applitools.images.fluent import Image, ImagesCheckSettings, Target
+from applitools.images.fluent import (
+    Image,
+    ImagesCheckSettings,
+    Target,
+    is_same_image,
+    ndarray,
+)
 from applitools.selenium import ClassicRunner
 from applitools.selenium.runner import log_session_results_and_raise_exception
 from applitools.selenium.schema import (
+    ConfigurationMarshaler,
     demarshal_locate_text_result,
     demarshal_match_result,
     demarshal_test_results,
     marshal_check_settings,
-    marshal_configuration,
     marshal_image_target,
     marshal_ocr_extract_settings,
     marshal_ocr_search_settings,
 )
 
+if PY2:
+    from contextlib2 import ExitStack
+else:
+    from contextlib import ExitStack
+
 if TYPE_CHECKING:
-    from typing import List, Optional, Text
+    from typing import ContextManager, Iterable, List, Optional, Text, Tuple
 
-    from applitools.common import TestResults
+    from applitools.common import MatchResult, TestResults
     from applitools.common.utils.custom_types import ViewPort
 
     from ..core.extract_text import PATTERN_TEXT_REGIONS
 
 
 class Eyes(object):
-    def __init__(self):
+    def __init__(self, runner=None):
+        # type: (Optional[ClassicRunner]) -> None
         self.configure = Configuration()
-        self._runner = ClassicRunner()
+        self._configuration_marshaler = ConfigurationMarshaler()
+        self._runner = runner or ClassicRunner()
         self._commands = self._runner._commands  # noqa
         self._eyes_ref = None
 
     def open(self, app_name, test_name, dimension=None):
         # type: (Text, Text, Optional[ViewPort]) -> None
-        if app_name is not None:
-            self.configure.app_name = app_name
-        if test_name is not None:
-            self.configure.test_name = test_name
-        if dimension is not None:
-            self.configure.viewport_size = dimension
-        if self.configure.app_name is None:
-            raise ValueError("app_name should be set via configuration or an argument")
-        if self.configure.test_name is None:
-            raise ValueError("test_name should be set via configuration or an argument")
-
+        self._update_open_configuration(app_name, test_name, dimension)
         self._runner._set_connection_config(self.configure)  # noqa, friend
         self._eyes_ref = self._commands.manager_open_eyes(
             self._runner._ref,  # noqa
-            config=marshal_configuration(self.configure),
+            config=self._marshaled_configuration(),
         )
 
     @overload
@@ -72,32 +76,31 @@ class Eyes(object):
 
     def check(self, check_settings, name=None):
         # type: (ImagesCheckSettings, Optional[Text]) -> bool
-        if isinstance(name, ImagesCheckSettings) or isinstance(
-            check_settings, string_types
-        ):
-            check_settings, name = name, check_settings
-        if name:
-            check_settings = check_settings.with_name(name)
-
-        results = self._commands.eyes_check(
-            self._eyes_ref,
-            target=marshal_image_target(check_settings),
-            settings=marshal_check_settings(check_settings),
-            config=marshal_configuration(self.configure),
-        )
-        # Original API only returns one result
-        results = demarshal_match_result(results[0])
-        if (
-            not results.as_expected
-            and self.configure.failure_reports is FailureReports.IMMEDIATE
-        ):
-            raise TestFailedError(
-                "Mismatch found in '{}' of '{}'".format(
-                    self.configure.test_name, self.configure.app_name
-                )
+        check_settings = self._check_settings_from(check_settings, name)
+        check_settings = self._locally_cropped(check_settings)
+        with self._transferred_image(check_settings.values.image) as image:
+            results = self._commands.eyes_check(
+                self._eyes_ref,
+                target=marshal_image_target(image),
+                settings=marshal_check_settings(
+                    check_settings, self.configure.coalesce_regions
+                ),
+                config=self._marshaled_configuration(),
             )
-        else:
-            return results.as_expected
+        return self._match_result_from(results).as_expected
+
+    def check_many(self, check_settings):
+        # type: (Iterable[ImagesCheckSettings]) -> List[MatchResult]
+        """Checks several images in one pipelined batch.
+
+        All the checkpoints are sent with the same marshaled configuration
+        before waiting for any of them, the results are returned in order.
+        """
+        config = self._marshaled_configuration()
+        with ExitStack() as transfers:
+            checks = self._marshaled_checks(check_settings, transfers)
+            results = self._commands.eyes_check_many(self._eyes_ref, checks, config)
+        return [self._match_result_from(r) for r in results]
 
     def check_image(self, image, tag=None):
         # type: (Union[ByteString, Text, Image], Optional[Text]) -> bool
@@ -110,13 +113,14 @@ class Eyes(object):
     def extract_text(self, *regions):
         # type: (*OCRRegion) -> List[Text]
         image = regions[0].image
-        assert all(r.image == image for r in regions), "All images same"
-        return self._commands.eyes_extract_text(
-            self._eyes_ref,
-            target={"image": image},
-            settings=marshal_ocr_extract_settings(regions),
-            config=marshal_configuration(self.configure),
-        )
+        assert all(is_same_image(r.image, image) for r in regions), "All images same"
+        with self._transferred_image(image) as image:
+            return self._commands.eyes_extract_text(
+                self._eyes_ref,
+                target=marshal_image_target(image),
+                settings=marshal_ocr_extract_settings(regions),
+                config=self._marshaled_configuration(),
+            )
 
     @deprecated.attribute(
         "The `extract_text_regions` is deprecated. Use `locate_text` instead"
@@ -127,12 +131,14 @@ class Eyes(object):
 
     def locate_text(self, config):
         # type: (TextRegionSettings) -> PATTERN_TEXT_REGIONS
-        result = self._commands.eyes_locate_text(
-            self._eyes_ref,
-            target={"image": config._image},  # noqa
-            settings=marshal_ocr_search_settings(config),
-            config=marshal_configuration(self.configure),
-        )
+        image = config._image  # noqa
+        with self._transferred_image(image) as image:
+            result = self._commands.eyes_locate_text(
+                self._eyes_ref,
+                target=marshal_image_target(image),
+                settings=marshal_ocr_search_settings(config),
+                config=self._marshaled_configuration(),
+            )
         return demarshal_locate_text_result(result)
 
     def close(self, raise_ex=True):
@@ -148,17 +154,11 @@ class Eyes(object):
         results = self._commands.eyes_close_eyes(
             self._eyes_ref,
             {"throwErr": raise_ex},
-            marshal_configuration(self.configure),
+            self._marshaled_configuration(),
             True,
         )
         self._eyes_ref = None
-        results = demarshal_test_results(results, self.configure)
-        if results:
-            for r in results:
-                log_session_results_and_raise_exception(False, r)
-            return results[0]  # Original interface returns just one result
-        else:  # eyes are already aborted by closed runner
-            return None
+        return self._close_results_from(results)
 
     def abort(self):
         # type: () -> Optional[TestResults]
@@ -167,18 +167,117 @@ class Eyes(object):
         elif self.is_open:
             results = self._commands.eyes_abort_eyes(self._eyes_ref, True)
             self._eyes_ref = None
-            if results:  # abort after close does not return results
-                results = demarshal_test_results(results, self.configure)
-                for r in results:
-                    log_session_results_and_raise_exception(False, r)
-                return results[0]  # Original interface returns just one result
-            else:
-                return None
+            return self._abort_results_from(results)
 
     @property
     def is_open(self):
         return self._eyes_ref is not None
 
+    def _marshaled_configuration(self):
+        # type: () -> dict
+        return self._configuration_marshaler(self.configure)
+
+    def _update_open_configuration(self, app_name, test_name, dimension):
+        # type: (Optional[Text], Optional[Text], Optional[ViewPort]) -> None
+        if app_name is not None:
+            self.configure.app_name = app_name
+        if test_name is not None:
+            self.configure.test_name = test_name
+        if dimension is not None:
+            self.configure.viewport_size = dimension
+        if self.configure.app_name is None:
+            raise ValueError("app_name should be set via configuration or an argument")
+        if self.configure.test_name is None:
+            raise ValueError("test_name should be set via configuration or an argument")
+
+    @staticmethod
+    def _check_settings_from(check_settings, name):
+        # type: (ImagesCheckSettings, Optional[Text]) -> ImagesCheckSettings
+        if isinstance(name, ImagesCheckSettings) or isinstance(
+            check_settings, string_types
+        ):
+            check_settings, name = name, check_settings
+        if name:
+            check_settings = check_settings.with_name(name)
+        return check_settings
+
+    def _marshaled_checks(self, check_settings, transfers):
+        # type: (Iterable[ImagesCheckSettings], ExitStack) -> List[Tuple[dict, dict]]
+        """Marshals (target, settings) of the checks, the transferred images
+        are released by the transfers stack."""
+        checks = []
+        for settings in check_settings:
+            settings = self._check_settings_from(settings, None)
+            settings = self._locally_cropped(settings)
+            image = transfers.enter_context(
+                self._transferred_image(settings.values.image)
+            )
+            checks.append(
+                (
+                    marshal_image_target(image),
+                    marshal_check_settings(settings, self.configure.coalesce_regions),
+                )
+            )
+        return checks
+
+    def _transferred_image(self, image):
+        # type: (Union[ByteString, Image, ndarray, Text, None]) -> ContextManager[Optional[Text]]
+        config = self.configure
+        return transferred_image(
+            image,
+            config.image_transfer,
+            config.png_compression_level,
+            config.png_encoder_threads,
+        )
+
+    def _locally_cropped(self, check_settings):
+        # type: (ImagesCheckSettings) -> ImagesCheckSettings
+        config = self.configure
+        if config.crop_images_locally and not (
+            # the server normalizes the whole image before cropping
+            config.cut_provider
+            or config.scale_ratio
+            or config.rotation
+        ):
+            return cropped_check_settings(check_settings)
+        return check_settings
+
+    def _match_result_from(self, results):
+        # type: (List[dict]) -> MatchResult
+        # Original API only returns one result
+        results = demarshal_match_result(results[0])
+        if (
+            not results.as_expected
+            and self.configure.failure_reports is FailureReports.IMMEDIATE
+        ):
+            raise TestFailedError(
+                "Mismatch found in '{}' of '{}'".format(
+                    self.configure.test_name, self.configure.app_name
+                )
+            )
+        else:
+            return results
+
+    def _close_results_from(self, results):
+        # type: (List[dict]) -> Optional[TestResults]
+        results = demarshal_test_results(results, self.configure)
+        if results:
+            for r in results:
+                log_session_results_and_raise_exception(False, r)
+            return results[0]  # Original interface returns just one result
+        else:  # eyes are already aborted by closed runner
+            return None
+
+    def _abort_results_from(self, results):
+        # type: (Optional[List[dict]]) -> Optional[TestResults]
+        if results:  # abort after close does not return results
+            results = demarshal_test_results(results, self.configure)
+            for r in results:
+                log_session_results_and_raise_exception(False, r)
+            return results[0]  # Original interface returns just one result
+        else:
+            return None
+
     def __getattr__(self, item):
         return getattr(self.configure, item)
 
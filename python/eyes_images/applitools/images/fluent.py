@@ -1,5 +1,5 @@
 from base64 import b64encode
-from typing import TYPE_CHECKING, ByteString, Optional, Text, Union, overload
+from typing import TYPE_CHECKING, Any, ByteString, Optional, Text, Union, overload
 
 import attr
 from six import PY2, BytesIO, binary_type, string_types
@@ -9,6 +9,8 @@ from applitools.selenium.fluent.selenium_check_settings import (
     SeleniumCheckSettingsValues,
 )
 
+from .png import encode_png, is_encodable
+
 if TYPE_CHECKING:
     from applitools.common import Region
 
@@ -22,6 +24,7 @@ except ImportError:
 
 try:
     from PIL.Image import Image
+    from PIL.Image import open as open_image
 except ImportError:
 
     class Image(object):
@@ -34,10 +37,22 @@ except ImportError:
             # type: (BytesIO, Text) -> binary_type
             raise RuntimeError("Please install pillow package if you need Image class.")
 
+    def open_image(_):
+        # type: (BytesIO) -> Image
+        raise RuntimeError("Please install pillow package to crop images locally.")
+
+
+try:
+    from numpy import ndarray
+except ImportError:
+
+    class ndarray(object):
+        """Dummy class to avoid conditions in Target methods"""
+
 
 @attr.s
 class ImagesCheckSettingsValues(SeleniumCheckSettingsValues):
-    image = attr.ib(default=None)  # type: Optional[Text]
+    image = attr.ib(default=None)  # type: Union[ByteString, Image, ndarray, Text, None]
 
 
 @attr.s
@@ -64,6 +79,12 @@ class Target(object):
         # type: (ByteString) -> ImagesCheckSettings
         pass
 
+    @staticmethod  # noqa
+    @overload
+    def image(image):
+        # type: (ndarray) -> ImagesCheckSettings
+        pass
+
     @staticmethod  # noqa
     @overload
     def image(path):
@@ -73,7 +94,7 @@ class Target(object):
     @staticmethod  # noqa
     def image(image_or_path):
         check_settings = ImagesCheckSettings()
-        check_settings.values.image = image_path_or_bytes(image_or_path)
+        check_settings.values.image = image_or_path_of(image_or_path)
         return check_settings
 
     @staticmethod  # noqa
@@ -88,6 +109,12 @@ class Target(object):
         # type: (ByteString, Region) -> ImagesCheckSettings
         pass
 
+    @staticmethod  # noqa
+    @overload
+    def region(image, rect):
+        # type: (ndarray, Region) -> ImagesCheckSettings
+        pass
+
     @staticmethod  # noqa
     @overload
     def region(path, rect):
@@ -101,18 +128,61 @@ class Target(object):
         return check_settings
 
 
-def image_path_or_bytes(image_or_path):
-    # type: (Union[ByteString, Image, Text, PathLike]) -> Text
+def image_or_path_of(image_or_path):
+    # type: (Union[ByteString, Image, ndarray, Text, PathLike]) -> Union[ByteString, Image, ndarray, Text]
+    """Validates image argument, in-memory images are encoded only on check."""
+    if isinstance(image_or_path, ndarray) and not is_encodable(image_or_path):
+        raise ValueError(
+            "Image array should be uint8 HxW or HxWxC array",
+            image_or_path.shape,
+            image_or_path.dtype,
+        )
+    elif isinstance(image_or_path, PathLike):
+        return fspath(image_or_path)
+    elif is_in_memory_image(image_or_path) or isinstance(image_or_path, string_types):
+        return image_or_path
+    else:
+        raise ValueError("Invalid image type", type(image_or_path))
+
+
+def is_in_memory_image(image):
+    # type: (Any) -> bool
+    return isinstance(image, (Image, ndarray)) or (
+        not PY2 and isinstance(image, binary_type)
+    )
+
+
+def is_same_image(image, other):
+    # type: (Any, Any) -> bool
+    """Arrays are compared by identity, == of arrays compares their elements."""
+    if isinstance(image, ndarray) or isinstance(other, ndarray):
+        return image is other
+    return image == other
+
+
+def png_bytes(image, compression_level=None, threads=None):
+    # type: (Union[Image, ndarray], Optional[int], Optional[int]) -> bytes
+    """Encodes the image, arrays are encoded by multithreaded encoder."""
+    if isinstance(image, ndarray):
+        return encode_png(image, compression_level, threads)
+    image_bytes = BytesIO()
+    if compression_level is None:
+        image.save(image_bytes, format="PNG")
+    else:
+        image.save(image_bytes, format="PNG", compress_level=compression_level)
+    return image_bytes.getvalue()
+
+
+def image_path_or_bytes(image_or_path, compression_level=None, threads=None):
+    # type: (Union[ByteString, Image, ndarray, Text, PathLike], Optional[int], Optional[int]) -> Text
     if not PY2 and isinstance(image_or_path, binary_type):
         image_bytes = b64encode(image_or_path)
         return image_bytes.decode("utf-8")
     elif isinstance(image_or_path, PathLike):
         return fspath(image_or_path)
-    elif isinstance(image_or_path, Image):
-        image_bytes = BytesIO()
-        image_or_path.save(image_bytes, format="PNG")
-        image_bytes = b64encode(image_bytes.getvalue())
-        return image_bytes.decode("utf-8")
+    elif isinstance(image_or_path, (Image, ndarray)):
+        image_bytes = png_bytes(image_or_path, compression_level, threads)
+        return b64encode(image_bytes).decode("utf-8")
     elif isinstance(image_or_path, string_types):
         return image_or_path
     else:
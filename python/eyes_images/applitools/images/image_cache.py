@@ -0,0 +1,173 @@
+import atexit
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from hashlib import sha256
+from threading import Event, Lock
+from typing import TYPE_CHECKING
+
+from applitools.common.utils.general_utils import get_env_with_prefix
+
+from .fluent import Image, ndarray
+
+if TYPE_CHECKING:
+    from typing import ByteString, Callable, Iterator, Optional, Text, Tuple, Union
+
+# Total size of the cached encoded images, 0 disables the caches
+IMAGE_CACHE_SIZE_ENV = "APPLITOOLS_IMAGE_CACHE_SIZE"
+DEFAULT_IMAGE_CACHE_SIZE = 64 * 1024 * 1024
+# Base64 encoded images are cached only when the size is set, hashing costs
+# every in-memory image a copy of its pixels, which pays off for repeated ones
+DEFAULT_ENCODED_IMAGE_CACHE_SIZE = 0
+
+
+class ImageCache(object):
+    """Least recently used encoded images keyed by hash of their content.
+
+    The size is limited by the total size of the encoded images. Entries in use
+    (see `pinned`) are never evicted, so the limit may be exceeded while many
+    images are in use at once. Evicted values are passed to on_evict. An image
+    is encoded once, concurrent users of it wait for that encoding.
+    """
+
+    def __init__(self, max_size, on_evict=None):
+        # type: (int, Optional[Callable[[Text], None]]) -> None
+        self.max_size = max_size
+        self._on_evict = on_evict
+        self._entries = OrderedDict()  # type: OrderedDict[Text, Tuple[Text, int]]
+        self._pins = {}  # key -> number of users of the entry
+        self._encodings = {}  # key -> Event set once the entry is encoded
+        self._size = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        # type: () -> int
+        return self._size
+
+    def get_or_encode(self, key, encode):
+        # type: (Text, Callable[[], Tuple[Text, int]]) -> Text
+        """Returns cached value or caches encode() returning value and its size."""
+        with self.pinned(key, encode) as value:
+            return value
+
+    @contextmanager
+    def pinned(self, key, encode):
+        # type: (Text, Callable[[], Tuple[Text, int]]) -> Iterator[Text]
+        """Same as get_or_encode, but keeps the entry cached within the context."""
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+        try:
+            yield self._entry(key, encode)[0]
+        finally:
+            with self._lock:
+                self._pins[key] -= 1
+                if not self._pins[key]:
+                    del self._pins[key]
+            self._evict()
+
+    def _entry(self, key, encode):
+        # type: (Text, Callable[[], Tuple[Text, int]]) -> Tuple[Text, int]
+        while True:
+            with self._lock:
+                entry = self._entries.pop(key, None)
+                if entry:
+                    self._entries[key] = entry  # most recently used now
+                    return entry
+                encoded = self._encodings.get(key)
+                if encoded is None:
+                    encoded = self._encodings[key] = Event()
+                    break
+            # pinned, so the entry isn't evicted before it's taken, but it is
+            # missing if the encoding failed, then it's encoded again
+            encoded.wait()
+        try:
+            entry = encode()
+            self._put(key, entry)
+        finally:
+            with self._lock:
+                del self._encodings[key]
+            encoded.set()
+        return entry
+
+    def clear(self):
+        # type: () -> None
+        with self._lock:
+            evicted = [v for k, (v, _) in self._entries.items() if k not in self._pins]
+            self._entries = OrderedDict(
+                (k, e) for k, e in self._entries.items() if k in self._pins
+            )
+            self._size = sum(size for _, size in self._entries.values())
+        self._evicted(evicted)
+
+    def _put(self, key, entry):
+        # type: (Text, Tuple[Text, int]) -> None
+        with self._lock:
+            replaced = self._entries.pop(key, None)
+            if replaced:
+                self._size -= replaced[1]
+            self._entries[key] = entry
+            self._size += entry[1]
+        if replaced and replaced[0] != entry[0]:
+            self._evicted([replaced[0]])
+
+    def _evict(self):
+        # type: () -> None
+        evicted = []
+        with self._lock:
+            for key in list(self._entries):
+                if self._size <= self.max_size:
+                    break
+                if key not in self._pins:
+                    value, size = self._entries.pop(key)
+                    self._size -= size
+                    evicted.append(value)
+        self._evicted(evicted)
+
+    def _evicted(self, values):
+        # type: (list) -> None
+        if self._on_evict:
+            for value in values:
+                self._on_evict(value)
+
+
+def image_key(image):
+    # type: (Union[ByteString, Image, ndarray]) -> Text
+    """Hash of the image content, PIL images and arrays are hashed unencoded."""
+    if isinstance(image, Image):
+        digest = sha256("{} {}x{} ".format(image.mode, *image.size).encode("ascii"))
+        # palette and transparency are not a part of pixel data
+        digest.update(bytearray(image.getpalette() or []))
+        digest.update(repr(sorted(image.info.items())).encode("utf-8"))
+        digest.update(image.tobytes())
+        return "pil-" + digest.hexdigest()
+    elif isinstance(image, ndarray):
+        import numpy
+
+        digest = sha256("{} {}".format(image.dtype, image.shape).encode("ascii"))
+        digest.update(numpy.ascontiguousarray(image).data)
+        return "array-" + digest.hexdigest()
+    return "bytes-" + sha256(image).hexdigest()
+
+
+def cache_size_from_env(default=DEFAULT_IMAGE_CACHE_SIZE):
+    # type: (int) -> int
+    return int(get_env_with_prefix(IMAGE_CACHE_SIZE_ENV, str(default)))
+
+
+def _remove(path):
+    # type: (Text) -> None
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# Base64 encoded images embedded into the commands
+encoded_images = ImageCache(cache_size_from_env(DEFAULT_ENCODED_IMAGE_CACHE_SIZE))
+# Paths of the image files written once for CONTENT_ADDRESSED image transfer
+image_files = ImageCache(cache_size_from_env(), _remove)
+atexit.register(image_files.clear)
@@ -0,0 +1,107 @@
+"""
+PNG encoder of numpy image arrays.
+
+Rows are filtered with the PNG "up" filter in a single vectorized operation
+and the filtered image is split into horizontal strips deflated in parallel
+threads (zlib releases GIL while compressing). Strips are concatenated into
+a single zlib stream the same way pigz does it: every strip but the last one
+ends with a sync flush, so it ends on a byte boundary and is not final.
+"""
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import List, Optional
+
+    from numpy import ndarray
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+DEFAULT_COMPRESSION_LEVEL = 6  # same as zlib and Pillow
+# Smaller strips do not compress well and are not worth a thread
+MIN_STRIP_SIZE = 256 * 1024
+_UP_FILTER = 2
+# Number of channels -> PNG color type: gray, gray + alpha, RGB, RGBA
+_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+
+def is_encodable(array):
+    # type: (ndarray) -> bool
+    """Checks the array is uint8 HxW or HxWxC array, C is 1 to 4 channels."""
+    shape = array.shape
+    return (
+        array.dtype.name == "uint8"
+        and (len(shape) == 2 or (len(shape) == 3 and shape[2] in _COLOR_TYPES))
+        and shape[0] > 0
+        and shape[1] > 0
+    )
+
+
+def encode_png(array, compression_level=None, threads=None):
+    # type: (ndarray, Optional[int], Optional[int]) -> bytes
+    """Encodes uint8 gray, gray with alpha, RGB or RGBA image array to PNG."""
+    import numpy
+
+    if not is_encodable(array):
+        raise ValueError(
+            "Image array should be uint8 HxW or HxWxC array", array.shape, array.dtype
+        )
+    if compression_level is None:
+        compression_level = DEFAULT_COMPRESSION_LEVEL
+    height, width = array.shape[:2]
+    channels = array.shape[2] if array.ndim == 3 else 1
+    pixels = array.reshape(height, width * channels)
+    filtered = numpy.empty((height, width * channels + 1), numpy.uint8)
+    filtered[:, 0] = _UP_FILTER
+    filtered[:, 1:] = pixels
+    # uint8 subtraction wraps around modulo 256 as the filter requires
+    numpy.subtract(pixels[1:], pixels[:-1], out=filtered[1:, 1:])
+    header = struct.pack("!IIBBBBB", width, height, 8, _COLOR_TYPES[channels], 0, 0, 0)
+    idat = _deflate(filtered, compression_level, threads or 1)
+    return b"".join(
+        [
+            PNG_SIGNATURE,
+            _chunk(b"IHDR", header),
+            _chunk(b"IDAT", idat),
+            _chunk(b"IEND", b""),
+        ]
+    )
+
+
+def _deflate(rows, level, threads):
+    # type: (ndarray, int, int) -> bytes
+    strips = _strips(rows, threads)
+    if len(strips) == 1:
+        return zlib.compress(rows, level)
+    last = [False] * (len(strips) - 1) + [True]
+    with ThreadPoolExecutor(len(strips)) as executor:
+        compressed = executor.map(_deflate_strip, strips, [level] * len(strips), last)
+        checksum = 1
+        for strip in strips:
+            checksum = zlib.adler32(strip, checksum)
+        compressed = list(compressed)
+    zlib_header = zlib.compress(b"", level)[:2]
+    adler32 = struct.pack("!I", checksum & 0xFFFFFFFF)
+    return b"".join([zlib_header] + compressed + [adler32])
+
+
+def _strips(rows, threads):
+    # type: (ndarray, int) -> List[ndarray]
+    import numpy
+
+    count = max(min(threads, rows.nbytes // MIN_STRIP_SIZE), 1)
+    return numpy.array_split(rows, count)  # row views
+
+
+def _deflate_strip(strip, level, last):
+    # type: (ndarray, int, bool) -> bytes
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    flush_mode = zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    return compressor.compress(strip) + compressor.flush(flush_mode)
+
+
+def _chunk(chunk_type, data):
+    # type: (bytes, bytes) -> bytes
+    crc = zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF
+    return struct.pack("!I", len(data)) + chunk_type + data + struct.pack("!I", crc)
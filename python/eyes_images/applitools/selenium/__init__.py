@@ -1,9 +1,13 @@
+from six import PY2
+
 from applitools.common import (
     DeviceName,
     FileLogger,
     MatchLevel,
     RectangleSize,
     Region,
+    RegionIndex,
+    RegionSet,
     StdoutLogger,
     TestResultContainer,
     TestResults,
@@ -40,12 +44,14 @@ from applitools.core.fluent.region import AccessibilityRegionByRectangle  # noqa
 from .eyes import Eyes
 from .fluent.target import Target  # noqa
 from .fluent.target_path import TargetPath
-from .runner import ClassicRunner, RunnerOptions, VisualGridRunner
+from .runner import ClassicRunner, RunnerOptions, TestResultsHandle, VisualGridRunner
 
 __all__ = (
     # noqa
     "BatchInfo",
     "Region",
+    "RegionIndex",
+    "RegionSet",
     "MatchLevel",
     "logger",
     "StdoutLogger",
@@ -69,6 +75,7 @@ __all__ = (
     "TestResults",
     "TestResultContainer",
     "TestResultsSummary",
+    "TestResultsHandle",
     "BatchClose",
     "AccessibilityRegionType",
     "AccessibilityLevel",
@@ -84,3 +91,18 @@ __all__ = (
     "OCRRegion",
     "TextRegionSettings",
 )
+
+if not PY2:
+    from .async_eyes import AsyncEyes
+    from .async_runner import (
+        AsyncClassicRunner,
+        AsyncTestResultsHandle,
+        AsyncVisualGridRunner,
+    )
+
+    __all__ += (
+        "AsyncEyes",
+        "AsyncClassicRunner",
+        "AsyncVisualGridRunner",
+        "AsyncTestResultsHandle",
+    )
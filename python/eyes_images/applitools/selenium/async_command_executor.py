@@ -0,0 +1,137 @@
+from __future__ import absolute_import
+
+import asyncio
+import logging
+from os import getcwd
+from typing import Any, Iterable, List, Optional, Text, Tuple
+from uuid import uuid1
+
+from .command_executor import CommandExecutor, _check_error, _check_payload
+from .connection import USDKConnection
+
+logger = logging.getLogger(__name__)
+
+
+class _EventLoopFuture(object):
+    """Delivers responses from the USDK receiver thread to an asyncio future.
+
+    Mimics the part of concurrent.futures.Future interface that is used by
+    USDKConnection receiver loop.
+    """
+
+    def __init__(self, loop, future):
+        # type: (asyncio.AbstractEventLoop, asyncio.Future) -> None
+        self._loop = loop
+        self._future = future
+
+    def set_result(self, result):
+        # type: (dict) -> None
+        self._call_soon(_set_result, result)
+
+    def set_exception(self, exception):
+        # type: (Exception) -> None
+        self._call_soon(_set_exception, exception)
+
+    def _call_soon(self, setter, value):
+        try:
+            self._loop.call_soon_threadsafe(setter, self._future, value)
+        except RuntimeError:
+            # Event loop was closed before the response arrived, nobody waits for it
+            logger.debug("Dropping USDK response for closed event loop")
+
+
+def _set_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future, exception):
+    if not future.done():
+        future.set_exception(exception)
+
+
+class AsyncUSDKConnection(USDKConnection):
+    """USDK connection that resolves command responses as awaitables.
+
+    Responses are still read by the connection's receiver thread, but they are
+    handed over to the event loop of the awaiting coroutine, so there is no need
+    to occupy a thread per in-flight command.
+    """
+
+    async def command(self, name, payload, wait_result, wait_timeout):
+        # type: (Text, dict, bool, float) -> Optional[dict]
+        if not wait_result:
+            self._send_unawaited_command(name, payload)
+            return None
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        key = str(uuid1())
+        response_future = self._response_futures[key] = _EventLoopFuture(loop, future)
+        trace = self._trace(name)
+        try:
+            request_bytes = self._send_command(name, key, payload)
+            if trace:
+                trace.sent(request_bytes)
+            response = await asyncio.wait_for(future, wait_timeout)
+        except (Exception, asyncio.CancelledError) as exc:
+            if isinstance(exc, asyncio.TimeoutError):
+                self.stats.increment("timed_out_commands")
+            elif isinstance(exc, asyncio.CancelledError):
+                self.stats.increment("cancelled_commands")
+            if trace:
+                trace.failed(exc)
+            raise
+        finally:
+            self._response_futures.pop(key, None)
+        if trace:
+            trace.completed(getattr(response_future, "response_size", None))
+        return response
+
+
+class AsyncCommandExecutor(CommandExecutor):
+    """Command executor which commands return awaitables instead of results."""
+
+    @classmethod
+    def create(cls, name, version):
+        # type: (Text, Text) -> AsyncCommandExecutor
+        commands = cls(AsyncUSDKConnection.create())
+        commands.make_core(name, version, getcwd())
+        return commands
+
+    async def eyes_check_many(self, eyes, checks, config=None, wait_timeout=9 * 60):
+        # type: (dict, Iterable[Tuple[Optional[dict], dict]], Optional[dict], float) -> List[dict]
+        """Sends all the (target, settings) checks before awaiting any of them.
+
+        Returns the results in order of the checks, the first failed check
+        raises its error once all of them are completed. The checks not
+        completed in wait_timeout fail with asyncio.TimeoutError.
+        """
+        results = await asyncio.gather(
+            *(
+                self._checked_command(
+                    "Eyes.check",
+                    _check_payload(eyes, target, settings, config),
+                    wait_timeout=wait_timeout,
+                )
+                for target, settings in checks
+            ),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def _checked_command(
+        self, name, payload, wait_result=True, wait_timeout=9 * 60
+    ):
+        # type: (Text, dict, bool, float) -> Optional[Any]
+        response = await self._connection.command(
+            name, payload, wait_result, wait_timeout
+        )
+        if wait_result:
+            response_payload = response["payload"]
+            _check_error(response_payload, name)
+            return response_payload.get("result")
+        else:
+            return None
@@ -0,0 +1,261 @@
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import typing
+from typing import List, Optional, Text, Union
+
+from six import string_types
+
+from applitools.common import EyesError, RectangleSize
+from applitools.common.selenium import Configuration
+
+from .__version__ import __version__
+from .async_command_executor import AsyncCommandExecutor
+from .async_runner import AsyncClassicRunner, AsyncEyesRunner, AsyncTestResultsHandle
+from .eyes import Eyes
+from .schema import (
+    ConfigurationMarshaler,
+    demarshal_locate_result,
+    marshal_check_settings,
+    marshal_locate_settings,
+    marshal_ocr_extract_settings,
+    marshal_ocr_search_settings,
+    marshal_viewport_size,
+    marshal_webdriver_ref,
+)
+
+if typing.TYPE_CHECKING:
+    from typing import Iterable
+
+    from applitools.common import MatchResult, TestResults
+    from applitools.common.utils.custom_types import ViewPort
+    from applitools.core import TextRegionSettings, VisualLocatorSettings
+    from applitools.core.extract_text import PATTERN_TEXT_REGIONS
+    from applitools.core.locators import LOCATORS_TYPE
+    from applitools.selenium import OCRRegion
+    from applitools.selenium.optional_deps import WebDriver
+
+    from .fluent.selenium_check_settings import SeleniumCheckSettings
+
+
+class AsyncEyes(Eyes):
+    """Eyes which methods communicating with Eyes server should be awaited.
+
+    Should be used with one of asyncio runners, `AsyncClassicRunner` (default)
+    or `AsyncVisualGridRunner`.
+    """
+
+    def __init__(self, runner=None):
+        # type: (Union[None, AsyncEyesRunner, Text]) -> None
+        self.configure = Configuration()
+        self._configuration_marshaler = ConfigurationMarshaler()
+        self._driver = None
+        self._eyes_ref = None
+        self._user_test_id = None  # type: Optional[Text]
+        if runner is None:
+            self._runner = AsyncClassicRunner()
+        elif isinstance(runner, string_types):
+            self.configure.server_url = runner
+            self._runner = AsyncClassicRunner()
+        else:
+            self._runner = runner  # type: AsyncEyesRunner
+        self._commands = self._runner._commands  # noqa
+
+    async def open(
+        self,
+        driver,  # type: WebDriver
+        app_name=None,  # type: Optional[Text]
+        test_name=None,  # type: Optional[Text]
+        viewport_size=None,  # type: Optional[ViewPort]
+    ):
+        # type: (...) -> WebDriver
+        self._update_open_configuration(app_name, test_name, viewport_size)
+        if not self.configure.is_disabled:
+            self._runner._set_connection_config(self.configure)  # noqa, friend
+            self._driver = driver
+            self._eyes_ref = await self._commands.manager_open_eyes(
+                await self._runner._get_ref(),  # noqa
+                marshal_webdriver_ref(driver),
+                config=self._open_configuration(),
+            )
+        return driver
+
+    async def check(self, check_settings, name=None):
+        # type: (SeleniumCheckSettings, Optional[Text]) -> Optional[MatchResult]
+        check_settings = self._check_settings_from(check_settings, name)
+        if self.configure.is_disabled:
+            return None
+        if not self.is_open:
+            await self.abort()
+            raise EyesError("you must call open() before checking")
+
+        results = await self._commands.eyes_check(
+            self._eyes_ref,
+            settings=marshal_check_settings(
+                check_settings, self.configure.coalesce_regions
+            ),
+            config=self._marshaled_configuration(),
+        )
+        return self._match_result_from(results)
+
+    async def check_many(self, check_settings):
+        # type: (Iterable[SeleniumCheckSettings]) -> List[Optional[MatchResult]]
+        """Checks several targets with the same marshaled configuration.
+
+        The checks are awaited one by one as each of them uses the driver,
+        the results are returned in order.
+        """
+        check_settings = [self._check_settings_from(s, None) for s in check_settings]
+        if self.configure.is_disabled:
+            return [None for _ in check_settings]
+        if not self.is_open:
+            await self.abort()
+            raise EyesError("you must call open() before checking")
+        config = self._marshaled_configuration()
+        results = []
+        for settings in check_settings:
+            result = await self._commands.eyes_check(
+                self._eyes_ref,
+                settings=marshal_check_settings(
+                    settings, self.configure.coalesce_regions
+                ),
+                config=config,
+            )
+            results.append(self._match_result_from(result))
+        return results
+
+    async def locate(self, visual_locator_settings):
+        # type: (VisualLocatorSettings) -> LOCATORS_TYPE
+        results = await self._commands.core_locate(
+            marshal_webdriver_ref(self.driver),
+            marshal_locate_settings(visual_locator_settings),
+            self._marshaled_configuration(),
+        )
+        return demarshal_locate_result(results)
+
+    async def extract_text(self, *regions):
+        # type: (*OCRRegion) -> List[Text]
+        return await self._commands.eyes_extract_text(
+            self._eyes_ref,
+            marshal_webdriver_ref(self.driver),
+            marshal_ocr_extract_settings(regions),
+            self._marshaled_configuration(),
+        )
+
+    async def locate_text(self, config):
+        # type: (TextRegionSettings) -> PATTERN_TEXT_REGIONS
+        return await self._commands.eyes_locate_text(
+            self._eyes_ref,
+            marshal_webdriver_ref(self.driver),
+            marshal_ocr_search_settings(config),
+            self._marshaled_configuration(),
+        )
+
+    async def close(self, raise_ex=True):
+        # type: (bool) -> Optional[TestResults]
+        """
+        Ends the test.
+
+        :param raise_ex: If true, an exception will be raised for failed/new tests.
+        :return: The test results.
+        """
+        return await self._close(raise_ex, True)
+
+    async def close_async(self):
+        # type: () -> Optional[AsyncTestResultsHandle]
+        """
+        Ends the test without awaiting its results.
+
+        :return: The handle of the test results, see `AsyncEyesRunner.gather`.
+        """
+        return await self._close(False, False)
+
+    async def abort(self):
+        # type: () -> Optional[TestResults]
+        """
+        If a test is running, aborts it. Otherwise, does nothing.
+        """
+        return await self._abort(True)
+
+    async def abort_async(self):
+        # type: () -> Optional[AsyncTestResultsHandle]
+        return await self._abort(False)
+
+    async def abort_if_not_closed(self):
+        return await self.abort()
+
+    @staticmethod
+    async def get_viewport_size(driver):
+        # type: (WebDriver) -> RectangleSize
+        cmd = AsyncCommandExecutor.get_instance(
+            AsyncEyesRunner.BASE_AGENT_ID, __version__
+        )
+        result = await cmd.core_get_viewport_size(marshal_webdriver_ref(driver))
+        return RectangleSize.from_(result)
+
+    @staticmethod
+    async def set_viewport_size(driver, viewport_size):
+        # type: (WebDriver, ViewPort) -> None
+        cmd = AsyncCommandExecutor.get_instance(
+            AsyncEyesRunner.BASE_AGENT_ID, __version__
+        )
+        await cmd.core_set_viewport_size(
+            marshal_webdriver_ref(driver), marshal_viewport_size(viewport_size)
+        )
+
+    async def _close(self, raise_ex, wait_result):
+        # type: (bool, bool) -> Union[None, TestResults, AsyncTestResultsHandle]
+        if self.configure.is_disabled:
+            return None
+        if not self.is_open:
+            raise EyesError("Eyes not open")
+        close = self._commands.eyes_close_eyes(
+            self._eyes_ref,
+            {"throwErr": raise_ex},
+            self._marshaled_configuration(),
+            True,
+        )
+        if wait_result:
+            results = await close
+        else:
+            # Awaited in background, see AsyncEyesRunner.gather
+            future = asyncio.ensure_future(close)
+        self._eyes_ref = None
+        self._driver = None
+        if wait_result:
+            return self._close_results_from(results, raise_ex)
+        return self._results_handle(future)
+
+    async def _abort(self, wait_result):
+        # type: (bool) -> Union[None, TestResults, AsyncTestResultsHandle]
+        if self.configure.is_disabled:
+            return None
+        elif self.is_open:
+            abort = self._commands.eyes_abort_eyes(self._eyes_ref, True)
+            if wait_result:
+                results = await abort
+            else:
+                future = asyncio.ensure_future(abort)
+            self._eyes_ref = None
+            self._driver = None
+            if wait_result:
+                return self._abort_results_from(results)
+            return self._results_handle(future)
+
+    def _results_handle(self, future):
+        # type: (asyncio.Future) -> AsyncTestResultsHandle
+        handle = AsyncTestResultsHandle(future, self.configure, self._user_test_id)
+        self._runner._add_pending_results(handle)  # noqa
+        return handle
+
+    def __enter__(self):
+        raise TypeError("Use `async with` statement with AsyncEyes")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type:
+            await self._abort(self._runner.AUTO_CLOSE_MODE_SYNC)
+        else:
+            await self._close(True, self._runner.AUTO_CLOSE_MODE_SYNC)
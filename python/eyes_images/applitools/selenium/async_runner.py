@@ -0,0 +1,228 @@
+from __future__ import absolute_import
+
+import asyncio
+import typing
+from threading import Lock
+from time import time
+
+from applitools.common import EyesError
+from applitools.common.config import DEFAULT_ALL_TEST_RESULTS_TIMEOUT
+
+from .__version__ import __version__
+from .async_command_executor import AsyncCommandExecutor
+from .runner import (
+    ClassicRunner,
+    EyesRunner,
+    TestResultsHandle,
+    VisualGridRunner,
+    _is_streamed,
+    _log_container,
+    _logged_failure,
+    _remaining,
+    _streamed_containers,
+)
+from .schema import (
+    demarshal_close_manager_results,
+    demarshal_server_info,
+    demarshal_test_results,
+)
+
+if typing.TYPE_CHECKING:
+    from threading import Thread
+    from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Text, Union
+
+    from applitools.common import (
+        ServerInfo,
+        TestResultContainer,
+        TestResults,
+        TestResultsSummary,
+    )
+
+    from .command_executor import ManagerType
+
+
+class AsyncEyesRunner(EyesRunner):
+    """Runner which commands are awaited on the asyncio event loop.
+
+    Eyes manager is created lazily on the first use because it requires
+    a running event loop.
+    """
+
+    def __init__(self, manager_type, concurrency=None, is_legacy=None):
+        # type: (ManagerType, Optional[int], Optional[bool]) -> None
+        self._connection_configuration = None
+        # Results of asynchronously closed eyes, not reported yet
+        self._pending_results = {}  # type: Dict[asyncio.Future, AsyncTestResultsHandle]
+        self._pending_results_lock = Lock()
+        self._commands = AsyncCommandExecutor.get_instance(
+            self.BASE_AGENT_ID, __version__
+        )
+        self._manager_type = manager_type
+        self._concurrency = concurrency
+        self._is_legacy = is_legacy
+        self._ref = None
+        self._make_manager_task = None
+
+    @classmethod
+    def prewarm(cls):
+        # type: () -> Thread
+        """Starts the universal server and connects to it in background."""
+        return AsyncCommandExecutor.prewarm(cls.BASE_AGENT_ID, __version__)
+
+    @classmethod
+    async def get_server_info(cls):
+        # type: () -> ServerInfo
+        cmd = AsyncCommandExecutor.get_instance(cls.BASE_AGENT_ID, __version__)
+        result = await cmd.server_get_info()
+        return demarshal_server_info(result)
+
+    async def get_all_test_results(
+        self,
+        should_raise_exception=True,
+        timeout=DEFAULT_ALL_TEST_RESULTS_TIMEOUT,
+        lazy=False,
+    ):
+        # type: (bool, Optional[int], bool) -> TestResultsSummary
+        ref = await self._get_ref()
+        with self._pending_results_lock:
+            self._pending_results.clear()
+        try:
+            results = await self._commands.manager_close_manager(
+                ref, should_raise_exception, timeout
+            )
+        except asyncio.TimeoutError:
+            raise EyesError("Tests didn't finish in {} seconds".format(timeout))
+        return self._summary_from(results, lazy)
+
+    async def iter_test_results(
+        self,
+        should_raise_exception=True,
+        timeout=DEFAULT_ALL_TEST_RESULTS_TIMEOUT,
+        lazy=False,
+    ):
+        # type: (bool, Optional[int], bool) -> AsyncIterator[TestResultContainer]
+        """Closes the runner yielding the test results as the tests finish.
+
+        Results of the eyes closed with close_async are yielded once the server
+        responds to their close. Results of the eyes closed with close are not
+        streamed, they are yielded once all the tests are finished.
+        With should_raise_exception, the first failed test raises its error
+        instead of being yielded.
+        """
+        deadline = None if timeout is None else time() + timeout
+        streamed_ids = set()  # type: Set[Text]
+        failure = None  # type: Optional[Exception]
+        ref = await self._get_ref()
+        with self._pending_results_lock:
+            pending = dict(self._pending_results)
+        try:
+            not_done = set(pending)
+            while not_done and failure is None:
+                done, not_done = await asyncio.wait(
+                    not_done,
+                    timeout=_remaining(deadline),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    raise asyncio.TimeoutError
+                self._pop_pending_results([pending[f] for f in done])
+                for future in done:
+                    handle = pending[future]
+                    for container in _streamed_containers(handle, lazy, streamed_ids):
+                        failure = _logged_failure(container, should_raise_exception)
+                        if failure is not None:
+                            break
+                        yield container
+                    if failure is not None:
+                        self._pop_pending_results(pending.values())
+                        break
+            # Failures are raised one by one below, as typed exceptions.
+            # The runner is closed after a failed streamed test too.
+            results = await self._commands.manager_close_manager(
+                ref, False, _remaining(deadline)
+            )
+        except asyncio.TimeoutError:
+            raise EyesError("Tests didn't finish in {} seconds".format(timeout))
+        if failure is not None:
+            raise failure
+        summary = demarshal_close_manager_results(
+            results, self._connection_configuration, lazy
+        )
+        for container in summary:
+            if not _is_streamed(container, streamed_ids):
+                _log_container(container, should_raise_exception)
+                yield container
+
+    async def gather(
+        self,
+        handles,
+        timeout=DEFAULT_ALL_TEST_RESULTS_TIMEOUT,
+        return_exceptions=False,
+    ):
+        # type: (Iterable[Optional[AsyncTestResultsHandle]], Optional[int], bool) -> List[Optional[Union[TestResults, Exception]]]
+        """Awaits the eyes closed with close_async or abort_async.
+
+        Returns the test results in the order of the handles. The error of the
+        first failed close is raised, unless return_exceptions is set, then it
+        is returned in place of the results.
+        """
+        handles = list(handles)
+        gathered = [h for h in handles if h is not None]  # None of disabled eyes
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *(h.result() for h in gathered), return_exceptions=return_exceptions
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            raise EyesError("Tests didn't finish in {} seconds".format(timeout))
+        results = iter(results)
+        return [None if h is None else next(results) for h in handles]
+
+    async def _get_ref(self):
+        # type: () -> dict
+        if self._ref is None:
+            if self._make_manager_task is None:
+                self._make_manager_task = asyncio.ensure_future(self._make_manager())
+            self._ref = await self._make_manager_task
+        return self._ref
+
+    async def _make_manager(self):
+        # type: () -> dict
+        if self._is_legacy:
+            return await self._commands.core_make_manager(
+                self._manager_type, legacy_concurrency=self._concurrency
+            )
+        else:
+            return await self._commands.core_make_manager(
+                self._manager_type, concurrency=self._concurrency
+            )
+
+
+class AsyncVisualGridRunner(VisualGridRunner, AsyncEyesRunner):
+    pass
+
+
+class AsyncClassicRunner(ClassicRunner, AsyncEyesRunner):
+    pass
+
+
+class AsyncTestResultsHandle(TestResultsHandle):
+    """Results of the async eyes closed or aborted without awaiting them."""
+
+    async def result(self, timeout=None):
+        # type: (Optional[float]) -> Optional[TestResults]
+        """Awaits the test to finish and returns its results.
+
+        Raises the close error, or asyncio.TimeoutError if the test didn't
+        finish in time. Aborting closed eyes has no results.
+        """
+        if self._results is None:
+            try:
+                # shielded, the test isn't cancelled when awaiting it times out
+                results = await asyncio.wait_for(asyncio.shield(self.future), timeout)
+            finally:
+                self._release()
+            self._results = demarshal_test_results(results or [], self.config)
+        return self._results[0] if self._results else None
@@ -1,13 +1,16 @@
 from __future__ import absolute_import
 
 import logging
+from concurrent.futures import Future, TimeoutError, wait
 from enum import Enum
 from os import getcwd
-from threading import Lock
-from typing import Any, List, Optional, Text
+from threading import Lock, Thread
+from typing import Any, Iterable, List, Optional, Text, Tuple
 
 from ..common.errors import USDKFailure
-from .connection import USDKConnection
+from .connection import ConnectionStats, USDKConnection
+from .connection_pool import CommandExecutorPool
+from .metrics import get_metrics_sink
 from .schema import demarshal_error
 
 logger = logging.getLogger(__name__)
@@ -31,17 +34,48 @@ class CommandExecutor(object):
     @classmethod
     def get_instance(cls, name, version):
         # type: (Text, Text) -> CommandExecutor
+        return cls._pool(name, version).acquire()
+
+    @classmethod
+    def prewarm(cls, name, version):
+        # type: (Text, Text) -> Thread
+        """Connects to the universal server in a background thread.
+
+        get_instance called meanwhile waits for this connection instead of
+        making another one.
+        """
+        thread = Thread(
+            target=cls._pool(name, version).prewarm, name="USDK Connection Prewarm"
+        )
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    @classmethod
+    def _pool(cls, name, version):
+        # type: (Text, Text) -> CommandExecutorPool
         with _instances_lock:
-            key = (name, version)
-            if key in _instances:
-                return _instances[key]
-            else:
-                return _instances.setdefault(key, cls.create(name, version))
+            key = (cls, name, version)
+            if key not in _instances:
+                _instances[key] = CommandExecutorPool.from_env(
+                    lambda: cls.create(name, version)
+                )
+            return _instances[key]
 
     def __init__(self, connection):
         # type: (USDKConnection) -> None
         self._connection = connection
 
+    @property
+    def in_flight(self):
+        # type: () -> int
+        return self._connection.in_flight
+
+    @property
+    def stats(self):
+        # type: () -> ConnectionStats
+        return self._connection.stats
+
     def make_core(self, name, version, cwd):
         # type: (Text, Text, Text) -> None
         self._connection.notification(
@@ -68,15 +102,21 @@ class CommandExecutor(object):
 
     def core_set_viewport_size(self, target, size):
         # type: (dict, dict) -> None
-        self._checked_command("Core.setViewportSize", {"target": target, "size": size})
+        return self._checked_command(
+            "Core.setViewportSize", {"target": target, "size": size}
+        )
 
     def core_close_batch(self, close_batch_settings):
         # type: (dict) -> None
-        self._checked_command("Core.closeBatch", {"settings": close_batch_settings})
+        return self._checked_command(
+            "Core.closeBatch", {"settings": close_batch_settings}
+        )
 
     def core_delete_test(self, close_test_settings):
         # type: (dict) -> None
-        self._checked_command("Core.deleteTest", {"settings": close_test_settings})
+        return self._checked_command(
+            "Core.deleteTest", {"settings": close_test_settings}
+        )
 
     def manager_open_eyes(self, manager, target=None, settings=None, config=None):
         # type: (dict, Optional[dict], Optional[dict], Optional[dict]) -> dict
@@ -99,15 +139,29 @@ class CommandExecutor(object):
 
     def eyes_check(self, eyes, target=None, settings=None, config=None):
         # type: (dict, Optional[dict], Optional[dict], Optional[dict]) -> dict
-        payload = {"eyes": eyes}
-        if target is not None:
-            payload["target"] = target
-        if settings is not None:
-            payload["settings"] = settings
-        if config is not None:
-            payload["config"] = config
+        payload = _check_payload(eyes, target, settings, config)
         return self._checked_command("Eyes.check", payload)
 
+    def eyes_check_many(self, eyes, checks, config=None, wait_timeout=9 * 60):
+        # type: (dict, Iterable[Tuple[Optional[dict], dict]], Optional[dict], float) -> List[dict]
+        """Sends all the (target, settings) checks before awaiting any of them.
+
+        Returns the results in order of the checks, the first failed check
+        raises its error once all of them are completed. The checks not
+        completed in wait_timeout fail with TimeoutError.
+        """
+        futures = [
+            self._checked_command_async(
+                "Eyes.check", _check_payload(eyes, target, settings, config)
+            )
+            for target, settings in checks
+        ]
+        _, not_done = wait(futures, wait_timeout)
+        for future in not_done:
+            self._connection.evict(future.command, TimeoutError())
+        # evicted futures have failed, the rest have or are about to resolve
+        return [future.result() for future in futures]
+
     def core_locate(self, target, settings, config=None):
         # type: (dict, dict, Optional[dict]) -> dict
         payload = {"target": target, "settings": settings}
@@ -146,6 +200,15 @@ class CommandExecutor(object):
         # type: (dict, bool) -> List[dict]
         return self._checked_command("Eyes.abort", {"eyes": eyes}, wait_result)
 
+    def eyes_close_eyes_async(self, eyes, settings, config):
+        # type: (dict, dict, dict) -> Future
+        payload = {"eyes": eyes, "settings": settings, "config": config}
+        return self._checked_command_async("Eyes.close", payload)
+
+    def eyes_abort_eyes_async(self, eyes):
+        # type: (dict) -> Future
+        return self._checked_command_async("Eyes.abort", {"eyes": eyes})
+
     def server_get_info(self):
         # type: () -> dict
         return self._checked_command("Server.getInfo", {})
@@ -155,17 +218,50 @@ class CommandExecutor(object):
         response = self._connection.command(name, payload, wait_result, wait_timeout)
         if wait_result:
             response_payload = response["payload"]
-            _check_error(response_payload)
+            _check_error(response_payload, name)
             return response_payload.get("result")
         else:
             return None
 
+    def _checked_command_async(self, name, payload):
+        # type: (Text, dict) -> Future
+        """Returns the future of the command result, resolved in receiver thread."""
+        checked = Future()
+
+        def check(future):
+            try:
+                response_payload = future.result()["payload"]
+                _check_error(response_payload, name)
+            except Exception as exc:
+                checked.set_exception(exc)
+            else:
+                checked.set_result(response_payload.get("result"))
+
+        checked.command = self._connection.command_async(name, payload)
+        checked.command.add_done_callback(check)
+        return checked
+
+
+def _check_payload(eyes, target, settings, config):
+    # type: (dict, Optional[dict], Optional[dict], Optional[dict]) -> dict
+    payload = {"eyes": eyes}
+    if target is not None:
+        payload["target"] = target
+    if settings is not None:
+        payload["settings"] = settings
+    if config is not None:
+        payload["config"] = config
+    return payload
+
 
-def _check_error(payload):
-    # type: (dict) -> None
+def _check_error(payload, name=None):
+    # type: (dict, Optional[Text]) -> None
     error = payload.get("error")
     if error:
         usdk_error = demarshal_error(error)
+        sink = get_metrics_sink()
+        if sink and name:
+            sink.command_error(name, type(usdk_error).__name__)
         logger.error("Re-raising an error received from SDK server: %r", usdk_error)
         raise usdk_error
 
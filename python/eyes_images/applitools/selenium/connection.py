@@ -1,30 +1,63 @@
 import atexit
 import logging
+import socket
 import weakref
-from concurrent.futures import Future
-from json import dumps, loads
-from threading import Thread
-from typing import Optional, Text
+from concurrent.futures import Future, TimeoutError
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Optional, Text
 from uuid import uuid1
 
-from websocket import WebSocket
+import attr
+from websocket import ABNF, WebSocket, WebSocketException
 
 from applitools.eyes_universal import get_instance
 
+from .json_codec import get_codec
+from .metrics import CommandTrace, get_metrics_sink
+
+if TYPE_CHECKING:
+    from typing import Type
+
+    from .json_codec import JsonCodec
+
 _all_sockets = []
 _logger = logging.getLogger(__name__)
+# Responses to the commands sent with this key prefix are not awaited by anyone
+NO_WAIT_KEY_PREFIX = "nowait-"
+
+
+@attr.s
+class ConnectionStats(object):
+    """Counters of the commands which responses weren't delivered to the caller."""
+
+    # Commands which responses weren't received before the deadline
+    timed_out_commands = attr.ib(default=0)  # type: int
+    # Commands which waiters were cancelled before the response was received
+    cancelled_commands = attr.ib(default=0)  # type: int
+    # Responses received after their command timed out or was cancelled
+    orphaned_responses = attr.ib(default=0)  # type: int
+    # Responses of fire-and-forget commands
+    unawaited_responses = attr.ib(default=0)  # type: int
+    _lock = attr.ib(factory=Lock, repr=False, eq=False)
+
+    def increment(self, counter):
+        # type: (Text) -> None
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
 
 
 class USDKConnection(object):
-    def __init__(self, websocket):
-        # type: (WebSocket) -> None
+    def __init__(self, websocket, codec=None):
+        # type: (WebSocket, Optional[Type[JsonCodec]]) -> None
         self._websocket = websocket
+        self._codec = codec or get_codec()
         self._response_futures = {}
+        self.stats = ConnectionStats()
         weak_socket = weakref.ref(self._websocket)
         self._receiver_thread = Thread(
             target=self._receiver_loop,
             name="USDK Receiver",
-            args=(weak_socket, self._response_futures),
+            args=(weak_socket, self._response_futures, self.stats, self._codec),
         )
         # Receiver threads are designed to exit even if they serve leaked unclosed
         # connections. But non-daemon threads are joined on shutdown deadlocking with
@@ -37,24 +70,100 @@ class USDKConnection(object):
     def create(cls, server=None):
         # type: (Optional[server.SDKServer]) -> USDKConnection
         server = server or get_instance()
+        socket_path = getattr(server, "socket_path", None)
+        if socket_path:
+            try:
+                return cls(_unix_socket_websocket(socket_path))
+            except (socket.error, OSError, WebSocketException) as e:
+                if not server.port:
+                    raise
+                _logger.warning("Falling back to TCP universal server: %s", e)
         websocket = WebSocket()
         websocket.connect("ws://localhost:{}/eyes".format(server.port))
         return cls(websocket)
 
+    @property
+    def in_flight(self):
+        # type: () -> int
+        """Number of commands waiting for the response."""
+        return len(self._response_futures)
+
     def notification(self, name, payload):
         # type: (Text, dict) -> None
-        self._websocket.send(dumps({"name": name, "payload": payload}))
+        self._websocket.send(self._codec.dumps({"name": name, "payload": payload}))
 
     def command(self, name, payload, wait_result, wait_timeout):
         # type: (Text, dict, bool, float) -> Optional[dict]
-        key = str(uuid1())
+        if not wait_result:
+            self._send_unawaited_command(name, payload)
+            return None
+        future = self.command_async(name, payload)
+        try:
+            return future.result(wait_timeout)
+        except TimeoutError as exc:
+            if not self.evict(future, exc):
+                return future.result()  # the response has just been received
+            raise
+
+    def evict(self, future, exc):
+        # type: (Future, Exception) -> bool
+        """Stops awaiting the response of the command, which timed out.
+
+        The future of the command returned by command_async fails with exc.
+        Returns False if the response was received meanwhile.
+        """
+        if self._response_futures.pop(future.key, None) is None:
+            return False
+        # Universal server protocol has no command cancellation, the late
+        # response, if any, is dropped by the receiver
+        self.stats.increment("timed_out_commands")
+        future.set_exception(exc)
+        return True
+
+    def command_async(self, name, payload):
+        # type: (Text, dict) -> Future
+        """Sends the command and returns the future of its response.
+
+        Unlike the fire-and-forget command, the response is delivered to the
+        future whenever it arrives, there is no deadline.
+        """
         future = Future()
+        future.key = key = str(uuid1())
         self._response_futures[key] = future
-        self._websocket.send(dumps({"name": name, "key": key, "payload": payload}))
-        if wait_result:
-            return future.result(wait_timeout)
-        else:
-            return None
+        trace = self._trace(name)
+        try:
+            request_bytes = self._send_command(name, key, payload)
+        except Exception as exc:
+            self._response_futures.pop(key, None)
+            if trace:
+                trace.failed(exc)
+            raise
+        if trace:
+            trace.sent(request_bytes)
+            future.add_done_callback(lambda f: _complete_trace(trace, f))
+        return future
+
+    @staticmethod
+    def _trace(name):
+        # type: (Text) -> Optional[CommandTrace]
+        sink = get_metrics_sink()
+        return sink and CommandTrace(sink, name)
+
+    def _send_unawaited_command(self, name, payload):
+        # type: (Text, dict) -> None
+        request_bytes = self._send_command(
+            name, NO_WAIT_KEY_PREFIX + str(uuid1()), payload
+        )
+        sink = get_metrics_sink()
+        if sink:
+            sink.command_sent(name, request_bytes, False)
+
+    def _send_command(self, name, key, payload):
+        # type: (Text, Text, dict) -> int
+        """Sends the command and returns its size, exact for ascii-only text."""
+        message = self._codec.dumps({"name": name, "key": key, "payload": payload})
+        self._websocket.send(message)
+        return len(message)
 
     def close(self):
         if self._websocket:
@@ -66,20 +175,31 @@ class USDKConnection(object):
         self.close()
 
     @staticmethod
-    def _receiver_loop(weak_socket, response_futures):
+    def _receiver_loop(weak_socket, response_futures, stats, codec):
         while True:
             try:
                 socket = weak_socket()
                 if not socket:
                     raise EOFError
-                response = socket.recv()
+                # Codecs accept bytes so the frame is not decoded to text first
+                opcode, response = socket.recv_data()
                 del socket
+                if opcode not in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
+                    raise EOFError
                 if not response:
                     raise EOFError
-                response = loads(response)
+                response_size = len(response)
+                response = codec.loads(response)
                 if "key" in response:
-                    future = response_futures.pop(response["key"])
-                    future.set_result(response)
+                    future = response_futures.pop(response["key"], None)
+                    if future:
+                        future.response_size = response_size
+                        future.set_result(response)
+                    elif response["key"].startswith(NO_WAIT_KEY_PREFIX):
+                        stats.increment("unawaited_responses")
+                    else:
+                        _logger.debug("Dropping late response %s", response["key"])
+                        stats.increment("orphaned_responses")
                 elif response.get("name") == "Server.log":
                     entry = response["payload"]
                     level = logging.getLevelName(entry["level"].upper())
@@ -90,14 +210,39 @@ class USDKConnection(object):
                 socket = weak_socket()
                 if socket:
                     socket.abort()
-                for future in response_futures.values():
+                futures = list(response_futures.values())
+                response_futures.clear()
+                for future in futures:
                     future.set_exception(exc)
                 break
 
 
+def _complete_trace(trace, future):
+    # type: (CommandTrace, Future) -> None
+    error = future.exception()
+    if error:
+        trace.failed(error)
+    else:
+        trace.completed(getattr(future, "response_size", None))
+
+
+def _unix_socket_websocket(path):
+    # type: (Text) -> WebSocket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        websocket = WebSocket()
+        # host in the url is used only for the handshake headers
+        websocket.connect("ws://localhost/eyes", socket=sock)
+    except Exception:
+        sock.close()
+        raise
+    return websocket
+
+
 @atexit.register
 def ensure_all_closed():
     for weak_ref in _all_sockets:
-        socket = weak_ref()
-        if socket:
-            socket.close()
+        websocket = weak_ref()
+        if websocket:
+            websocket.close()
@@ -0,0 +1,135 @@
+from __future__ import absolute_import
+
+import logging
+from enum import Enum
+from threading import Lock, local
+from typing import TYPE_CHECKING
+
+from applitools.common.utils.general_utils import get_env_with_prefix
+
+if TYPE_CHECKING:
+    from typing import Callable, List, Optional
+
+    from .command_executor import CommandExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class PoolRouting(Enum):
+    """
+    How a connection is chosen for a new runner (or thread).
+    """
+
+    ROUND_ROBIN = "round-robin"
+    LEAST_IN_FLIGHT = "least-in-flight"
+
+
+class PoolAffinity(Enum):
+    """
+    Which commands share a connection of the pool.
+
+    Universal server objects (managers, eyes) are bound to the connection
+    they were created on, so all the commands of a runner always go through
+    the same connection.
+    """
+
+    # Every runner takes its own connection according to the routing
+    RUNNER = "runner"
+    # All the runners created in a thread share a connection
+    THREAD = "thread"
+
+
+class CommandExecutorPool(object):
+    """Set of command executors, each having its own USDK connection.
+
+    Executors are created lazily so the pool of size 1 behaves exactly like
+    a single shared executor.
+    """
+
+    def __init__(
+        self,
+        factory,  # type: Callable[[], CommandExecutor]
+        size=1,  # type: int
+        routing=PoolRouting.ROUND_ROBIN,  # type: PoolRouting
+        affinity=PoolAffinity.RUNNER,  # type: PoolAffinity
+    ):
+        # type: (...) -> None
+        if size < 1:
+            raise ValueError("Connection pool size should be positive")
+        self._factory = factory
+        self._executors = [None] * size  # type: List[Optional[CommandExecutor]]
+        self._routing = routing
+        self._affinity = affinity
+        self._next_index = 0
+        self._lock = Lock()
+        # Connecting holds only the lock of its slot so the routing and the
+        # already connected slots are not waiting for it
+        self._slot_locks = [Lock() for _ in range(size)]
+        self._thread_local = local()
+
+    @classmethod
+    def from_env(cls, factory):
+        # type: (Callable[[], CommandExecutor]) -> CommandExecutorPool
+        size = int(get_env_with_prefix("APPLITOOLS_CONNECTION_POOL_SIZE", "1"))
+        routing = get_env_with_prefix(
+            "APPLITOOLS_CONNECTION_POOL_ROUTING", PoolRouting.ROUND_ROBIN.value
+        )
+        affinity = get_env_with_prefix(
+            "APPLITOOLS_CONNECTION_POOL_AFFINITY", PoolAffinity.RUNNER.value
+        )
+        return cls(factory, size, PoolRouting(routing), PoolAffinity(affinity))
+
+    @property
+    def size(self):
+        # type: () -> int
+        return len(self._executors)
+
+    def acquire(self):
+        # type: () -> CommandExecutor
+        if self._affinity is PoolAffinity.THREAD:
+            executor = getattr(self._thread_local, "executor", None)
+            if executor is None:
+                executor = self._thread_local.executor = self._route()
+            return executor
+        else:
+            return self._route()
+
+    def prewarm(self):
+        # type: () -> None
+        """Creates the executors one by one, acquire of the slot being
+        created waits for it meanwhile."""
+        for index in range(self.size):
+            try:
+                self._executor(index)
+            except Exception:
+                logger.debug("Connection prewarm failed", exc_info=True)
+                return
+
+    def _route(self):
+        # type: () -> CommandExecutor
+        with self._lock:
+            if self.size == 1:
+                index = 0
+            elif self._routing is PoolRouting.LEAST_IN_FLIGHT:
+                index = min(range(self.size), key=self._in_flight)
+            else:
+                index = self._next_index
+                self._next_index = (index + 1) % self.size
+        return self._executor(index)
+
+    def _executor(self, index):
+        # type: (int) -> CommandExecutor
+        executor = self._executors[index]
+        if executor is None:
+            with self._slot_locks[index]:
+                executor = self._executors[index]
+                if executor is None:
+                    logger.debug("Creating pooled connection %s", index)
+                    executor = self._executors[index] = self._factory()
+        return executor
+
+    def _in_flight(self, index):
+        # type: (int) -> int
+        executor = self._executors[index]
+        # not yet created connection is the least loaded
+        return -1 if executor is None else executor.in_flight
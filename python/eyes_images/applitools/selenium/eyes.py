@@ -2,7 +2,8 @@ from __future__ import absolute_import, unicode_literals
 
 import json
 import typing
-from typing import List, Optional, Text, Tuple, Union
+from typing import Iterable, List, Optional, Text, Tuple, Union
+from uuid import uuid4
 
 from six import string_types
 
@@ -22,13 +23,18 @@ from .__version__ import __version__
 from .command_executor import CommandExecutor
 from .fluent.selenium_check_settings import SeleniumCheckSettings
 from .fluent.target import Target
-from .runner import ClassicRunner, EyesRunner, log_session_results_and_raise_exception
+from .runner import (
+    ClassicRunner,
+    EyesRunner,
+    TestResultsHandle,
+    log_session_results_and_raise_exception,
+)
 from .schema import (
+    ConfigurationMarshaler,
     demarshal_locate_result,
     demarshal_match_result,
     demarshal_test_results,
     marshal_check_settings,
-    marshal_configuration,
     marshal_locate_settings,
     marshal_ocr_extract_settings,
     marshal_ocr_search_settings,
@@ -37,6 +43,8 @@ from .schema import (
 )
 
 if typing.TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from applitools.common import MatchResult, Region, TestResults
     from applitools.common.utils.custom_types import FrameReference, ViewPort
     from applitools.core import (
@@ -53,8 +61,10 @@ class Eyes(object):
     def __init__(self, runner=None):
         # type: (Union[None, EyesRunner, Text]) -> None
         self.configure = Configuration()
+        self._configuration_marshaler = ConfigurationMarshaler()
         self._driver = None
         self._eyes_ref = None
+        self._user_test_id = None  # type: Optional[Text]
         if runner is None:
             self._runner = ClassicRunner()
         elif isinstance(runner, string_types):
@@ -72,17 +82,7 @@ class Eyes(object):
         viewport_size=None,  # type: Optional[ViewPort]
     ):
         # type: (...) -> WebDriver
-        if app_name is not None:
-            self.configure.app_name = app_name
-        if test_name is not None:
-            self.configure.test_name = test_name
-        if viewport_size is not None:
-            self.configure.viewport_size = viewport_size
-        if self.configure.app_name is None:
-            raise ValueError("app_name should be set via configuration or an argument")
-        if self.configure.test_name is None:
-            raise ValueError("test_name should be set via configuration or an argument")
-
+        self._update_open_configuration(app_name, test_name, viewport_size)
         if self.configure.is_disabled:
             pass
         else:
@@ -91,7 +91,7 @@ class Eyes(object):
             self._eyes_ref = self._commands.manager_open_eyes(
                 self._runner._ref,  # noqa
                 marshal_webdriver_ref(driver),
-                config=self._marshaled_configuration(),
+                config=self._open_configuration(),
             )
         return driver
 
@@ -118,15 +118,7 @@ class Eyes(object):
 
     def check(self, check_settings, name=None):
         # type: (SeleniumCheckSettings, Optional[Text]) -> Optional[MatchResult]
-        if isinstance(name, SeleniumCheckSettings) or isinstance(
-            check_settings, string_types
-        ):
-            check_settings, name = name, check_settings
-        if check_settings is None:
-            check_settings = Target.window()
-        if name:
-            check_settings = check_settings.with_name(name)
-
+        check_settings = self._check_settings_from(check_settings, name)
         if self.configure.is_disabled:
             return None
         if not self.is_open:
@@ -135,25 +127,39 @@ class Eyes(object):
 
         results = self._commands.eyes_check(
             self._eyes_ref,
-            settings=marshal_check_settings(check_settings),
+            settings=marshal_check_settings(
+                check_settings, self.configure.coalesce_regions
+            ),
             config=self._marshaled_configuration(),
         )
-        if results:
-            # Original API only returns one result
-            results = demarshal_match_result(results[0])
-            if (
-                not results.as_expected
-                and self.configure.failure_reports is FailureReports.IMMEDIATE
-            ):
-                raise TestFailedError(
-                    "Mismatch found in '{}' of '{}'".format(
-                        self.configure.test_name, self.configure.app_name
-                    )
+        return self._match_result_from(results)
+
+    def check_many(self, check_settings):
+        # type: (Iterable[SeleniumCheckSettings]) -> List[Optional[MatchResult]]
+        """Checks several targets with the same marshaled configuration.
+
+        The checks are performed one by one as each of them uses the driver,
+        the results are returned in order.
+        """
+        check_settings = [self._check_settings_from(s, None) for s in check_settings]
+        if self.configure.is_disabled:
+            return [None for _ in check_settings]
+        if not self.is_open:
+            self.abort()
+            raise EyesError("you must call open() before checking")
+        config = self._marshaled_configuration()
+        return [
+            self._match_result_from(
+                self._commands.eyes_check(
+                    self._eyes_ref,
+                    settings=marshal_check_settings(
+                        settings, self.configure.coalesce_regions
+                    ),
+                    config=config,
                 )
-            else:
-                return results
-        else:
-            return None
+            )
+            for settings in check_settings
+        ]
 
     def locate(self, visual_locator_settings):
         # type: (VisualLocatorSettings) -> LOCATORS_TYPE
@@ -200,7 +206,12 @@ class Eyes(object):
         return self._close(raise_ex, True)
 
     def close_async(self):
-        # type: () -> Optional[TestResults]
+        # type: () -> Optional[TestResultsHandle]
+        """
+        Ends the test without waiting for its results.
+
+        :return: The handle of the test results, see `EyesRunner.gather`.
+        """
         return self._close(False, False)
 
     def abort(self):
@@ -211,6 +222,7 @@ class Eyes(object):
         return self._abort(True)
 
     def abort_async(self):
+        # type: () -> Optional[TestResultsHandle]
         return self._abort(False)
 
     @deprecated.attribute("use `abort()` instead")
@@ -509,45 +521,127 @@ class Eyes(object):
         return None
 
     def _marshaled_configuration(self):
-        return marshal_configuration(self.configure)
+        # type: () -> dict
+        return self._configuration_marshaler(self.configure)
+
+    def _open_configuration(self):
+        # type: () -> dict
+        """Marshaled configuration with user test id, which is generated unless
+        configured. It matches the closeManager result with the results handle."""
+        config = self._marshaled_configuration()
+        self._user_test_id = self.configure.user_test_id
+        if self._user_test_id is None:
+            self._user_test_id = "{}--{}".format(self.configure.test_name, uuid4())
+            config = dict(config, open=dict(config["open"]))
+            config["open"]["userTestId"] = self._user_test_id
+        return config
+
+    def _update_open_configuration(self, app_name, test_name, viewport_size):
+        # type: (Optional[Text], Optional[Text], Optional[ViewPort]) -> None
+        if app_name is not None:
+            self.configure.app_name = app_name
+        if test_name is not None:
+            self.configure.test_name = test_name
+        if viewport_size is not None:
+            self.configure.viewport_size = viewport_size
+        if self.configure.app_name is None:
+            raise ValueError("app_name should be set via configuration or an argument")
+        if self.configure.test_name is None:
+            raise ValueError("test_name should be set via configuration or an argument")
+
+    @staticmethod
+    def _check_settings_from(check_settings, name):
+        # type: (SeleniumCheckSettings, Optional[Text]) -> SeleniumCheckSettings
+        if isinstance(name, SeleniumCheckSettings) or isinstance(
+            check_settings, string_types
+        ):
+            check_settings, name = name, check_settings
+        if check_settings is None:
+            check_settings = Target.window()
+        if name:
+            check_settings = check_settings.with_name(name)
+        return check_settings
+
+    def _match_result_from(self, results):
+        # type: (Optional[List[dict]]) -> Optional[MatchResult]
+        if results:
+            # Original API only returns one result
+            results = demarshal_match_result(results[0])
+            if (
+                not results.as_expected
+                and self.configure.failure_reports is FailureReports.IMMEDIATE
+            ):
+                raise TestFailedError(
+                    "Mismatch found in '{}' of '{}'".format(
+                        self.configure.test_name, self.configure.app_name
+                    )
+                )
+            else:
+                return results
+        else:
+            return None
 
     def _close(self, raise_ex, wait_result):
-        # type: (bool, bool) -> Optional[TestResults]
+        # type: (bool, bool) -> Optional[Union[TestResults, TestResultsHandle]]
         if self.configure.is_disabled:
             return None
         if not self.is_open:
             raise EyesError("Eyes not open")
-        results = self._commands.eyes_close_eyes(
-            self._eyes_ref,
-            {"throwErr": raise_ex},
-            self._marshaled_configuration(),
-            wait_result,
-        )
+        settings = {"throwErr": raise_ex}
+        config = self._marshaled_configuration()
+        if wait_result:
+            results = self._commands.eyes_close_eyes(
+                self._eyes_ref, settings, config, True
+            )
+        else:
+            # Awaited in background to stream results, see iter_test_results
+            future = self._commands.eyes_close_eyes_async(
+                self._eyes_ref, settings, config
+            )
         self._eyes_ref = None
         self._driver = None
         if wait_result:
-            results = demarshal_test_results(results, self.configure)
-            if results:  # eyes are already aborted by closed runner
-                for r in results:
-                    log_session_results_and_raise_exception(raise_ex, r)
-                return results[0]  # Original interface returns just one result
+            return self._close_results_from(results, raise_ex)
+        return self._results_handle(future)
+
+    def _close_results_from(self, results, raise_ex):
+        # type: (List[dict], bool) -> Optional[TestResults]
+        results = demarshal_test_results(results, self.configure)
+        if results:  # eyes are already aborted by closed runner
+            for r in results:
+                log_session_results_and_raise_exception(raise_ex, r)
+            return results[0]  # Original interface returns just one result
         return None
 
     def _abort(self, wait_result):
-        # type: (bool) -> Optional[TestResults]
+        # type: (bool) -> Optional[Union[TestResults, TestResultsHandle]]
         if self.configure.is_disabled:
             return None
         elif self.is_open:
-            results = self._commands.eyes_abort_eyes(self._eyes_ref, wait_result)
+            if wait_result:
+                results = self._commands.eyes_abort_eyes(self._eyes_ref, True)
+            else:
+                future = self._commands.eyes_abort_eyes_async(self._eyes_ref)
             self._eyes_ref = None
             self._driver = None
             if wait_result:
-                if results:  # abort after close does not return results
-                    results = demarshal_test_results(results, self.configure)
-                    for r in results:
-                        log_session_results_and_raise_exception(False, r)
-                    return results[0]  # Original interface returns just one result
-            return None
+                return self._abort_results_from(results)
+            return self._results_handle(future)
+
+    def _results_handle(self, future):
+        # type: (Future) -> TestResultsHandle
+        handle = TestResultsHandle(future, self.configure, self._user_test_id)
+        self._runner._add_pending_results(handle)  # noqa
+        return handle
+
+    def _abort_results_from(self, results):
+        # type: (Optional[List[dict]]) -> Optional[TestResults]
+        if results:  # abort after close does not return results
+            results = demarshal_test_results(results, self.configure)
+            for r in results:
+                log_session_results_and_raise_exception(False, r)
+            return results[0]  # Original interface returns just one result
+        return None
 
     def __getattr__(self, item):
         return getattr(self.configure, item)
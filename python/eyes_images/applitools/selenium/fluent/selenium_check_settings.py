@@ -6,7 +6,7 @@ import attr
 from six import string_types
 
 from applitools.common.accessibility import AccessibilityRegionType
-from applitools.common.geometry import AccessibilityRegion, Region
+from applitools.common.geometry import AccessibilityRegion, Region, RegionSet
 from applitools.common.ultrafastgrid import VisualGridOption
 from applitools.common.utils import argument_guard
 from applitools.common.validators import is_list_or_tuple, is_webelement
@@ -129,7 +129,7 @@ class SeleniumCheckSettings(CheckSettings):
     @overload  # noqa
     def layout(
         self,
-        *region,  # type: Region
+        *region,  # type: Union[Region, RegionSet]
         **kwargs  # type: Union[Text, CodedRegionPadding]
     ):
         # type: (...) -> SeleniumCheckSettings
@@ -185,7 +185,7 @@ class SeleniumCheckSettings(CheckSettings):
     @overload  # noqa
     def strict(
         self,
-        *region,  # type: Region
+        *region,  # type: Union[Region, RegionSet]
         **kwargs  # type: Union[Text, CodedRegionPadding]
     ):
         # type: (...) -> SeleniumCheckSettings
@@ -241,7 +241,7 @@ class SeleniumCheckSettings(CheckSettings):
     @overload  # noqa
     def content(
         self,
-        *region,  # type: Region
+        *region,  # type: Union[Region, RegionSet]
         **kwargs  # type: Union[CodedRegionPadding, Text]
     ):
         # type: (...) -> SeleniumCheckSettings
@@ -297,7 +297,7 @@ class SeleniumCheckSettings(CheckSettings):
     @overload  # noqa
     def ignore(
         self,
-        *region,  # type: Region
+        *region,  # type: Union[Region, RegionSet]
         **kwargs  # type: Union[CodedRegionPadding, Text]
     ):
         # type: (...) -> SeleniumCheckSettings
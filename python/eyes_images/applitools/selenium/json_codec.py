@@ -0,0 +1,104 @@
+from __future__ import absolute_import
+
+import json
+import logging
+import sys
+from typing import TYPE_CHECKING
+
+from applitools.common.utils.general_utils import get_env_with_prefix
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Optional, Text, Tuple, Type, Union
+
+logger = logging.getLogger(__name__)
+
+# json.loads accepts bytes since python 3.6
+_LOADS_NEEDS_TEXT = (3,) <= sys.version_info < (3, 6)
+
+
+class JsonCodec(object):
+    """Standard library json codec, always available."""
+
+    name = "json"
+
+    @staticmethod
+    def dumps(obj):
+        # type: (Any) -> Union[Text, bytes]
+        return json.dumps(obj)
+
+    @staticmethod
+    def loads(data):
+        # type: (Union[Text, bytes]) -> Any
+        if _LOADS_NEEDS_TEXT and isinstance(data, bytes):
+            data = data.decode("utf-8")
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson codec, produces utf-8 bytes so they're sent without re-encoding."""
+
+    name = "orjson"
+
+    @staticmethod
+    def dumps(obj):
+        # type: (Any) -> Union[Text, bytes]
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def loads(data):
+        # type: (Union[Text, bytes]) -> Any
+        return orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    @staticmethod
+    def dumps(obj):
+        # type: (Any) -> Union[Text, bytes]
+        return ujson.dumps(obj, ensure_ascii=False)
+
+    @staticmethod
+    def loads(data):
+        # type: (Union[Text, bytes]) -> Any
+        return ujson.loads(data)
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Codecs in order of preference
+_CODECS = (
+    (OrjsonCodec, orjson),
+    (UjsonCodec, ujson),
+    (JsonCodec, json),
+)  # type: Tuple[Tuple[Type[JsonCodec], Any], ...]
+
+
+def available_codecs():
+    # type: () -> Dict[Text, Type[JsonCodec]]
+    return {codec.name: codec for codec, module in _CODECS if module is not None}
+
+
+def get_codec(name=None):
+    # type: (Optional[Text]) -> Type[JsonCodec]
+    """Returns codec by its name, or the fastest available one.
+
+    Codec name can also be set with APPLITOOLS_JSON_CODEC environment variable.
+    """
+    name = name or get_env_with_prefix("APPLITOOLS_JSON_CODEC")
+    codecs = available_codecs()
+    if name is None:
+        return next(c for c, module in _CODECS if module is not None)
+    elif name in codecs:
+        return codecs[name]
+    else:
+        logger.warning("JSON codec %s is not available, falling back to json", name)
+        return JsonCodec
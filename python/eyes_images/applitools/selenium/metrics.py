@@ -0,0 +1,271 @@
+"""
+Measurements of the commands sent to the universal server.
+
+Metrics are not collected until a sink is installed::
+
+    from applitools.selenium.metrics import InMemoryMetrics, set_metrics_sink
+
+    metrics = set_metrics_sink(InMemoryMetrics())
+    ...
+    print(metrics.snapshot()["Eyes.check"].latency_quantile(0.95))
+    print(metrics.prometheus_text())
+"""
+from __future__ import absolute_import
+
+import bisect
+from copy import deepcopy
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING
+
+import attr
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Optional, Text, Tuple
+
+# Upper bounds of latency histogram buckets in seconds, the last one is +Inf
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    float("inf"),
+)  # type: Tuple[float, ...]
+
+_sink = None  # type: Optional[MetricsSink]
+
+
+class MetricsSink(object):
+    """Receives measurements of universal server commands.
+
+    Methods are called from the threads sending the commands and should be
+    cheap and thread safe.
+    """
+
+    def command_sent(self, name, request_bytes, wait_result):
+        # type: (Text, int, bool) -> None
+        """Command was sent, awaited command is in flight until completed."""
+
+    def command_completed(self, name, seconds, response_bytes, error):
+        # type: (Text, float, Optional[int], Optional[Text]) -> None
+        """Awaited command got a response, or failed to get it with an error."""
+
+    def command_error(self, name, error):
+        # type: (Text, Text) -> None
+        """Universal server responded with an error."""
+
+
+def set_metrics_sink(sink):
+    # type: (Optional[MetricsSink]) -> Optional[MetricsSink]
+    """Installs process-wide metrics sink, None disables metrics collection."""
+    global _sink
+    _sink = sink
+    return sink
+
+
+def get_metrics_sink():
+    # type: () -> Optional[MetricsSink]
+    return _sink
+
+
+class CommandTrace(object):
+    """Reports a single awaited command to the sink installed at its start."""
+
+    __slots__ = ("_sink", "_name", "_started_at", "_sent")
+
+    def __init__(self, sink, name):
+        # type: (MetricsSink, Text) -> None
+        self._sink = sink
+        self._name = name
+        self._started_at = time()
+        self._sent = False
+
+    def sent(self, request_bytes):
+        # type: (int) -> None
+        self._sent = True
+        self._sink.command_sent(self._name, request_bytes, True)
+
+    def completed(self, response_bytes):
+        # type: (Optional[int]) -> None
+        self._sink.command_completed(
+            self._name, time() - self._started_at, response_bytes, None
+        )
+
+    def failed(self, error):
+        # type: (BaseException) -> None
+        if self._sent:
+            error_name = type(error).__name__
+            elapsed = time() - self._started_at
+            self._sink.command_completed(self._name, elapsed, None, error_name)
+
+
+@attr.s
+class CommandMetrics(object):
+    """Aggregated measurements of a single command."""
+
+    buckets = attr.ib()  # type: Tuple[float, ...]
+    # Number of observations in each of the latency buckets, not cumulative
+    latency_counts = attr.ib()  # type: List[int]
+    latency_sum = attr.ib(default=0.0)  # type: float
+    sent = attr.ib(default=0)  # type: int
+    completed = attr.ib(default=0)  # type: int
+    in_flight = attr.ib(default=0)  # type: int
+    errors = attr.ib(default=0)  # type: int
+    request_bytes = attr.ib(default=0)  # type: int
+    response_bytes = attr.ib(default=0)  # type: int
+
+    def latency_quantile(self, quantile):
+        # type: (float) -> Optional[float]
+        """Upper bound of the bucket the quantile falls into."""
+        total = sum(self.latency_counts)
+        if not total:
+            return None
+        rank = quantile * total
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.latency_counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class InMemoryMetrics(MetricsSink):
+    """Keeps metrics in memory, can be exported in Prometheus text format."""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        # type: (Tuple[float, ...]) -> None
+        if buckets[-1] != float("inf"):
+            buckets = tuple(buckets) + (float("inf"),)
+        self._buckets = tuple(buckets)
+        self._commands = {}  # type: Dict[Text, CommandMetrics]
+        self._lock = Lock()
+
+    def command_sent(self, name, request_bytes, wait_result):
+        # type: (Text, int, bool) -> None
+        with self._lock:
+            metrics = self._get(name)
+            metrics.sent += 1
+            metrics.request_bytes += request_bytes
+            if wait_result:
+                metrics.in_flight += 1
+
+    def command_completed(self, name, seconds, response_bytes, error):
+        # type: (Text, float, Optional[int], Optional[Text]) -> None
+        with self._lock:
+            metrics = self._get(name)
+            metrics.completed += 1
+            metrics.in_flight -= 1
+            metrics.latency_sum += seconds
+            metrics.latency_counts[bisect.bisect_left(self._buckets, seconds)] += 1
+            if response_bytes:
+                metrics.response_bytes += response_bytes
+            if error:
+                metrics.errors += 1
+
+    def command_error(self, name, error):
+        # type: (Text, Text) -> None
+        with self._lock:
+            self._get(name).errors += 1
+
+    def snapshot(self):
+        # type: () -> Dict[Text, CommandMetrics]
+        """Returns a copy of the current metrics by command name."""
+        with self._lock:
+            return deepcopy(self._commands)
+
+    def reset(self):
+        # type: () -> None
+        with self._lock:
+            self._commands.clear()
+
+    def prometheus_text(self, prefix="applitools_usdk"):
+        # type: (Text) -> Text
+        """Dumps metrics in Prometheus text exposition format."""
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+
+        def family(name, kind, help_text, values):
+            lines.append("# HELP {}_{} {}".format(prefix, name, help_text))
+            lines.append("# TYPE {}_{} {}".format(prefix, name, kind))
+            for command, metrics in snapshot:
+                for suffix, labels, value in values(metrics):
+                    labels = 'command="{}"{}'.format(command, labels)
+                    lines.append(
+                        "{}_{}{}{{{}}} {}".format(
+                            prefix, name, suffix, labels, _format_value(value)
+                        )
+                    )
+
+        family(
+            "command_duration_seconds",
+            "histogram",
+            "Time between sending a command and receiving its response.",
+            _histogram_values,
+        )
+        family(
+            "commands_sent_total",
+            "counter",
+            "Commands sent to the universal server.",
+            lambda m: [("", "", m.sent)],
+        )
+        family(
+            "commands_in_flight",
+            "gauge",
+            "Commands waiting for the response.",
+            lambda m: [("", "", m.in_flight)],
+        )
+        family(
+            "command_errors_total",
+            "counter",
+            "Failed commands.",
+            lambda m: [("", "", m.errors)],
+        )
+        family(
+            "command_request_bytes_total",
+            "counter",
+            "Size of sent commands.",
+            lambda m: [("", "", m.request_bytes)],
+        )
+        family(
+            "command_response_bytes_total",
+            "counter",
+            "Size of received responses.",
+            lambda m: [("", "", m.response_bytes)],
+        )
+        return "\n".join(lines) + "\n"
+
+    def _get(self, name):
+        # type: (Text) -> CommandMetrics
+        metrics = self._commands.get(name)
+        if metrics is None:
+            metrics = CommandMetrics(self._buckets, [0] * len(self._buckets))
+            self._commands[name] = metrics
+        return metrics
+
+
+def _histogram_values(metrics):
+    # type: (CommandMetrics) -> List[Tuple[Text, Text, float]]
+    values = []
+    cumulative = 0
+    for bound, count in zip(metrics.buckets, metrics.latency_counts):
+        cumulative += count
+        values.append(("_bucket", ',le="{}"'.format(_format_value(bound)), cumulative))
+    values.append(("_sum", "", metrics.latency_sum))
+    values.append(("_count", "", cumulative))
+    return values
+
+
+def _format_value(value):
+    # type: (float) -> Text
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value)
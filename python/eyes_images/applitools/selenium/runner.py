@@ -1,23 +1,45 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 import typing
-from concurrent.futures import TimeoutError
+from concurrent.futures import TimeoutError, as_completed
+from threading import Lock
+from time import time
 
 from applitools.common import (
     DiffsFoundError,
     EyesError,
     NewTestError,
     TestFailedError,
+    TestResultContainer,
+    TestResults,
     TestResultsSummary,
 )
 from applitools.common.config import DEFAULT_ALL_TEST_RESULTS_TIMEOUT
+from applitools.eyes_universal import is_prewarm_requested
 
 from .__version__ import __version__
 from .command_executor import CommandExecutor, ManagerType
-from .schema import demarshal_close_manager_results, demarshal_server_info
+from .schema import (
+    demarshal_close_manager_results,
+    demarshal_server_info,
+    demarshal_test_results,
+)
 
 if typing.TYPE_CHECKING:
-    from typing import Optional, Union
+    from concurrent.futures import Future
+    from threading import Thread
+    from typing import (
+        Any,
+        Callable,
+        Dict,
+        Iterable,
+        Iterator,
+        List,
+        Optional,
+        Set,
+        Text,
+        Union,
+    )
 
     from applitools.common import Configuration
 
@@ -29,6 +51,9 @@ class EyesRunner(object):
     def __init__(self, manager_type, concurrency=None, is_legacy=None):
         # type: (ManagerType, Optional[int], Optional[bool]) -> None
         self._connection_configuration = None
+        # Results of asynchronously closed eyes, not reported yet
+        self._pending_results = {}  # type: Dict[Future, TestResultsHandle]
+        self._pending_results_lock = Lock()
         self._commands = CommandExecutor.get_instance(self.BASE_AGENT_ID, __version__)
         if is_legacy:
             self._ref = self._commands.core_make_manager(
@@ -39,6 +64,12 @@ class EyesRunner(object):
                 manager_type, concurrency=concurrency
             )
 
+    @classmethod
+    def prewarm(cls):
+        # type: () -> Thread
+        """Starts the universal server and connects to it in background."""
+        return CommandExecutor.prewarm(cls.BASE_AGENT_ID, __version__)
+
     @classmethod
     def get_server_info(cls):
         cmd = CommandExecutor.get_instance(cls.BASE_AGENT_ID, __version__)
@@ -46,9 +77,30 @@ class EyesRunner(object):
         return demarshal_server_info(result)
 
     def get_all_test_results(
-        self, should_raise_exception=True, timeout=DEFAULT_ALL_TEST_RESULTS_TIMEOUT
+        self,
+        should_raise_exception=True,
+        timeout=DEFAULT_ALL_TEST_RESULTS_TIMEOUT,
+        lazy=False,
+        on_result=None,
     ):
-        # type: (bool, Optional[int]) -> TestResultsSummary
+        # type: (bool, Optional[int], bool, Optional[Callable[[TestResultContainer], Any]]) -> TestResultsSummary
+        """With lazy, attributes of returned TestResults are de-serialized on
+        first access, which is cheaper when only few of them are read.
+
+        With on_result, it is called with every test result, same as the results
+        yielded by iter_test_results: as soon as the test finishes for eyes closed
+        with close_async, once all the tests are finished for eyes closed with
+        close.
+        """
+        if on_result is not None:
+            summaries = []
+            for container in self._stream_test_results(
+                should_raise_exception, timeout, lazy, summaries
+            ):
+                on_result(container)
+            return summaries[0]
+        with self._pending_results_lock:
+            self._pending_results.clear()
         try:
             # Do not pass should_raise_exception because USDK raises untyped exceptions
             results = self._commands.manager_close_manager(
@@ -56,24 +108,165 @@ class EyesRunner(object):
             )
         except TimeoutError:
             raise EyesError("Tests didn't finish in {} seconds".format(timeout))
+        return self._summary_from(results, lazy)
+
+    def iter_test_results(
+        self,
+        should_raise_exception=True,
+        timeout=DEFAULT_ALL_TEST_RESULTS_TIMEOUT,
+        lazy=False,
+    ):
+        # type: (bool, Optional[int], bool) -> Iterator[TestResultContainer]
+        """Closes the runner yielding the test results as the tests finish.
+
+        Results of the eyes closed with close_async are yielded once the server
+        responds to their close. Results of the eyes closed with close are not
+        streamed, they are yielded once all the tests are finished.
+        With should_raise_exception, the first failed test raises its error
+        instead of being yielded.
+        """
+        return self._stream_test_results(should_raise_exception, timeout, lazy, [])
+
+    def _stream_test_results(self, should_raise_exception, timeout, lazy, summaries):
+        # type: (bool, Optional[int], bool, List[TestResultsSummary]) -> Iterator[TestResultContainer]
+        deadline = None if timeout is None else time() + timeout
+        streamed_ids = set()  # type: Set[Text]
+        failure = None  # type: Optional[Exception]
+        with self._pending_results_lock:
+            pending = dict(self._pending_results)
+        try:
+            for future in as_completed(pending, _remaining(deadline)):
+                with self._pending_results_lock:
+                    self._pending_results.pop(future, None)
+                for container in _streamed_containers(
+                    pending[future], lazy, streamed_ids
+                ):
+                    failure = _logged_failure(container, should_raise_exception)
+                    if failure is not None:
+                        break
+                    yield container
+                if failure is not None:
+                    self._pop_pending_results(pending.values())
+                    break
+            # Failures are raised one by one below, as typed exceptions.
+            # The runner is closed after a failed streamed test too.
+            results = self._commands.manager_close_manager(
+                self._ref, False, _remaining(deadline)
+            )
+        except TimeoutError:
+            raise EyesError("Tests didn't finish in {} seconds".format(timeout))
+        if failure is not None:
+            raise failure
+        summary = demarshal_close_manager_results(
+            results, self._connection_configuration, lazy
+        )
+        summaries.append(summary)
+        for container in summary:
+            if not _is_streamed(container, streamed_ids):
+                _log_container(container, should_raise_exception)
+                yield container
+
+    def _summary_from(self, results, lazy=False):
+        # type: (dict, bool) -> TestResultsSummary
         # We don't have server_url, api_key and proxy settings in runner
         # USDK should return them back as a part of TestResults
         structured_results = demarshal_close_manager_results(
-            results, self._connection_configuration
+            results, self._connection_configuration, lazy
         )
         for r in structured_results:
-            if r.exception is not None:
-                print("--- Test error. \n\tServer exception {}".format(r.exception))
-            else:
-                log_session_results_and_raise_exception(False, r.test_results)
+            _log_container(r, False)
         return structured_results
 
+    def gather(
+        self,
+        handles,
+        timeout=DEFAULT_ALL_TEST_RESULTS_TIMEOUT,
+        return_exceptions=False,
+    ):
+        # type: (Iterable[Optional[TestResultsHandle]], Optional[int], bool) -> List[Optional[Union[TestResults, Exception]]]
+        """Waits for the eyes closed with close_async or abort_async.
+
+        Returns the test results in the order of the handles. The error of the
+        first failed close is raised, unless return_exceptions is set, then it
+        is returned in place of the results.
+        """
+        deadline = None if timeout is None else time() + timeout
+        results = []
+        for handle in handles:
+            if handle is None:  # disabled eyes
+                results.append(None)
+                continue
+            try:
+                result = handle.result(_remaining(deadline))
+            except TimeoutError:
+                raise EyesError("Tests didn't finish in {} seconds".format(timeout))
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                results.append(exc)
+            else:
+                results.append(result)
+        return results
+
+    def _add_pending_results(self, handle):
+        # type: (TestResultsHandle) -> None
+        handle._runner = self  # noqa
+        with self._pending_results_lock:
+            self._pending_results[handle.future] = handle
+
+    def _pop_pending_results(self, handles):
+        # type: (Iterable[TestResultsHandle]) -> None
+        # resolved results are not yielded by iter_test_results again
+        with self._pending_results_lock:
+            for handle in handles:
+                self._pending_results.pop(handle.future, None)
+
     def _set_connection_config(self, config):
         # type: (Configuration) -> None
         if self._connection_configuration is None:
             self._connection_configuration = config
 
 
+class TestResultsHandle(object):
+    """Results of the eyes closed or aborted without waiting for them."""
+
+    __test__ = False  # avoid warnings in test frameworks
+
+    def __init__(self, future, config, user_test_id=None):
+        # type: (Future, Configuration, Optional[Text]) -> None
+        self.future = future  # resolves to Eyes.close or Eyes.abort result
+        self.config = config
+        self.user_test_id = user_test_id  # of the test in closeManager results
+        self._results = None  # type: Optional[List[TestResults]]
+        self._runner = None  # type: Optional[EyesRunner]
+
+    def done(self):
+        # type: () -> bool
+        return self.future.done()
+
+    def result(self, timeout=None):
+        # type: (Optional[float]) -> Optional[TestResults]
+        """Waits for the test to finish and returns its results.
+
+        Raises the close error, or TimeoutError if the test didn't finish in
+        time. Aborting closed eyes has no results.
+        """
+        if self._results is None:
+            try:
+                results = self.future.result(timeout)
+            finally:
+                self._release()
+            self._results = demarshal_test_results(results or [], self.config)
+        return self._results[0] if self._results else None
+
+    def _release(self):
+        # type: () -> None
+        """Drops the resolved handle from pending results of its runner."""
+        if self._runner is not None and self.future.done():
+            self._runner._pop_pending_results([self])  # noqa
+            self._runner = None
+
+
 class RunnerOptions(object):
     concurrency = 5
 
@@ -103,6 +296,62 @@ class ClassicRunner(EyesRunner):
         super(ClassicRunner, self).__init__(ManagerType.CLASSIC)
 
 
+def _remaining(deadline):
+    # type: (Optional[float]) -> Optional[float]
+    return None if deadline is None else max(deadline - time(), 0)
+
+
+def _containers_from(handle, lazy):
+    # type: (TestResultsHandle, bool) -> List[TestResultContainer]
+    try:
+        results = handle.future.result()
+    except Exception as exc:
+        return [TestResultContainer(exception=exc)]
+    # eyes already aborted by closed runner do not return results
+    results = demarshal_test_results(results or [], handle.config, lazy)
+    return [TestResultContainer(r) for r in results]
+
+
+def _streamed_containers(handle, lazy, streamed_ids):
+    # type: (TestResultsHandle, bool, Set[Text]) -> List[TestResultContainer]
+    """Containers of the handle, its test is recorded in streamed_ids, so it is
+    not reported again by closeManager, even if its close failed."""
+    if handle.user_test_id:
+        streamed_ids.add(handle.user_test_id)
+    containers = _containers_from(handle, lazy)
+    for container in containers:
+        if container.test_results:
+            streamed_ids.add(container.test_results.id)
+    return containers
+
+
+def _is_streamed(container, streamed_ids):
+    # type: (TestResultContainer, Set[Text]) -> bool
+    if container.user_test_id and container.user_test_id in streamed_ids:
+        return True
+    return bool(container.test_results and container.test_results.id in streamed_ids)
+
+
+def _logged_failure(container, raise_ex):
+    # type: (TestResultContainer, bool) -> Optional[Exception]
+    """Logs the container, returning the error it would raise."""
+    try:
+        _log_container(container, raise_ex)
+    except Exception as exc:
+        return exc
+    return None
+
+
+def _log_container(container, raise_ex):
+    # type: (TestResultContainer, bool) -> None
+    if container.exception is not None:
+        print("--- Test error. \n\tServer exception {}".format(container.exception))
+        if raise_ex:
+            raise container.exception
+    else:
+        log_session_results_and_raise_exception(raise_ex, container.test_results)
+
+
 def log_session_results_and_raise_exception(raise_ex, results):
     results_url = results.url
     scenario_id_or_name = results.name
@@ -129,3 +378,10 @@ def log_session_results_and_raise_exception(raise_ex, results):
             raise TestFailedError(results, scenario_id_or_name, app_id_or_name)
     else:
         print("--- Test passed. \n\tSee details at", results_url)
+
+
+if is_prewarm_requested():
+    # APPLITOOLS_UNIVERSAL_PREWARM=1, the server itself is started in background
+    # by applitools.eyes_universal import
+    ClassicRunner.prewarm()
+    VisualGridRunner.prewarm()
@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 
 import typing as t
+from copy import copy
 
 from marshmallow import Schema, post_dump, post_load
 from marshmallow.fields import (
@@ -16,7 +17,7 @@ from marshmallow.fields import (
 )
 from marshmallow.schema import BaseSchema, SchemaMeta, with_metaclass
 
-from applitools.core import extract_text
+from applitools.core import RegionByRectangle, RegionsByRectangles, extract_text
 
 from .. import common
 from ..common import (
@@ -36,6 +37,8 @@ from ..common import (
 from ..common.accessibility import AccessibilityStatus
 from ..common.selenium import BrowserType
 from ..common.test_results import TestResultsStatus
+from ..common.utils.general_utils import CopiedOnWriteView
+from .schema_compiler import attribute_loader, dumper, loader
 from .schema_fields import demarshal_error  # noqa
 from .schema_fields import (
     BrowserInfo,
@@ -45,7 +48,9 @@ from .schema_fields import (
     EnvironmentField,
     Error,
     FrameReference,
+    LazyTestResultsField,
     NormalizationField,
+    RegionList,
     RegionReference,
     StitchOverlap,
     TargetReference,
@@ -57,7 +62,7 @@ if t.TYPE_CHECKING:
     from applitools.common import config
     from applitools.common.utils.custom_types import ViewPort
     from applitools.core import locators
-    from applitools.images import fluent as ics
+    from applitools.core.fluent.region import GetRegion
     from applitools.selenium.fluent import selenium_check_settings as cs
     from applitools.selenium.optional_deps import WebDriver
 
@@ -370,11 +375,13 @@ class CheckSettings(USDKSchema):
     enable_patterns = Boolean(dump_to="enablePatterns")
     ignore_caret = Boolean(dump_to="ignoreCaret")
     ignore_displacements = Boolean(dump_to="ignoreDisplacements")
-    ignore_regions = List(Nested(CodedRegionReference), dump_to="ignoreRegions")
-    layout_regions = List(Nested(CodedRegionReference), dump_to="layoutRegions")
-    strict_regions = List(Nested(CodedRegionReference), dump_to="strictRegions")
-    content_regions = List(Nested(CodedRegionReference), dump_to="contentRegions")
-    floating_regions = List(Nested(FloatingRegionReference), dump_to="floatingRegions")
+    ignore_regions = RegionList(Nested(CodedRegionReference), dump_to="ignoreRegions")
+    layout_regions = RegionList(Nested(CodedRegionReference), dump_to="layoutRegions")
+    strict_regions = RegionList(Nested(CodedRegionReference), dump_to="strictRegions")
+    content_regions = RegionList(Nested(CodedRegionReference), dump_to="contentRegions")
+    floating_regions = RegionList(
+        Nested(FloatingRegionReference), dump_to="floatingRegions"
+    )
     accessibility_regions = List(
         Nested(AccessibilityRegionReference), dump_to="accessibilityRegions"
     )
@@ -583,68 +590,132 @@ class TestResultsSummary(Schema):
         return common.TestResultsSummary(**data)
 
 
+class LazyTestResultContainer(TestResultContainer):
+    test_results = LazyTestResultsField(load_from="result")
+
+
+class LazyTestResultsSummary(TestResultsSummary):
+    results = List(Nested(LazyTestResultContainer))
+
+
+def load_test_results_attribute(name, data, default):
+    # type: (t.Text, dict, t.Any) -> t.Any
+    return attribute_loader(TestResults, name)(data, default)
+
+
 def marshal_webdriver_ref(driver):
     # type: (WebDriver) -> dict
-    return check_error(StaticDriver().dump(driver))
+    return dumper(StaticDriver)(driver)
 
 
-def marshal_image_target(check_settings):
-    # type: (ics.ImagesCheckSettings) -> dict
-    return check_error(ImageTarget().dump(check_settings.values))
+def marshal_image_target(image):
+    # type: (t.Text) -> dict
+    return dumper(ImageTarget)({"image": image})
 
 
 def marshal_configuration(configuration):
     # type: (config.Configuration) -> dict
-    open = check_error(OpenSettings().dump(configuration))
-    config = check_error(EyesConfig().dump(configuration))
-    close = check_error(CloseSettings().dump(configuration))
+    # reading doesn't copy values the configuration shares with its clones
+    configuration = CopiedOnWriteView(configuration)
+    open = dumper(OpenSettings)(configuration)
+    config = dumper(EyesConfig)(configuration)
+    close = dumper(CloseSettings)(configuration)
     return {"open": open, "screenshot": config, "check": config, "close": close}
 
 
-def marshal_check_settings(check_settings):
-    # type: (cs.SeleniumCheckSettings) -> dict
-    return check_error(CheckSettings().dump(check_settings.values))
+class ConfigurationMarshaler(object):
+    """Marshals configuration, the result is reused until it is modified."""
+
+    def __init__(self):
+        self._configuration = None  # type: t.Optional[config.Configuration]
+        self._state_key = None  # type: t.Optional[tuple]
+        self._marshaled = None  # type: t.Optional[dict]
+
+    def __call__(self, configuration):
+        # type: (config.Configuration) -> dict
+        state_key = configuration._state_key()  # noqa
+        if configuration is not self._configuration or state_key != self._state_key:
+            self._marshaled = marshal_configuration(configuration)
+            self._configuration, self._state_key = configuration, state_key
+        return self._marshaled
+
+
+def marshal_check_settings(check_settings, coalesce_regions=False):
+    # type: (cs.SeleniumCheckSettings, t.Optional[bool]) -> dict
+    values = check_settings.values
+    if coalesce_regions:
+        values = copy(values)
+        for name in _COALESCED_REGIONS:
+            setattr(values, name, _coalesced(getattr(values, name)))
+    return dumper(CheckSettings)(values)
+
+
+# Match level regions, the area they cover matters, not the regions themselves
+_COALESCED_REGIONS = (
+    "ignore_regions",
+    "layout_regions",
+    "strict_regions",
+    "content_regions",
+)
+
+
+def _coalesced(regions):
+    # type: (t.List[GetRegion]) -> t.List[GetRegion]
+    """Replaces rectangles with no more of them covering the same area."""
+    rectangles, other = [], []
+    for each in regions:
+        if isinstance(each, RegionsByRectangles):
+            rectangles.extend(each._regions)  # noqa
+        elif isinstance(each, RegionByRectangle) and isinstance(
+            each._region, common.Region  # noqa
+        ):
+            rectangles.append(each._region)  # noqa
+        else:
+            other.append(each)
+    if len(rectangles) < 2:
+        return regions
+    return other + [RegionsByRectangles(common.RegionSet(rectangles).coalesced())]
 
 
 def marshal_locate_settings(locate_settings):
     # type: (locators.VisualLocatorSettings) -> dict
-    return check_error(LocateSettings().dump(locate_settings.values))
+    return dumper(LocateSettings)(locate_settings.values)
 
 
 def marshal_ocr_search_settings(search_settings):
     # type: (extract_text.TextRegionSettings) -> dict
-    return check_error(OCRSearchSettings().dump(search_settings))
+    return dumper(OCRSearchSettings)(search_settings)
 
 
 def marshal_ocr_extract_settings(extract_settings):
     # type: (t.Tuple[extract_text.OCRRegion, ...]) -> t.List[dict]
-    return [check_error(ExtractTextSettings().dump(s)) for s in extract_settings]
+    return [dumper(ExtractTextSettings)(s) for s in extract_settings]
 
 
 def marshal_viewport_size(viewport_size):
     # type: (ViewPort) -> dict
-    return check_error(Size().dump(viewport_size))
+    return dumper(Size)(viewport_size)
 
 
 def marshal_enabled_batch_close(close_batches):
     # type: (batch_close._EnabledBatchClose) -> dict # noqa
-    return check_error(CloseBatchSettings().dump(close_batches))
+    return dumper(CloseBatchSettings)(close_batches)
 
 
 def marshal_delete_test_settings(test_results):
     # type: (common.TestResults) -> dict
-    return check_error(DeleteTestSettings().dump(test_results))
+    return dumper(DeleteTestSettings)(test_results)
 
 
 def demarshal_match_result(results_dict):
     # type: (dict) -> MatchResult
-    return check_error(MatchResult().load(results_dict))
+    return loader(MatchResult)(results_dict)
 
 
 def demarshal_locate_result(results):
     # type: (dict) -> t.Dict[t.Text, t.List[common.Region]]
     return {
-        locator_id: [check_error(Region().load(r)) for r in regions] if regions else []
+        locator_id: [loader(Region)(r) for r in regions] if regions else []
         for locator_id, regions in results.items()
     }
 
@@ -652,25 +723,32 @@ def demarshal_locate_result(results):
 def demarshal_locate_text_result(results):
     # type: (dict) -> t.Dict[t.Text, t.List[extract_text.TextRegion]]
     return {
-        locator_id: [check_error(LocateTextResponse().load(r)) for r in regions]
-        if regions
-        else []
+        locator_id: [loader(LocateTextResponse)(r) for r in regions] if regions else []
         for locator_id, regions in results.items()
     }
 
 
-def demarshal_test_results(results_list, conf):
-    # type: (t.List[dict], config.Configuration) -> t.List[common.TestResults]
+def demarshal_test_results(results_list, conf, lazy=False):
+    # type: (t.List[dict], config.Configuration, bool) -> t.List[common.TestResults]
     # When locating visual locators, result might be None
-    results = [check_error(TestResults().load(r)) for r in results_list if r]
+    if lazy:
+        results = [
+            common.LazyTestResults(r, load_test_results_attribute)
+            for r in results_list
+            if r
+        ]
+    else:
+        results = [loader(TestResults)(r) for r in results_list if r]
     for result in results:
         result.set_connection_config(conf.server_url, conf.api_key, conf.proxy)
     return results
 
 
-def demarshal_close_manager_results(close_manager_result_dict, conf):
-    # type: (dict, config.Configuration) -> common.TestResultsSummary
-    results = check_error(TestResultsSummary().load(close_manager_result_dict))
+def demarshal_close_manager_results(close_manager_result_dict, conf, lazy=False):
+    # type: (dict, config.Configuration, bool) -> common.TestResultsSummary
+    """With lazy, test results attributes are de-serialized on first access."""
+    summary_schema = LazyTestResultsSummary if lazy else TestResultsSummary
+    results = loader(summary_schema)(close_manager_result_dict)
     for container in results:
         if container.test_results:
             container.test_results.set_connection_config(
@@ -681,4 +759,4 @@ def demarshal_close_manager_results(close_manager_result_dict, conf):
 
 def demarshal_server_info(info_dict):
     # type: (dict) -> common.ServerInfo
-    return check_error(ServerInfo().load(info_dict))
+    return loader(ServerInfo)(info_dict)
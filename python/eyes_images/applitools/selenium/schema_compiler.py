@@ -0,0 +1,612 @@
+"""
+Compiled alternative to marshmallow (de)serialization of USDK schemas.
+
+Python source of a specialized dump and load function is generated once per
+schema class: field names, types and the USDK empty values filter are
+resolved at generation time, so each call is a flat sequence of attribute
+lookups and conversions instead of the generic marshmallow machinery.
+The output is identical to the marshmallow one, schemas using features not
+supported here fall back to marshmallow.
+
+Set APPLITOOLS_SCHEMA_BACKEND=marshmallow environment variable to disable it.
+"""
+from __future__ import absolute_import
+
+import copy
+import os
+import typing as t
+from functools import partial
+from logging import getLogger
+
+from marshmallow import ValidationError, missing
+from marshmallow.compat import Mapping
+from marshmallow.fields import (
+    Boolean,
+    DateTime,
+    Dict,
+    Field,
+    Float,
+    Integer,
+    List,
+    Nested,
+    Raw,
+    String,
+)
+from marshmallow.schema import BaseSchema
+from marshmallow.utils import ensure_text_type, is_collection
+from six import string_types, text_type
+
+from .schema_fields import (
+    Enum,
+    NestedSchemaField,
+    RegionList,
+    check_error,
+    dump_region_list,
+)
+
+logger = getLogger(__name__)
+
+SCHEMA_BACKEND_ENV = "APPLITOOLS_SCHEMA_BACKEND"
+
+_dumpers = {}  # type: t.Dict[type, t.Callable[[t.Any], dict]]
+_loaders = {}  # type: t.Dict[t.Any, t.Callable[..., t.Any]]
+
+
+def compiled_backend_enabled():
+    # type: () -> bool
+    return os.getenv(SCHEMA_BACKEND_ENV, "compiled").lower() != "marshmallow"
+
+
+def dumper(schema_class):
+    # type: (type) -> t.Callable[[t.Any], dict]
+    """Returns function serializing objects with the schema."""
+    dump = _dumpers.get(schema_class)
+    if dump is None:
+        if compiled_backend_enabled():
+            dump = compile_dumper(schema_class)
+        else:
+            dump = partial(_marshmallow_dump, schema_class)
+        _dumpers[schema_class] = dump
+    return dump
+
+
+def loader(schema_class):
+    # type: (type) -> t.Callable[[dict], t.Any]
+    """Returns function de-serializing dicts with the schema."""
+    load = _loaders.get(schema_class)
+    if load is None:
+        if compiled_backend_enabled():
+            load = compile_loader(schema_class)
+        else:
+            load = partial(_marshmallow_load, schema_class)
+        _loaders[schema_class] = load
+    return load
+
+
+def attribute_loader(schema_class, name):
+    # type: (type, t.Text) -> t.Callable[[dict, t.Any], t.Any]
+    """Returns function de-serializing single field of the schema.
+
+    The function is called with the dict and the value to return when the dict
+    has no value for the field, post_load processors are not applied.
+    Attributes the schema has no field for are always loaded as the default.
+    """
+    key = (schema_class, name)
+    load = _loaders.get(key)
+    if load is None:
+        if name not in schema_class().fields:
+            load = _default
+        elif compiled_backend_enabled() and not _unsupported(schema_class(), "load"):
+            load = _LoaderGenerator(schema_class(), attribute=name).build()
+        else:
+            load = partial(_marshmallow_load_attribute, schema_class, name)
+        _loaders[key] = load
+    return load
+
+
+def compile_dumper(schema_class):
+    # type: (type) -> t.Callable[[t.Any], dict]
+    schema = schema_class()
+    reason = _unsupported(schema, "dump")
+    if reason:
+        logger.debug("Not compiling %s dump: %s", schema_class.__name__, reason)
+        return partial(_marshmallow_dump, schema_class)
+    return _DumperGenerator(schema).build()
+
+
+def compile_loader(schema_class):
+    # type: (type) -> t.Callable[[dict], t.Any]
+    schema = schema_class()
+    reason = _unsupported(schema, "load")
+    if reason:
+        logger.debug("Not compiling %s load: %s", schema_class.__name__, reason)
+        return partial(_marshmallow_load, schema_class)
+    return _LoaderGenerator(schema).build()
+
+
+def _marshmallow_dump(schema_class, obj):
+    return check_error(schema_class().dump(obj))
+
+
+def _marshmallow_load(schema_class, data):
+    return check_error(schema_class().load(data))
+
+
+def _default(_, default):
+    return default
+
+
+def _marshmallow_load_attribute(schema_class, name, data, default):
+    field = schema_class().fields[name]
+    key = name
+    value = data.get(name, missing)
+    if value is missing and field.load_from:
+        key = field.load_from
+        value = data.get(key, missing)
+    if value is missing:
+        value = field.missing() if callable(field.missing) else field.missing
+    if value is missing and not field.required:
+        return default
+    try:
+        return field.deserialize(value, field.load_from or name, data)
+    except ValidationError as error:
+        _fail_validation(key, error)
+
+
+def _unsupported(schema, mode):
+    # type: (t.Any, t.Text) -> t.Optional[t.Text]
+    from .schema import USDKSchema
+
+    if schema.many or schema.prefix or schema.only or schema.exclude:
+        return "schema options"
+    if schema.opts.ordered or schema.__accessor__ or schema.strict:
+        return "schema meta options"
+    if _function(type(schema).get_attribute) is not _function(BaseSchema.get_attribute):
+        return "custom get_attribute"
+    processors = {k: v for k, v in schema.__processors__.items() if v}
+    allowed = {("post_load", False)}
+    if isinstance(schema, USDKSchema):
+        if _function(type(schema).should_keep) is not _function(USDKSchema.should_keep):
+            return "custom should_keep"
+        if schema._always_skip_values != (None, []):  # noqa
+            return "custom skipped values"
+        allowed.add(("post_dump", False))
+        if processors.get(("post_dump", False), []) != [
+            "remove_none_values_empty_lists"
+        ]:
+            return "post_dump processors"
+    if set(processors) - allowed or len(processors.get(("post_load", False), [])) > 1:
+        return "processors"
+    for name in processors.get(("post_load", False), []):
+        processor = getattr(schema, name)
+        if processor.__marshmallow_kwargs__[("post_load", False)].get("pass_original"):
+            return "post_load options"
+    if schema.__error_handler__:
+        return "error handler"
+    for name, field in schema.fields.items():
+        if mode == "load" and not field.dump_only and "." in (field.attribute or ""):
+            return "nested attribute of " + name
+    return None
+
+
+def _function(method):
+    # unbound methods of python 2 are created on every attribute access
+    return getattr(method, "__func__", method)
+
+
+def _get_value(obj, key):
+    # Same as marshmallow.utils._get_value_for_key
+    try:
+        return obj[key]
+    except (KeyError, AttributeError, IndexError, TypeError):
+        try:
+            attr = getattr(obj, key)
+            return attr() if callable(attr) else attr
+        except AttributeError:
+            return missing
+
+
+def _get_value_path(obj, keys):
+    for key in keys:
+        obj = _get_value(obj, key)
+    return obj
+
+
+def _fail(key, message):
+    raise RuntimeError("Internal serialization error", {key: [message]})
+
+
+def _fail_validation(key, error):
+    # type: (t.Text, ValidationError) -> None
+    raise RuntimeError("Internal serialization error", {key: error.messages})
+
+
+class _Generator(object):
+    """Accumulates generated source lines and objects they reference."""
+
+    function_name = None  # type: t.Text
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.schema_name = type(schema).__name__
+        self.lines = []  # type: t.List[t.Text]
+        self.namespace = {
+            "missing": missing,
+            "ValidationError": ValidationError,
+            "Mapping": Mapping,
+            "is_collection": is_collection,
+            "ensure_text_type": ensure_text_type,
+            "string_types": string_types,
+            "text_type": text_type,
+            "fail": _fail,
+            "fail_validation": _fail_validation,
+            "compiled_dump": _compiled_dump,
+        }
+        self._counter = 0
+
+    def reference(self, obj, hint):
+        # type: (t.Any, t.Text) -> t.Text
+        """Makes object accessible to the generated code, returns its name."""
+        self._counter += 1
+        name = "{}_{}".format(hint, self._counter)
+        self.namespace[name] = obj
+        return name
+
+    def emit(self, indent, line):
+        # type: (int, t.Text) -> None
+        self.lines.append("    " * indent + line)
+
+    def helper(self, prefix, context, body):
+        # type: (t.Text, t.Text, t.Callable[[int, t.Text], None]) -> t.Text
+        """Defines function transforming its value with the body lines."""
+        self._counter += 1
+        name = "{}_{}".format(prefix, self._counter)
+        outer, self.lines = self.lines, []
+        self.emit(0, "def {}(value, {}):".format(name, context))
+        body(1, "value")
+        self.emit(1, "return value")
+        helper_lines, self.lines = self.lines, outer
+        self.lines[:0] = helper_lines
+        return name
+
+    def build(self):
+        source = "\n".join(self.lines)
+        code = compile(
+            source, "<{} {}>".format(self.function_name, self.schema_name), "exec"
+        )
+        exec(code, self.namespace)  # nosec
+        function = self.namespace[self.function_name]
+        function.source = source
+        return function
+
+    def failure(self, key, field, error):
+        # type: (t.Text, Field, t.Text) -> t.Text
+        return "fail({!r}, {!r})".format(key, field.error_messages[error])
+
+    @staticmethod
+    def with_compiled_schemas(field):
+        # type: (Field) -> Field
+        if isinstance(field, NestedSchemaField):
+            field = copy.copy(field)
+            field._dump = _compiled_dump  # noqa
+            field._load = _compiled_load  # noqa
+        return field
+
+
+class _DumperGenerator(_Generator):
+    function_name = "dump"
+
+    def __init__(self, schema):
+        from .schema import USDKSchema
+
+        super(_DumperGenerator, self).__init__(schema)
+        self.namespace["get_value"] = _get_value
+        self.namespace["get_value_path"] = _get_value_path
+        self.filter_empty = isinstance(schema, USDKSchema)
+        keep_empty = getattr(schema, "_keep_empty_objects", ())
+        self.emit(0, "def dump(obj):")
+        self.emit(1, "result = {}")
+        for name, field in schema.fields.items():
+            if not field.load_only:
+                self.field(name, field, keep_empty)
+        self.emit(1, "return result")
+
+    def field(self, name, field, keep_empty):
+        key = field.dump_to or name
+        if not field._CHECK_ATTRIBUTE:  # noqa
+            self.emit(1, "value = None")
+            self.serialize(1, "value", key, field)
+            self.store(1, key, keep_empty)
+            return
+        path = (field.attribute or name).split(".")
+        if len(path) == 1:
+            self.emit(1, "value = get_value(obj, {!r})".format(path[0]))
+        else:
+            self.emit(1, "value = get_value_path(obj, {!r})".format(tuple(path)))
+        if field.default is missing:
+            self.emit(1, "if value is not missing:")
+            self.serialize(2, "value", key, field)
+            self.store(2, key, keep_empty)
+        else:
+            default = self.reference(field.default, "default")
+            self.emit(1, "if value is missing:")
+            if callable(field.default):
+                self.emit(2, "value = {}()".format(default))
+            else:
+                self.emit(2, "value = {}".format(default))
+            self.emit(1, "else:")
+            self.serialize(2, "value", key, field)
+            self.store(1, key, keep_empty)
+
+    def store(self, indent, key, keep_empty):
+        if self.filter_empty:
+            # same as USDKSchema.should_keep
+            condition = "value is not None and value != []"
+            if key not in keep_empty:
+                condition += " and value != {}"
+            self.emit(indent, "if {}:".format(condition))
+            indent += 1
+        self.emit(indent, "result[{!r}] = value".format(key))
+
+    def serialize(self, indent, var, key, field):
+        # type: (int, t.Text, t.Text, Field) -> None
+        """Emits lines replacing var with field._serialize(var, ...) result."""
+        field_type = type(field)
+        if field_type is String:
+            condition = "{0} is not None and type({0}) is not text_type"
+            self.emit(indent, "if {}:".format(condition.format(var)))
+            self.emit(indent + 1, "{0} = ensure_text_type({0})".format(var))
+        elif field_type in (Integer, Float) and not field.as_string:
+            num_type = "int" if field_type is Integer else "float"
+            self.emit(indent, "if {} is not None:".format(var))
+            self.emit(indent + 1, "try:")
+            self.emit(indent + 2, "{0} = {1}({0})".format(var, num_type))
+            self.emit(indent + 1, "except (TypeError, ValueError):")
+            self.emit(indent + 2, self.failure(key, field, "invalid"))
+            self.emit(indent + 1, "except OverflowError:")
+            self.emit(indent + 2, self.failure(key, field, "too_large"))
+        elif field_type is Boolean:
+            truthy = self.reference(field.truthy, "truthy")
+            falsy = self.reference(field.falsy, "falsy")
+            self.emit(indent, "if {} is None:".format(var))
+            self.emit(indent + 1, "pass")
+            self.emit(indent, "elif {} in {}:".format(var, truthy))
+            self.emit(indent + 1, "{} = True".format(var))
+            self.emit(indent, "elif {} in {}:".format(var, falsy))
+            self.emit(indent + 1, "{} = False".format(var))
+            self.emit(indent, "else:")
+            self.emit(indent + 1, "{0} = bool({0})".format(var))
+        elif field_type in (Field, Raw):
+            pass
+        elif field_type is Dict:
+            pass
+        elif field_type is Enum:
+            self.emit(indent, "if {} is not None:".format(var))
+            self.emit(indent + 1, "{0} = {0}.value".format(var))
+        elif field_type is DateTime and _is_strftime_format(field):
+            self.emit(indent, "if {} is not None:".format(var))
+            self.emit(
+                indent + 1, "{0} = {0}.strftime({1!r})".format(var, field.dateformat)
+            )
+        elif field_type is Nested and _is_plain_nested(field):
+            dump = self.reference(dumper(_schema_class(field)), "dump")
+            self.emit(indent, "if {} is not None:".format(var))
+            self.emit(indent + 1, "{0} = {1}({0})".format(var, dump))
+        elif field_type is List and not field.container.attribute:
+            item = self.helper(
+                "item", "obj", lambda i, v: self.serialize(i, v, key, field.container)
+            )
+            self.emit(indent, "if {} is None:".format(var))
+            self.emit(indent + 1, "pass")
+            self.emit(
+                indent, "elif type({0}) is list or is_collection({0}):".format(var)
+            )
+            self.emit(
+                indent + 1, "{0} = [{1}(each, obj) for each in {0}]".format(var, item)
+            )
+            self.emit(indent, "else:")
+            self.emit(indent + 1, "{0} = [{1}({0}, obj)]".format(var, item))
+        elif field_type is RegionList and not field.container.attribute:
+            item = self.helper(
+                "item", "obj", lambda i, v: self.serialize(i, v, key, field.container)
+            )
+            expand = self.reference(dump_region_list, "dump_region_list")
+            self.emit(indent, "if {} is not None:".format(var))
+            self.emit(indent + 1, "if not is_collection({}):".format(var))
+            self.emit(indent + 2, "{0} = [{0}]".format(var))
+            self.emit(
+                indent + 1,
+                "{0} = {1}({0}, {2}, obj, compiled_dump)".format(var, expand, item),
+            )
+        else:
+            field = self.with_compiled_schemas(field)
+            bound = self.reference(field, "field")
+            attr = field.name if field.name is not None else key
+            self.emit(indent, "try:")
+            self.emit(
+                indent + 1,
+                "{0} = {1}._serialize({0}, {2!r}, obj)".format(var, bound, attr),
+            )
+            self.emit(indent, "except ValidationError as error:")
+            self.emit(indent + 1, "fail_validation({!r}, error)".format(key))
+
+
+class _LoaderGenerator(_Generator):
+    function_name = "load"
+
+    def __init__(self, schema, attribute=None):
+        # type: (t.Any, t.Optional[t.Text]) -> None
+        """With attribute, generates load(data, default) of the single field."""
+        super(_LoaderGenerator, self).__init__(schema)
+        post_load = schema.__processors__.get(("post_load", False))
+        if attribute:
+            self.emit(0, "def load(data, default):")
+        else:
+            self.emit(0, "def load(data):")
+        self.emit(1, "if not isinstance(data, Mapping):")
+        self.emit(2, "fail('_schema', 'Invalid input type.')")
+        self.emit(1, "result = {}")
+        for name, field in schema.fields.items():
+            if not field.dump_only and attribute in (None, name):
+                self.field(name, field)
+        if attribute:
+            key = schema.fields[attribute].attribute or attribute
+            self.emit(1, "return result.get({!r}, default)".format(key))
+        elif post_load:
+            processor = self.reference(getattr(schema, post_load[0]), "post_load")
+            self.emit(1, "processed = {}(result)".format(processor))
+            self.emit(1, "return result if processed is None else processed")
+        else:
+            self.emit(1, "return result")
+
+    def field(self, name, field):
+        self.emit(1, "value = data.get({!r}, missing)".format(name))
+        key = name
+        if field.load_from:
+            self.emit(1, "if value is missing:")
+            self.emit(2, "value = data.get({!r}, missing)".format(field.load_from))
+            # marshmallow reports errors of both names under the loaded one
+            key = field.load_from
+        if field.missing is not missing:
+            default = self.reference(field.missing, "missing")
+            self.emit(1, "if value is missing:")
+            call = "()" if callable(field.missing) else ""
+            self.emit(2, "value = {}{}".format(default, call))
+        if field.required:
+            self.emit(1, "if value is missing:")
+            self.emit(2, self.failure(key, field, "required"))
+        self.emit(1, "if value is not missing:")
+        self.deserialize(2, "value", key, field, repr(field.load_from or name))
+        self.emit(2, "result[{!r}] = value".format(field.attribute or name))
+
+    def deserialize(self, indent, var, key, field, attr):
+        # type: (int, t.Text, t.Text, Field, t.Text) -> None
+        """Emits lines replacing var with field.deserialize(var, ...) result.
+
+        attr is the source of the attr argument, it is None for list items.
+        """
+        field_type = type(field)
+        if field.validators or not self.is_supported(field):
+            bound = self.reference(self.with_compiled_schemas(field), "field")
+            data = "None" if attr == "None" else "data"
+            self.emit(indent, "try:")
+            self.emit(
+                indent + 1,
+                "{0} = {1}.deserialize({0}, {2}, {3})".format(var, bound, attr, data),
+            )
+            self.emit(indent, "except ValidationError as error:")
+            self.emit(indent + 1, "fail_validation({!r}, error)".format(key))
+            return
+        self.emit(indent, "if {} is None:".format(var))
+        if field.allow_none is not True:
+            self.emit(indent + 1, self.failure(key, field, "null"))
+        else:
+            self.emit(indent + 1, "pass")
+        self.emit(indent, "else:")
+        indent += 1
+        if field_type is String:
+            self.emit(indent, "if not isinstance({}, string_types):".format(var))
+            self.emit(indent + 1, self.failure(key, field, "invalid"))
+            self.emit(indent, "if type({}) is not text_type:".format(var))
+            self.emit(indent + 1, "try:")
+            self.emit(indent + 2, "{0} = ensure_text_type({0})".format(var))
+            self.emit(indent + 1, "except UnicodeDecodeError:")
+            self.emit(indent + 2, self.failure(key, field, "invalid_utf8"))
+        elif field_type in (Integer, Float):
+            num_type = "int" if field_type is Integer else "float"
+            self.emit(indent, "try:")
+            self.emit(indent + 1, "{0} = {1}({0})".format(var, num_type))
+            self.emit(indent, "except (TypeError, ValueError):")
+            self.emit(indent + 1, self.failure(key, field, "invalid"))
+            self.emit(indent, "except OverflowError:")
+            self.emit(indent + 1, self.failure(key, field, "too_large"))
+        elif field_type is Boolean:
+            truthy = self.reference(field.truthy, "truthy")
+            falsy = self.reference(field.falsy, "falsy")
+            self.emit(indent, "try:")
+            self.emit(indent + 1, "if {} in {}:".format(var, truthy))
+            self.emit(indent + 2, "{} = True".format(var))
+            self.emit(indent + 1, "elif {} in {}:".format(var, falsy))
+            self.emit(indent + 2, "{} = False".format(var))
+            self.emit(indent + 1, "else:")
+            self.emit(indent + 2, self.failure(key, field, "invalid"))
+            self.emit(indent, "except TypeError:")
+            self.emit(indent + 1, self.failure(key, field, "invalid"))
+        elif field_type in (Field, Raw):
+            self.emit(indent, "pass")
+        elif field_type is Dict:
+            self.emit(indent, "if not isinstance({}, Mapping):".format(var))
+            self.emit(indent + 1, self.failure(key, field, "invalid"))
+        elif field_type is Enum:
+            enum_type = self.reference(field.enum_type, "enum")
+            self.emit(indent, "{0} = {1}({0})".format(var, enum_type))
+        elif field_type is Nested:
+            load = self.reference(loader(_schema_class(field)), "load")
+            self.emit(indent, "{0} = {1}({0})".format(var, load))
+        elif field_type is List:
+            item = self.helper(
+                "item",
+                "data",
+                lambda i, v: self.deserialize(i, v, key, field.container, "None"),
+            )
+            self.emit(indent, "if not is_collection({}):".format(var))
+            self.emit(indent + 1, self.failure(key, field, "invalid"))
+            self.emit(
+                indent, "{0} = [{1}(each, data) for each in {0}]".format(var, item)
+            )
+
+    @staticmethod
+    def is_supported(field):
+        # type: (Field) -> bool
+        field_type = type(field)
+        if field_type in (String, Integer, Float, Boolean, Field, Raw, Dict, Enum):
+            return True
+        if field_type is Nested:
+            return _is_plain_nested(field)
+        if field_type is List:
+            return not field.container.attribute
+        return False
+
+
+def _compiled_dump(schema_class, obj):
+    return dumper(schema_class)(obj)
+
+
+def _compiled_load(schema_class, data):
+    return loader(schema_class)(data)
+
+
+def _schema_class(field):
+    # type: (Nested) -> type
+    return type(field.schema)
+
+
+def _is_plain_nested(field):
+    # type: (Nested) -> bool
+    schema = field.schema
+    return not (
+        field.many
+        or field.only
+        or field.exclude
+        or schema.many
+        or schema.only
+        or schema.exclude
+        or schema.context
+    )
+
+
+def _is_strftime_format(field):
+    # type: (DateTime) -> bool
+    return (
+        field.dateformat is not None
+        and field.dateformat not in DateTime.DATEFORMAT_SERIALIZATION_FUNCS
+    )
+
+
+__all__ = [
+    "SCHEMA_BACKEND_ENV",
+    "attribute_loader",
+    "compiled_backend_enabled",
+    "dumper",
+    "loader",
+]
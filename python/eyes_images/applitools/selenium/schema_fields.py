@@ -2,7 +2,10 @@ from __future__ import absolute_import
 
 import typing as t
 
-from marshmallow.fields import Dict, Field
+from marshmallow import ValidationError
+from marshmallow.compat import Mapping
+from marshmallow.fields import Dict, Field, List
+from marshmallow.utils import is_collection
 
 from applitools.selenium.optional_deps import StaleElementReferenceException
 
@@ -12,11 +15,17 @@ from ..common import (
     DesktopBrowserInfo,
     DiffsFoundError,
     IosDeviceInfo,
+    LazyTestResults,
     NewTestError,
     TestFailedError,
 )
 from ..common.errors import USDKFailure
-from ..core import FloatingRegionByRectangle, RegionByRectangle
+from ..core import (
+    FloatingRegionByRectangle,
+    FloatingRegionsByRectangles,
+    RegionByRectangle,
+    RegionsByRectangles,
+)
 from ..core.extract_text import OCRRegion
 from ..core.fluent import AccessibilityRegionByRectangle
 from .fluent import FloatingRegionBySelector, RegionBySelector
@@ -33,6 +42,21 @@ if t.TYPE_CHECKING:
     from applitools.selenium.fluent import target_path
 
 
+class NestedSchemaField(Field):
+    """
+    Field which value is (de)serialized with another schema, compiled
+    serializers replace `_dump` and `_load` with the compiled functions.
+    """
+
+    def _dump(self, schema_class, obj):
+        # type: (type, t.Any) -> dict
+        return check_error(schema_class().dump(obj))
+
+    def _load(self, schema_class, data):
+        # type: (type, dict) -> t.Any
+        return check_error(schema_class().load(data))
+
+
 class Enum(Field):
     def __init__(self, enum_type, *args, **kwargs):
         super(Enum, self).__init__(*args, **kwargs)
@@ -59,7 +83,17 @@ class Error(Field):
         return demarshal_error(value)
 
 
-class DebugScreenshots(Field):
+class LazyTestResultsField(Field):
+    def _deserialize(self, value, *_):
+        # type: (dict, *t.Any) -> LazyTestResults
+        from .schema import load_test_results_attribute
+
+        if not isinstance(value, Mapping):
+            raise ValidationError("Invalid type.")
+        return LazyTestResults(value, load_test_results_attribute)
+
+
+class DebugScreenshots(NestedSchemaField):
     _CHECK_ATTRIBUTE = False
 
     def _serialize(self, _, __, config):
@@ -67,17 +101,17 @@ class DebugScreenshots(Field):
         from .schema import DebugScreenshotHandler
 
         if config.save_debug_screenshots:
-            return check_error(DebugScreenshotHandler().dump(config))
+            return self._dump(DebugScreenshotHandler, config)
 
 
-class EnvironmentField(Field):
+class EnvironmentField(NestedSchemaField):
     _CHECK_ATTRIBUTE = False
 
     def _serialize(self, _, __, config):
         # type: (t.Any, t.Any, cfg.Configuration) -> dict
         from .schema import Environment
 
-        return check_error(Environment().dump(config))
+        return self._dump(Environment, config)
 
 
 class VisualGridOptions(Field):
@@ -108,13 +142,13 @@ class FrameReference(Field):
             return frame.frame_locator.to_dict()
 
 
-class NormalizationField(Field):
+class NormalizationField(NestedSchemaField):
     _CHECK_ATTRIBUTE = False
 
     def _serialize(self, _, __, config):
         from .schema import Normalization
 
-        return check_error(Normalization().dump(config))
+        return self._dump(Normalization, config)
 
 
 class StitchOverlap(Field):
@@ -124,7 +158,7 @@ class StitchOverlap(Field):
             return {"bottom": value}
 
 
-class TargetReference(Field):
+class TargetReference(NestedSchemaField):
     _CHECK_ATTRIBUTE = False  # it might be target_locator or target_region
 
     def _serialize(self, _, __, check_settings):
@@ -134,12 +168,12 @@ class TargetReference(Field):
         elif check_settings.target_region:
             from .schema import Region
 
-            return check_error(Region().dump(check_settings.target_region))
+            return self._dump(Region, check_settings.target_region)
         else:
             return None
 
 
-class RegionReference(Field):
+class RegionReference(NestedSchemaField):
     _CHECK_ATTRIBUTE = False
 
     def _serialize(self, _, __, obj):
@@ -152,45 +186,93 @@ class RegionReference(Field):
         ):
             return obj._target_path.to_dict()  # noqa
         elif isinstance(obj, RegionByRectangle):
-            return check_error(Region().dump(obj._region))  # noqa
+            return self._dump(Region, obj._region)  # noqa
         elif isinstance(
             obj, (FloatingRegionByRectangle, AccessibilityRegionByRectangle)
         ):
-            return check_error(Region().dump(obj._rect))  # noqa
+            return self._dump(Region, obj._rect)  # noqa
         elif isinstance(obj, OCRRegion):
             if isinstance(obj.target, RegionLocator):
                 return obj.target.to_dict()
             else:
-                return check_error(Region().dump(obj.target))
+                return self._dump(Region, obj.target)
         else:
             raise RuntimeError("Unexpected region type", type(obj))
 
 
-class BrowserInfo(Field):
+class RegionList(List):
+    """List of region references, regions of RegionSet are dumped in place."""
+
+    def _serialize(self, value, attr, obj):
+        # type: (t.Any, t.Text, t.Any) -> t.Optional[t.List[dict]]
+        if value is None:
+            return None
+        return dump_region_list(
+            value if is_collection(value) else [value],
+            lambda each, o: self.container._serialize(each, attr, o),
+            obj,
+            lambda schema_class, o: check_error(schema_class().dump(o)),
+        )
+
+
+def dump_region_list(regions, dump_item, obj, dump):
+    # type: (t.Iterable[region.GetRegion], t.Callable[[t.Any, t.Any], dict], t.Any, t.Callable[[type, t.Any], dict]) -> t.List[dict]
+    """Dumps references of the regions, expanding the region sets.
+
+    Regions of a set are dumped straight from its array instead of boxing
+    every one of them to Region.
+    """
+    result = []
+    for each in regions:
+        if isinstance(each, (RegionsByRectangles, FloatingRegionsByRectangles)):
+            result.extend(_region_set_references(each, dump))
+        else:
+            result.append(dump_item(each, obj))
+    return result
+
+
+def _region_set_references(regions, dump):
+    # type: (t.Union[RegionsByRectangles, FloatingRegionsByRectangles], t.Callable[[type, t.Any], dict]) -> t.List[dict]
+    from .schema import Offset
+
+    # same as schema.Region dump
+    references = [
+        {
+            "region": {
+                "x": float(left),
+                "y": float(top),
+                "width": float(width),
+                "height": float(height),
+            }
+        }
+        for left, top, width, height in regions._regions.tolist()  # noqa
+    ]
+    if isinstance(regions, FloatingRegionsByRectangles):
+        offset = dump(Offset, regions.floating_bounds)
+        for reference in references:
+            reference["offset"] = dict(offset)
+    return references
+
+
+class BrowserInfo(NestedSchemaField):
     def _serialize(self, value, *_):
         # type: (ufg.IRenderBrowserInfo, *t.Any) -> dict
         if isinstance(value, DesktopBrowserInfo):
             from .schema import DesktopBrowserRenderer
 
-            return check_error(DesktopBrowserRenderer().dump(value))
+            return self._dump(DesktopBrowserRenderer, value)
         elif isinstance(value, ChromeEmulationInfo):
             from .schema import ChromeEmulationRenderer
 
-            return {
-                "chromeEmulationInfo": check_error(
-                    ChromeEmulationRenderer().dump(value)
-                )
-            }
+            return {"chromeEmulationInfo": self._dump(ChromeEmulationRenderer, value)}
         elif isinstance(value, AndroidDeviceInfo):
             from .schema import AndroidDeviceRenderer
 
-            return {
-                "androidDeviceInfo": check_error(AndroidDeviceRenderer().dump(value))
-            }
+            return {"androidDeviceInfo": self._dump(AndroidDeviceRenderer, value)}
         elif isinstance(value, IosDeviceInfo):
             from .schema import IosDeviceRenderer
 
-            return {"iosDeviceInfo": check_error(IosDeviceRenderer().dump(value))}
+            return {"iosDeviceInfo": self._dump(IosDeviceRenderer, value)}
         else:
             raise RuntimeError("Unexpected BrowserInfo type", type(value))
 
@@ -201,21 +283,19 @@ class BrowserInfo(Field):
         elif "iosDeviceInfo" in value:
             from .schema import IosDeviceRenderer
 
-            return check_error(IosDeviceRenderer().load(value["iosDeviceInfo"]))
+            return self._load(IosDeviceRenderer, value["iosDeviceInfo"])
         elif "androidDeviceInfo" in value:
             from .schema import AndroidDeviceRenderer
 
-            return check_error(AndroidDeviceRenderer().load(value["androidDeviceInfo"]))
+            return self._load(AndroidDeviceRenderer, value["androidDeviceInfo"])
         elif "chromeEmulationInfo" in value:
             from .schema import ChromeEmulationRenderer
 
-            return check_error(
-                ChromeEmulationRenderer().load(value["chromeEmulationInfo"])
-            )
+            return self._load(ChromeEmulationRenderer, value["chromeEmulationInfo"])
         else:
             from .schema import DesktopBrowserRenderer
 
-            return check_error(DesktopBrowserRenderer().load(value))
+            return self._load(DesktopBrowserRenderer, value)
 
 
 def check_error(marshmellow_result):
@@ -1,9 +1,71 @@
 from __future__ import absolute_import
 
+import os
+import sys
+from logging import getLogger
+from threading import Event, Lock, Thread
+
 __version__ = "3.0.1"
 
+PREWARM_ENV = "APPLITOOLS_UNIVERSAL_PREWARM"
+
+_prewarm_lock = Lock()
+_prewarm_ready = None  # type: Event
+_prewarmed_instance = None
+
 
 def get_instance():
+    if _prewarm_ready is not None:
+        _prewarm_ready.wait()
+        if _prewarmed_instance is not None:
+            return _prewarmed_instance
     from . import instance
 
     return instance.instance
+
+
+def is_prewarm_requested():
+    # type: () -> bool
+    return os.getenv(PREWARM_ENV, "").lower() in ("1", "true", "yes")
+
+
+def prewarm():
+    # type: () -> Event
+    """Start the universal server in a background thread.
+
+    get_instance called meanwhile waits for the returned event instead of
+    starting another server. Failures are raised by the next get_instance.
+    """
+    global _prewarm_ready
+    # Imported by the caller, background thread would wait for python 2
+    # import lock held by the module importing the package
+    from .server import SDKServer
+    from .shared_server import SharedSDKServer, is_shared_mode
+
+    server_class = SharedSDKServer if is_shared_mode() else SDKServer
+    with _prewarm_lock:
+        if _prewarm_ready is None:
+            _prewarm_ready = Event()
+            if __name__ + ".instance" in sys.modules:  # already started
+                _prewarm_ready.set()
+                return _prewarm_ready
+            thread = Thread(
+                target=_start_instance, args=(server_class,), name="USDK Prewarm"
+            )
+            thread.daemon = True
+            thread.start()
+        return _prewarm_ready
+
+
+def _start_instance(server_class):
+    global _prewarmed_instance
+    try:
+        _prewarmed_instance = server_class()
+    except Exception:
+        getLogger(__name__).debug("Universal server prewarm failed", exc_info=True)
+    finally:
+        _prewarm_ready.set()
+
+
+if is_prewarm_requested():
+    prewarm()
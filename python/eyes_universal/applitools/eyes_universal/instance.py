@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 
 from .server import SDKServer
+from .shared_server import SharedSDKServer, is_shared_mode
 
-instance = SDKServer()
+instance = SharedSDKServer() if is_shared_mode() else SDKServer()
@@ -1,6 +1,12 @@
+import atexit
+import json
+import os
+import socket
 import sys
+import tempfile
 from logging import getLogger
 from subprocess import PIPE, Popen  # nosec
+from uuid import uuid4
 
 from pkg_resources import resource_filename
 
@@ -9,12 +15,56 @@ logger = getLogger(__name__)
 _exe_name = "eyes-universal.exe" if sys.platform == "win32" else "eyes-universal"
 executable_path = resource_filename("applitools.eyes_universal", "bin/" + _exe_name)
 
+SOCKET_TRANSPORT_ENV = "APPLITOOLS_UNIVERSAL_SOCKET"
+
+
+def is_socket_transport_requested():
+    # type: () -> bool
+    return os.getenv(SOCKET_TRANSPORT_ENV, "").lower() in ("1", "true", "yes")
+
+
+def is_socket_transport_supported():
+    # type: () -> bool
+    return sys.platform != "win32" and hasattr(socket, "AF_UNIX")
+
+
+def default_socket_path():
+    # type: () -> str
+    # Unix socket paths are limited to ~100 characters, keep the name short
+    name = "applitools-usdk-{}-{}.sock".format(os.getpid(), uuid4().hex[:8])
+    return os.path.join(tempfile.gettempdir(), name)
+
 
 class SDKServer(object):
     log_file_name = None  # backward compatibility with eyes-selenium<=5.6
 
-    def __init__(self):
-        """Start eyes-universal service subprocess and obtain its port number."""
+    def __init__(self, socket_path=None):
+        # type: (str) -> None
+        """Start eyes-universal service subprocess and obtain its address.
+
+        With socket_path (or APPLITOOLS_UNIVERSAL_SOCKET=1 environment variable)
+        the service listens on a unix domain socket, if it fails to, the service
+        is restarted on a TCP port.
+        """
+        self.port = None
+        self.socket_path = None
+        if socket_path is None and is_socket_transport_requested():
+            socket_path = default_socket_path()
+        if socket_path and is_socket_transport_supported():
+            try:
+                self._start_on_socket(socket_path)
+            except (socket.error, OSError, IOError) as e:
+                logger.warning("Falling back to TCP universal server: %s", e)
+        if not self.socket_path:
+            self._start_on_port()
+
+    def __repr__(self):
+        """Produce helpful debugging description."""
+        if self.socket_path:
+            return "SDKServer(socket_path={})".format(self.socket_path)
+        return "SDKServer(port={})".format(self.port)
+
+    def _start_on_port(self):
         command = [executable_path, "--no-singleton", "--shutdown-mode", "stdin"]
         # Capture and keep stdin reference to notify USDK when it should terminate.
         # USDK is expected to terminate when it receives EOF on its stdin.
@@ -23,6 +73,42 @@ class SDKServer(object):
         self.port = int(self._usdk_subprocess.stdout.readline())
         logger.info("Started Universal SDK server at %s", self.port)
 
-    def __repr__(self):
-        """Produce helpful debugging description."""
-        return "SDKServer(port={})".format(self.port)
+    def _start_on_socket(self, socket_path):
+        # type: (str) -> None
+        # eyes-universal has no command line flag for it, but its websocket
+        # server listens on any path passed as the port of the config
+        config = {"port": socket_path, "singleton": False, "shutdownMode": "stdin"}
+        command = [executable_path, "--config", json.dumps(config)]
+        _remove(socket_path)
+        self._usdk_subprocess = Popen(command, stdin=PIPE, stdout=PIPE)  # nosec
+        # The first line is printed once the server listens, "undefined" stands
+        # for the missing port number
+        self._usdk_subprocess.stdout.readline()
+        try:
+            _unix_socket(socket_path).close()
+        except (socket.error, OSError, IOError):
+            self._usdk_subprocess.kill()
+            self._usdk_subprocess.wait()
+            raise
+        self.socket_path = socket_path
+        atexit.register(_remove, socket_path)
+        logger.info("Started Universal SDK server at %s", socket_path)
+
+
+def _unix_socket(path):
+    # type: (str) -> socket.socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
+def _remove(path):
+    # type: (str) -> None
+    try:
+        os.remove(path)
+    except OSError:
+        pass
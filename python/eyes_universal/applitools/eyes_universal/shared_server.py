@@ -0,0 +1,273 @@
+"""
+Universal server shared by all python processes of the user.
+
+Enabled with APPLITOOLS_UNIVERSAL_SHARED=1 environment variable, useful when
+tests run in many processes (pytest-xdist, pabot). The first process starts
+the server and publishes its port in a discovery file, other processes attach
+to it. Every process registers itself as a client of the server, the last one
+to exit shuts the server down.
+"""
+import atexit
+import base64
+import errno
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from contextlib import closing
+from logging import getLogger
+from subprocess import Popen  # nosec
+
+from .server import executable_path
+
+logger = getLogger(__name__)
+
+SHARED_MODE_ENV = "APPLITOOLS_UNIVERSAL_SHARED"
+# Server started by a crashed client is still shut down after this idle time
+IDLE_TIMEOUT_MINUTES = 15
+START_TIMEOUT_SECONDS = 60
+
+
+def is_shared_mode():
+    # type: () -> bool
+    return os.getenv(SHARED_MODE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def default_directory():
+    # type: () -> str
+    from . import __version__
+
+    user = os.getenv("USER") or os.getenv("USERNAME") or "user"
+    name = "applitools-eyes-universal-{}-{}".format(__version__, user)
+    return os.path.join(tempfile.gettempdir(), name)
+
+
+class SharedSDKServer(object):
+    """Attaches to the shared eyes-universal server, starts it if needed."""
+
+    def __init__(self, directory=None):
+        # type: (str) -> None
+        self._directory = directory or default_directory()
+        self._clients_directory = os.path.join(self._directory, "clients")
+        self._server_file = os.path.join(self._directory, "server.json")
+        self._client_file = os.path.join(self._clients_directory, str(os.getpid()))
+        _makedirs(self._clients_directory)
+        with _FileLock(os.path.join(self._directory, "lock")):
+            server = self._read_live_server()
+            if server is None:
+                server = self._start_server()
+                logger.info("Started shared Universal SDK server at %s", server)
+            else:
+                logger.info("Attached to shared Universal SDK server at %s", server)
+            self.pid, self.port = server["pid"], server["port"]
+            with open(self._client_file, "w"):
+                pass
+        atexit.register(self.release)
+
+    def release(self):
+        # type: () -> None
+        """Unregisters the process, stops the server if it was the last client."""
+        with _FileLock(os.path.join(self._directory, "lock")):
+            _remove(self._client_file)
+            if self._live_clients():
+                return
+            server = self._read_server()
+            if server and server["pid"] == self.pid:
+                logger.info("Stopping shared Universal SDK server at %s", server)
+                _terminate(self.pid)
+                _remove(self._server_file)
+
+    def __repr__(self):
+        """Produce helpful debugging description."""
+        return "SharedSDKServer(port={})".format(self.port)
+
+    def _read_server(self):
+        # type: () -> dict
+        try:
+            with open(self._server_file) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return None
+
+    def _read_live_server(self):
+        # type: () -> dict
+        server = self._read_server()
+        # the port of the exited server might be taken by another program
+        if (
+            server
+            and _is_process_alive(server["pid"])
+            and _is_universal_server(server["port"])
+        ):
+            return server
+        return None
+
+    def _start_server(self):
+        # type: () -> dict
+        command = [
+            executable_path,
+            "--no-singleton",
+            "--port-resolution-mode",
+            "random",
+            "--shutdown-mode",
+            "lazy",
+            "--idle-timeout",
+            str(IDLE_TIMEOUT_MINUTES),
+        ]
+        # The server outlives the process that started it, so its stdout is
+        # redirected to a file instead of a pipe that closes with this process
+        output_file = os.path.join(self._directory, "server.out")
+        with open(os.devnull, "rb") as devnull, open(output_file, "wb") as output:
+            process = Popen(  # nosec
+                command, stdin=devnull, stdout=output, **_detached_process_kwargs()
+            )
+        server = {"pid": process.pid, "port": _read_port(output_file, process)}
+        with open(self._server_file, "w") as f:
+            json.dump(server, f)
+        # clients of the previous server instance, if any, are gone
+        for name in os.listdir(self._clients_directory):
+            _remove(os.path.join(self._clients_directory, name))
+        return server
+
+    def _live_clients(self):
+        # type: () -> list
+        clients = []
+        for name in os.listdir(self._clients_directory):
+            if _is_process_alive(int(name)):
+                clients.append(name)
+            else:
+                _remove(os.path.join(self._clients_directory, name))
+        return clients
+
+
+def _read_port(output_file, process):
+    # type: (str, Popen) -> int
+    deadline = time.time() + START_TIMEOUT_SECONDS
+    while time.time() < deadline:
+        with open(output_file, "rb") as f:
+            line = f.readline()
+        if line.endswith(b"\n"):
+            return int(line)
+        if process.poll() is not None:
+            break
+        time.sleep(0.05)
+    raise RuntimeError("Failed to start shared Universal SDK server")
+
+
+def _detached_process_kwargs():
+    # type: () -> dict
+    if sys.platform == "win32":
+        detached_process, create_new_process_group = 0x8, 0x200
+        return {"creationflags": detached_process | create_new_process_group}
+    else:
+        return {"preexec_fn": os.setsid}
+
+
+def _is_universal_server(port):
+    # type: (int) -> bool
+    """Check the port accepts websocket handshake of the universal server."""
+    key = base64.b64encode(os.urandom(16))
+    accept = base64.b64encode(
+        hashlib.sha1(key + b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11").digest()  # nosec
+    )
+    request = (
+        b"GET /eyes HTTP/1.1\r\n"
+        b"Host: localhost\r\n"
+        b"Upgrade: websocket\r\n"
+        b"Connection: Upgrade\r\n"
+        b"Sec-WebSocket-Key: " + key + b"\r\n"
+        b"Sec-WebSocket-Version: 13\r\n\r\n"
+    )
+    response = b""
+    try:
+        with closing(socket.create_connection(("127.0.0.1", port), timeout=1)) as sock:
+            sock.sendall(request)
+            while b"\r\n\r\n" not in response:
+                chunk = sock.recv(1024)
+                if not chunk:
+                    break
+                response += chunk
+    except (socket.error, OSError):
+        return False
+    return response.startswith(b"HTTP/1.1 101") and accept in response
+
+
+def _is_process_alive(pid):
+    # type: (int) -> bool
+    if sys.platform == "win32":
+        # No cheap way to check it without extra dependencies, rely on server's
+        # idle timeout to clean up after crashed clients
+        return True
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
+
+
+def _terminate(pid):
+    # type: (int) -> None
+    try:
+        if sys.platform == "win32":
+            Popen(["taskkill", "/F", "/T", "/PID", str(pid)])  # nosec
+        else:
+            import signal
+
+            os.kill(pid, signal.SIGTERM)
+    except OSError:
+        pass
+
+
+def _makedirs(path):
+    # type: (str) -> None
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+
+def _remove(path):
+    # type: (str) -> None
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _FileLock(object):
+    """Exclusive inter-process lock of a file."""
+
+    def __init__(self, path):
+        # type: (str) -> None
+        self._path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self._path, "a+")
+        if sys.platform == "win32":
+            import msvcrt
+
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except (IOError, OSError):  # LK_LOCK gives up after 10 seconds
+                    pass
+        else:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if sys.platform == "win32":
+            import msvcrt
+
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()  # releases flock
+        self._file = None
@@ -24,6 +24,7 @@ from applitools.common.ultrafastgrid import (
     ScreenOrientation,
     VisualGridOption,
 )
+from applitools.selenium.schema import marshal_configuration
 
 
 def test_config_envs():
@@ -198,6 +199,86 @@ def test_config_cloning():
     assert id(conf.visual_grid_options[0]) != id(cloned_conf.visual_grid_options[0])
 
 
+def test_config_clone_shares_nested_values_until_accessed():
+    conf = SeleniumConfiguration().add_property("hello", "world")
+    conf.add_browser(200, 400, BrowserType.EDGE_CHROMIUM)
+
+    cloned_conf = conf.clone()
+
+    for name in ("batch", "properties", "default_match_settings", "browsers_info"):
+        assert vars(conf)[name] is vars(cloned_conf)[name]
+    cloned_conf.add_property("cloned", "value")
+    cloned_conf.add_browser(300, 400, BrowserType.CHROME)
+    cloned_conf.set_match_level(MatchLevel.LAYOUT)
+    conf.batch.name = "Original"
+    assert conf.properties == [{"name": "hello", "value": "world"}]
+    assert len(cloned_conf.properties) == 2
+    assert len(conf.browsers_info) == 1 and len(cloned_conf.browsers_info) == 2
+    assert conf.match_level is None
+    assert cloned_conf.batch.name is None
+
+
+def test_config_clone_isolates_values_referenced_before_clone():
+    conf = SeleniumConfiguration().add_property("hello", "world")
+    batch, properties = conf.batch, conf.properties
+    match_settings = conf.default_match_settings
+
+    cloned_conf = conf.clone()
+    batch.name = "Changed"
+    properties.append({"name": "added", "value": "later"})
+    match_settings.ignore_caret = True
+
+    assert conf.batch is batch and conf.batch.name == "Changed"
+    assert conf.properties is properties and len(conf.properties) == 2
+    assert conf.default_match_settings is match_settings and conf.ignore_caret
+    assert cloned_conf.batch.name is None
+    assert cloned_conf.properties == [{"name": "hello", "value": "world"}]
+    assert cloned_conf.ignore_caret is None
+
+
+def test_config_clone_isolates_values_passed_to_constructor():
+    batch = BatchInfo("Batch")
+    conf = SeleniumConfiguration(batch=batch)
+
+    cloned_conf = conf.clone()
+    batch.name = "Changed"
+
+    assert conf.batch is batch
+    assert cloned_conf.batch.name == "Batch"
+    assert (
+        vars(conf)["default_match_settings"]
+        is vars(cloned_conf)["default_match_settings"]
+    )
+
+
+def test_config_clone_marshaling_reads_shared_values():
+    conf = SeleniumConfiguration(app_name="App", test_name="Test")
+    conf.add_property("hello", "world")
+
+    cloned_conf = conf.clone()
+    marshaled = marshal_configuration(cloned_conf)
+
+    assert vars(conf)["properties"] is vars(cloned_conf)["properties"]
+    assert marshaled == marshal_configuration(conf)
+    assert marshaled["open"]["properties"] == [{"name": "hello", "value": "world"}]
+
+
+def test_config_clone_match_settings_getters_read_shared_values():
+    conf = SeleniumConfiguration().set_match_level(MatchLevel.LAYOUT)
+
+    cloned_conf = conf.clone()
+    values = cloned_conf.match_level, cloned_conf.ignore_caret, cloned_conf.use_dom
+    shared = vars(conf)["default_match_settings"]
+
+    assert values == (MatchLevel.LAYOUT, None, None)
+    assert vars(cloned_conf)["default_match_settings"] is shared
+
+    cloned_conf.set_match_level(MatchLevel.STRICT)
+
+    assert vars(cloned_conf)["default_match_settings"] is not shared
+    assert conf.match_level is MatchLevel.LAYOUT
+
+
 def test_proxy_settings_from_host():
     ps = ProxySettings("localhost")
 
@@ -1,14 +1,29 @@
-from itertools import chain
+import copy
+import pickle
+from itertools import chain, combinations
 
+import attr
 import pytest
 
-from applitools.common import CoordinatesType, Point, RectangleSize, Region
+from applitools.common import CoordinatesType, Point, RectangleSize, Region, geometry
 from applitools.common.geometry import (
+    FrozenPoint,
+    FrozenRectangle,
+    FrozenRectangleSize,
+    FrozenRegion,
     Rectangle,
+    RegionIndex,
+    RegionSet,
     SubregionForStitching,
     overlapping_tiles_from_rectangle,
     tiles_from_rectangle,
 )
+from applitools.common.match import (
+    FloatingBounds,
+    FloatingMatchSettings,
+    FrozenFloatingMatchSettings,
+)
+from applitools.core.extract_text import TextRegion
 
 
 def flatten(*lists):
@@ -98,3 +113,198 @@ def test_not_accessible_attr():
         r["someattr"]
     with pytest.raises(IndexError):
         r[6]
+
+
+REGIONS = [
+    Region(0, 0, 10, 10),
+    Region(5, 5, 10, 10),
+    Region(20, 0, 5, 5),
+    Region(-5, 8, 40, 2),
+    Region(10, 10, 0, 0),
+]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def region_set_backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(geometry, "_numpy", lambda: None)
+
+
+@pytest.mark.usefixtures("region_set_backend")
+@pytest.mark.parametrize("other", [Region(5, 5, 10, 10), Region(30, 30, 1, 1)])
+def test_region_set_matches_region_methods(other):
+    region_set = RegionSet(REGIONS)
+
+    assert list(region_set) == REGIONS
+    assert region_set.overlaps(other) == [r.overlaps(other) for r in REGIONS]
+    assert region_set.contains(other) == [r.contains(other) for r in REGIONS]
+    assert region_set.contained_in(other) == [other.contains(r) for r in REGIONS]
+    assert list(region_set.intersect(other)) == [
+        r.intersect(other) if r.overlaps(other) else Region.EMPTY() for r in REGIONS
+    ]
+    assert list(region_set.offset(3, -2)) == [r.offset(3, -2) for r in REGIONS]
+    assert list(region_set.scale(1.5)) == [r.scale(1.5) for r in REGIONS]
+
+
+@pytest.mark.usefixtures("region_set_backend")
+def test_region_set_clip_and_select():
+    region_set = RegionSet(REGIONS, CoordinatesType.CONTEXT_RELATIVE)
+
+    clipped = region_set.clip(Region(0, 0, 12, 12))
+
+    assert clipped.coordinates_type is CoordinatesType.CONTEXT_RELATIVE
+    assert clipped.tolist() == [[0, 0, 10, 10], [5, 5, 7, 7], [0, 8, 12, 2]]
+    assert region_set.contains(Point(6, 6)) == [True, True, False, False, False]
+    assert region_set.select(region_set.contains(Point(6, 6))) == region_set[:2]
+    assert len(RegionSet().clip(Region(0, 0, 1, 1))) == 0
+
+
+@pytest.mark.usefixtures("region_set_backend")
+def test_region_set_from_columns():
+    region_set = RegionSet.from_columns([1.4, 2], [3, 4], [5, 6], [7, 8.6])
+
+    assert region_set == RegionSet([(1, 3, 5, 7), (2, 4, 6, 9)])
+    assert region_set[-1] == Region(2, 4, 6, 9)
+    with pytest.raises(IndexError):
+        region_set[2]
+
+
+def _covered(regions):
+    return {
+        (x, y)
+        for r in regions
+        for x in range(r.left, r.right)
+        for y in range(r.top, r.bottom)
+    }
+
+
+@pytest.mark.usefixtures("region_set_backend")
+def test_region_set_coalesced():
+    region_set = RegionSet(
+        [
+            (0, 0, 10, 10),
+            (10, 0, 10, 10),  # adjacent
+            (0, 0, 10, 10),  # duplicate
+            (0, 10, 20, 5),  # adjacent below
+            (50, 50, 20, 2),  # cross, its union takes three regions
+            (59, 45, 2, 12),
+            (100, 100, 0, 5),  # empty
+        ],
+        CoordinatesType.CONTEXT_RELATIVE,
+    )
+
+    coalesced = region_set.coalesced()
+
+    assert coalesced.coordinates_type is CoordinatesType.CONTEXT_RELATIVE
+    assert coalesced.tolist() == [
+        [0, 0, 20, 15],
+        [50, 50, 20, 2],
+        [59, 45, 2, 12],
+        [100, 100, 0, 5],
+    ]
+    assert len(RegionSet().coalesced()) == 0
+
+
+def test_region_set_coalesced_covers_same_area():
+    overlapping = [Region(i % 7 * 3, i // 7 * 4, 5, 6) for i in range(30)]
+    overlapping += [Region(40, 0, 3, 3), Region(41, 1, 4, 4), Region(44, 3, 2, 2)]
+
+    coalesced = RegionSet(overlapping).coalesced()
+
+    assert _covered(coalesced) == _covered(overlapping)
+    assert len(coalesced) < len(overlapping)
+
+
+INDEXED = [Region(i % 10 * 7, i // 10 * 5, 6, 4) for i in range(100)] + [
+    Region(20, 10, 0, 0),  # empty
+    Region(0, 0, 1000, 1000),  # spans too many cells to be in buckets
+    TextRegion(30, 30, 15, 3, "text"),
+]
+
+
+@pytest.mark.parametrize("cell_size", [None, 1, 10, 1000])
+@pytest.mark.parametrize(
+    "other",
+    [Region(20, 10, 15, 12), Region(13, 9, 0, 0), Region(-5, -5, 5, 5)],
+    ids=["region", "point", "touching"],
+)
+def test_region_index_matches_region_methods(cell_size, other):
+    index = RegionIndex(INDEXED, cell_size)
+    regions = [Region(r.left, r.top, r.width, r.height) for r in INDEXED]
+
+    assert len(index) == len(INDEXED)
+    assert index.intersecting(other) == [
+        item for item, r in zip(INDEXED, regions) if r.overlaps(other)
+    ]
+    assert index.containing(other) == [
+        item for item, r in zip(INDEXED, regions) if r.contains(other)
+    ]
+    assert index.containing(Point(other.x, other.y)) == [
+        item for item, r in zip(INDEXED, regions) if r.contains(other.location)
+    ]
+    assert index.contained_in(other) == [
+        item for item, r in zip(INDEXED, regions) if other.contains(r)
+    ]
+
+
+def test_region_index_intersecting_pairs():
+    items = INDEXED[::7]
+    index = RegionIndex(items)
+    others = [Region(10, 10, 30, 2), Region(500, 500, 1, 1)]
+
+    def overlap(a, b):
+        return Region(a.left, a.top, a.width, a.height).overlaps(b)
+
+    assert index.intersecting_pairs() == [
+        (a, b) for a, b in combinations(items, 2) if overlap(a, b)
+    ]
+    assert index.intersecting_pairs(others) == [
+        (item, other) for other in others for item in items if overlap(item, other)
+    ]
+    assert RegionIndex().intersecting_pairs() == []
+
+
+@pytest.mark.parametrize(
+    "frozen,mutable",
+    [
+        (FrozenPoint(1, 2.4), Point(1, 2)),
+        (FrozenRectangleSize(3, 4), RectangleSize(3, 4)),
+        (FrozenRectangle(1, 2, 3, 4), Rectangle(1, 2, 3, 4)),
+        (
+            FrozenRegion(1, 2, 3, 4, "CONTEXT_RELATIVE"),
+            Region(1, 2, 3, 4, CoordinatesType.CONTEXT_RELATIVE),
+        ),
+        (
+            FrozenFloatingMatchSettings(Region(1, 2, 3, 4), FloatingBounds(5, 6)),
+            FloatingMatchSettings(Region(1, 2, 3, 4), FloatingBounds(5, 6)),
+        ),
+    ],
+    ids=lambda o: type(o).__name__,
+)
+def test_frozen_geometry(frozen, mutable):
+    name = attr.fields(type(mutable))[-1].name
+
+    assert [frozen[i] for i in range(2)] == [mutable[i] for i in range(2)]
+    assert getattr(frozen, name) == getattr(mutable, name)
+    assert not hasattr(frozen, "__dict__") and not hasattr(mutable, "__dict__")
+    assert hash(frozen) == hash(copy.copy(frozen))
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    with pytest.raises(attr.exceptions.FrozenInstanceError):
+        setattr(frozen, name, 0)
+    with pytest.raises(attr.exceptions.FrozenInstanceError):
+        delattr(frozen, name)
+    setattr(mutable, name, getattr(frozen, name))
+
+
+def test_frozen_geometry_operations_return_mutable_objects():
+    moved = FrozenRegion(1, 2, 3, 4).offset(1, 1)
+
+    moved.left = 0
+
+    assert moved == Region(0, 3, 3, 4)
+    assert FrozenPoint(1, 2) == Point(1, 2)
+    assert {FrozenRegion(1, 2, 3, 4), FrozenRegion(1, 2, 3, 4)} == {
+        FrozenRegion(1, 2, 3, 4)
+    }
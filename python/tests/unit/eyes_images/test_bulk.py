@@ -0,0 +1,174 @@
+import io
+import json
+import os
+from xml.etree import ElementTree
+
+import pytest
+from six import PY2
+
+from applitools.images.__main__ import main
+from applitools.images.bulk import (
+    ERROR,
+    BulkChecker,
+    BulkStep,
+    BulkTest,
+    Checkpoint,
+    JsonLinesReport,
+    JUnitReport,
+    NamePattern,
+    read_manifest,
+    scan_directory,
+)
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n fake image data"
+
+
+@pytest.fixture
+def images(tmp_path):
+    for path in ("login/1 empty.png", "login/2 filled.png", "cart/a/b.jpg"):
+        path = tmp_path.joinpath("app", *path.split("/"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(PNG_BYTES)
+    tmp_path.joinpath("app", "notes.txt").write_text("not an image")
+    tmp_path.joinpath("app", "root.png").write_bytes(PNG_BYTES)
+    return str(tmp_path / "app")
+
+
+@pytest.fixture
+def server():
+    from benchmarks.fake_universal_server import FakeUniversalServer
+
+    class FailingServer(FakeUniversalServer):
+        """Fails to open eyes of the tests named in failing."""
+
+        def respond(self, name, payload):
+            if name == "EyesManager.openEyes":
+                test_name = payload["config"]["open"]["testName"]
+                self.opened.append(test_name)
+                if test_name in self.failing:
+                    raise RuntimeError("Failed to open " + test_name)
+            return super(FailingServer, self).respond(name, payload)
+
+    with FailingServer(steps_per_test=2) as server, server.installed():
+        server.opened, server.failing = [], set()
+        yield server
+
+
+def test_name_pattern():
+    pattern = NamePattern("{app}/{test}/{step}")
+
+    assert pattern.names("a/b/c/d.png") == {"app": "a", "test": "b/c", "step": "d"}
+    assert pattern.names("a/b.png") is None
+    assert NamePattern("{test}").names("a/b.png") == {"test": "a/b", "step": "b"}
+
+
+@pytest.mark.parametrize("pattern", ["{step}", "{test}/{unknown}", "{test"])
+def test_name_pattern_invalid(pattern):
+    with pytest.raises(ValueError):
+        NamePattern(pattern)
+
+
+def test_scan_directory(images):
+    tests, unmatched = scan_directory(images, NamePattern("{test}/{step}"))
+
+    assert [(t.app_name, t.test_name, [s.name for s in t.steps]) for t in tests] == [
+        ("app", "cart/a", ["b"]),
+        ("app", "login", ["1 empty", "2 filled"]),
+    ]
+    assert unmatched == [os.path.join(images, "root.png")]
+
+
+def test_read_manifest(images):
+    manifest = os.path.join(images, "manifest.jsonl")
+    with io.open(manifest, "w", encoding="utf-8") as f:
+        f.write("# comment\nroot.png\n")
+        f.write('{"path": "login/1 empty.png", "app": "App", "step": "Empty"}\n')
+
+    tests, unmatched = read_manifest(manifest, NamePattern("{test}/{step}"), "Default")
+
+    assert tests == [
+        BulkTest(
+            "App",
+            "login",
+            [BulkStep(os.path.join(images, "login/1 empty.png"), "Empty")],
+        )
+    ]
+    assert unmatched == [os.path.join(images, "root.png")]
+
+
+@pytest.mark.skipif(PY2, reason="Fake server is python3 only")
+def test_run_reports_and_resumes_from_checkpoint(server, images, tmp_path):
+    tests, _ = scan_directory(images, NamePattern("{test}/{step}"))
+    checkpoint_path = str(tmp_path / "checkpoint.jsonl")
+    server.failing.add("login")
+    checkpoint = Checkpoint(checkpoint_path)
+    records = BulkChecker(workers=2).run(tests, checkpoint=checkpoint)
+    checkpoint.close()
+    assert sorted((r["test"], r["status"]) for r in records) == [
+        ("cart/a", "Passed"),
+        ("login", ERROR),
+    ]
+
+    server.opened, server.failing = [], set()
+    stream = io.StringIO()
+    checkpoint = Checkpoint(checkpoint_path)
+    records = BulkChecker().run(tests, [JsonLinesReport(stream)], checkpoint)
+    checkpoint.close()
+
+    assert server.opened == ["login"]  # only the failed test is checked again
+    assert [(r["test"], r["status"]) for r in records] == [
+        ("cart/a", "Passed"),
+        ("login", "Passed"),
+    ]
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == records
+
+
+def test_checkpoint_ignores_interrupted_line(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text('{"app": "A", "test": "T", "status": "Passed"}\n{"app": ')
+
+    checkpoint = Checkpoint(str(path))
+    checkpoint.add({"app": "A", "test": "U", "status": "Passed"})
+    checkpoint.close()
+
+    assert checkpoint.is_finished(BulkTest("A", "T"))
+    assert list(Checkpoint(str(path)).records) == [("A", "T"), ("A", "U")]
+
+
+def test_junit_report():
+    stream = io.StringIO()
+    report = JUnitReport(stream)
+    report.add({"app": "A", "test": "ok", "status": "Passed", "duration": 1})
+    report.add(
+        {"app": "A", "test": "err", "status": ERROR, "duration": 1, "error": "<"}
+    )
+    report.add(
+        {
+            "app": "A",
+            "test": "diff",
+            "status": "Unresolved",
+            "duration": 1,
+            "mismatches": 2,
+            "url": "https://eyes/&",
+        }
+    )
+    report.close()
+
+    suite = ElementTree.fromstring(stream.getvalue().encode("utf-8"))
+    cases = suite.findall("testcase")
+    assert [c.get("name") for c in cases] == ["ok", "err", "diff"]
+    assert cases[1].find("error").get("message") == "<"
+    assert cases[2].find("failure").text == "https://eyes/&"
+
+
+@pytest.mark.skipif(PY2, reason="Fake server is python3 only")
+def test_main(server, images, tmp_path):
+    junit, jsonl = str(tmp_path / "junit.xml"), str(tmp_path / "results.jsonl")
+
+    code = main([images, "--app-name", "App", "--junit", junit, "--jsonl", jsonl])
+
+    assert code == 0
+    assert sorted(server.opened) == ["cart/a", "login"]
+    assert len(ElementTree.parse(junit).findall("testcase")) == 2
+    with open(jsonl) as f:
+        assert {json.loads(line)["app"] for line in f} == {"App"}
@@ -0,0 +1,98 @@
+import os
+from base64 import b64decode
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from applitools.common import Region
+from applitools.common.selenium import ImageTransfer
+from applitools.images import Target
+from applitools.images.encoding import cropped_check_settings, transferred_image
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n fake image data"
+
+
+def test_target_keeps_in_memory_image_unencoded():
+    image = Image.new("RGB", (10, 10))
+
+    assert Target.image(image).values.image is image
+    assert Target.image(PNG_BYTES).values.image is PNG_BYTES
+
+
+def test_target_invalid_image_type():
+    with pytest.raises(ValueError):
+        Target.image(1)
+
+
+@pytest.mark.parametrize("image_transfer", [None, ImageTransfer.BASE64])
+def test_transferred_image_base64(image_transfer):
+    with transferred_image(PNG_BYTES, image_transfer) as image:
+        assert b64decode(image) == PNG_BYTES
+
+
+def test_transferred_image_shared_memory_bytes():
+    with transferred_image(PNG_BYTES, ImageTransfer.SHARED_MEMORY) as path:
+        with open(path, "rb") as f:
+            assert f.read() == PNG_BYTES
+
+    assert not os.path.exists(path)
+
+
+def test_transferred_image_shared_memory_pil_image():
+    with transferred_image(
+        Image.new("RGB", (10, 20)), ImageTransfer.SHARED_MEMORY
+    ) as path:
+        assert Image.open(path).size == (10, 20)
+
+    assert not os.path.exists(path)
+
+
+def test_transferred_image_shared_memory_removed_on_error():
+    with pytest.raises(RuntimeError):
+        with transferred_image(PNG_BYTES, ImageTransfer.SHARED_MEMORY) as path:
+            raise RuntimeError
+
+    assert not os.path.exists(path)
+
+
+def test_transferred_image_path_is_passed_as_is():
+    with transferred_image("image.png", ImageTransfer.SHARED_MEMORY) as image:
+        assert image == "image.png"
+
+
+def test_cropped_check_settings_crops_pil_image():
+    image = Image.new("RGB", (100, 50))
+    check_settings = Target.region(image, Region(10, 20, 30, 40)).ignore(
+        Region(1, 2, 3, 4)
+    )
+
+    cropped = cropped_check_settings(check_settings)
+
+    assert cropped.values.image.size == (30, 30)  # clipped by the image bottom
+    assert cropped.values.target_region is None
+    assert cropped.values.ignore_regions == check_settings.values.ignore_regions
+    assert check_settings.values.image is image
+
+
+def test_cropped_check_settings_crops_png_bytes():
+    stream = BytesIO()
+    Image.new("RGB", (100, 50)).save(stream, format="PNG")
+
+    cropped = cropped_check_settings(
+        Target.region(stream.getvalue(), Region(10.4, 20, 30, 10))
+    )
+
+    assert cropped.values.image.size == (30, 10)
+
+
+@pytest.mark.parametrize(
+    "check_settings",
+    [
+        Target.region("image.png", Region(0, 0, 1, 1)),
+        Target.image(PNG_BYTES),
+        Target.region(Image.new("RGB", (10, 10)), Region(20, 20, 5, 5)),
+    ],
+)
+def test_cropped_check_settings_keeps_not_croppable_images(check_settings):
+    assert cropped_check_settings(check_settings) is check_settings
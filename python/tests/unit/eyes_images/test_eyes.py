@@ -0,0 +1,125 @@
+import os
+from base64 import b64decode
+from contextlib import contextmanager
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from six import PY2
+
+from applitools.common import Region
+from applitools.common.selenium import ImageTransfer
+from applitools.images import Eyes, OCRRegion, Target
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n fake image data"
+
+pytestmark = pytest.mark.skipif(PY2, reason="Fake server is python3 only")
+
+
+@pytest.fixture
+def server():
+    from benchmarks.fake_universal_server import FakeUniversalServer
+
+    class NamingServer(FakeUniversalServer):
+        """Responds to checks with the step name as window id."""
+
+        def respond(self, name, payload):
+            if name == "Eyes.check":
+                self.transferred.append(payload["target"]["image"])
+                self.settings.append(payload["settings"])
+                window_id = payload["settings"].get("name", "")
+                return [{"asExpected": True, "windowId": window_id}]
+            if name == "Eyes.extractText":
+                self.transferred.append(payload["target"]["image"])
+                return ["text"] * len(payload["settings"])
+            return super(NamingServer, self).respond(name, payload)
+
+    with NamingServer() as server, server.installed():
+        server.transferred, server.settings = [], []
+        yield server
+
+
+def test_check_many_returns_results_in_order(server):
+    eyes = Eyes()
+    eyes.open("App", "Test")
+
+    results = eyes.check_many(
+        Target.image(PNG_BYTES).with_name("Step {}".format(i)) for i in range(5)
+    )
+    eyes.close(False)
+
+    assert [r.window_id for r in results] == ["Step {}".format(i) for i in range(5)]
+    assert server.commands["Eyes.check"] == 5
+
+
+def test_check_many_removes_shared_memory_images(server):
+    eyes = Eyes()
+    eyes.configure.set_image_transfer(ImageTransfer.SHARED_MEMORY)
+    eyes.open("App", "Test")
+
+    results = eyes.check_many([Target.image(PNG_BYTES), Target.image(PNG_BYTES)])
+    eyes.close(False)
+
+    assert all(r.as_expected for r in results)
+    assert len(server.transferred) == 2
+    assert not any(os.path.exists(path) for path in server.transferred)
+
+
+def test_check_many_releases_transferred_images_on_error(server, monkeypatch):
+    eyes = Eyes()
+    eyes.open("App", "Test")
+    released = []
+
+    transfer = eyes._transferred_image
+
+    @contextmanager
+    def transferred_image(image):
+        try:
+            with transfer(image) as transferred:
+                yield transferred
+        except Exception as exc:
+            released.append(exc)
+            raise
+
+    def check_settings():
+        yield Target.image(PNG_BYTES)
+        yield Target.image(PNG_BYTES)
+        raise ValueError("bad checkpoint")
+
+    monkeypatch.setattr(eyes, "_transferred_image", transferred_image)
+
+    with pytest.raises(ValueError):
+        eyes.check_many(check_settings())
+    eyes.abort()
+
+    assert [type(e) for e in released] == [ValueError, ValueError]
+    assert "Eyes.check" not in server.commands
+
+
+def test_check_crops_image_locally(server):
+    eyes = Eyes()
+    eyes.configure.set_crop_images_locally(True)
+    eyes.open("App", "Test")
+
+    eyes.check(
+        "Step", Target.region(Image.new("RGB", (1000, 1000)), Region(1, 2, 3, 4))
+    )
+    eyes.close(False)
+
+    assert Image.open(BytesIO(b64decode(server.transferred[0]))).size == (3, 4)
+    assert "region" not in server.settings[0]
+
+
+def test_extract_text_of_image_array(server):
+    numpy = pytest.importorskip("numpy")
+    array = numpy.zeros((10, 10, 3), numpy.uint8)
+    eyes = Eyes()
+    eyes.open("App", "Test")
+
+    texts = eyes.extract_text(
+        OCRRegion(array, Region(0, 0, 5, 5)), OCRRegion(array, Region(5, 5, 5, 5))
+    )
+    eyes.close(False)
+
+    assert texts == ["text", "text"]
+    assert len(server.transferred) == 1
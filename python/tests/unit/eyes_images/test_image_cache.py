@@ -0,0 +1,122 @@
+import os
+from threading import Event, Thread
+from time import sleep
+
+import pytest
+from mock import Mock
+from PIL import Image
+
+from applitools.common.selenium import ImageTransfer
+from applitools.images import image_cache
+from applitools.images.encoding import transferred_image
+from applitools.images.image_cache import ImageCache, image_key
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n fake image data"
+
+
+def test_least_recently_used_entries_are_evicted():
+    on_evict = Mock()
+    cache = ImageCache(10, on_evict)
+    cache.get_or_encode("a", lambda: ("A", 4))
+    cache.get_or_encode("b", lambda: ("B", 4))
+    cache.get_or_encode("a", Mock())  # a is the most recently used now
+
+    cache.get_or_encode("c", lambda: ("C", 4))
+
+    on_evict.assert_called_once_with("B")
+    assert (len(cache), cache.size) == (2, 8)
+
+
+def test_pinned_entries_are_not_evicted():
+    on_evict = Mock()
+    cache = ImageCache(4, on_evict)
+
+    with cache.pinned("a", lambda: ("A", 4)) as a:
+        assert cache.get_or_encode("b", lambda: ("B", 4)) == "B"
+        assert a == "A"
+        on_evict.assert_called_once_with("B")
+
+    assert (len(cache), cache.size) == (1, 4)
+
+
+def test_concurrent_users_wait_for_one_encoding():
+    cache = ImageCache(10)
+    encoding, encoded = Event(), Event()
+
+    def encode():
+        encoding.set()
+        encoded.wait(1)
+        return "A", 4
+
+    encode = Mock(side_effect=encode)
+    results = []
+    threads = [
+        Thread(target=lambda: results.append(cache.get_or_encode("a", encode)))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    encoding.wait(1)
+    threads[1].start()
+    sleep(0.01)  # the second user is waiting for the encoding
+    encoded.set()
+    for thread in threads:
+        thread.join(1)
+
+    assert results == ["A", "A"]
+    encode.assert_called_once_with()
+
+
+def test_failed_encoding_is_retried():
+    cache = ImageCache(10)
+
+    with pytest.raises(ValueError):
+        cache.get_or_encode("a", Mock(side_effect=ValueError))
+
+    assert cache.get_or_encode("a", lambda: ("A", 4)) == "A"
+
+
+def test_image_key_depends_on_content():
+    image = Image.new("P", (2, 2))
+    other_palette = image.copy()
+    other_palette.putpalette([255, 0, 0] * 256)
+
+    assert image_key(image) == image_key(image.copy())
+    assert image_key(image) != image_key(other_palette)
+    assert image_key(image) != image_key(image.convert("RGB"))
+    assert image_key(PNG_BYTES) == image_key(bytes(PNG_BYTES))
+
+
+def test_base64_encoded_image_is_not_cached_by_default():
+    with transferred_image(PNG_BYTES):
+        pass
+
+    assert len(image_cache.encoded_images) == 0
+
+
+def test_base64_encoded_image_is_cached(monkeypatch):
+    monkeypatch.setattr(image_cache.encoded_images, "max_size", 1024)
+    try:
+        with transferred_image(PNG_BYTES) as first:
+            pass
+        with transferred_image(bytes(bytearray(PNG_BYTES))) as second:
+            pass
+    finally:
+        image_cache.encoded_images.clear()
+
+    assert first is second
+
+
+def test_content_addressed_image_file_is_written_once():
+    image = Image.new("RGB", (10, 20))
+    try:
+        with transferred_image(image, ImageTransfer.CONTENT_ADDRESSED) as first:
+            assert Image.open(first).size == (10, 20)
+        with transferred_image(image.copy(), ImageTransfer.CONTENT_ADDRESSED) as second:
+            pass
+
+        assert first == second
+        assert os.path.exists(first)
+    finally:
+        image_cache.image_files.clear()
+
+    assert not os.path.exists(first)
@@ -0,0 +1,77 @@
+from base64 import b64decode
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from applitools.common import Region
+from applitools.images import Target
+from applitools.images.encoding import cropped_check_settings, transferred_image
+from applitools.images.image_cache import image_key
+
+numpy = pytest.importorskip("numpy")
+png = pytest.importorskip("applitools.images.png")
+
+
+def image_array(height, width, channels):
+    shape = (height, width, channels) if channels else (height, width)
+    return numpy.random.RandomState(0).randint(0, 256, shape).astype(numpy.uint8)
+
+
+@pytest.mark.parametrize("channels", [0, 2, 3, 4])
+@pytest.mark.parametrize("threads", [1, 4])
+def test_encode_png_is_lossless(monkeypatch, channels, threads):
+    monkeypatch.setattr(png, "MIN_STRIP_SIZE", 1024)  # several strips
+    array = image_array(97, 61, channels)
+
+    encoded = png.encode_png(array, 1, threads)
+
+    assert (numpy.asarray(Image.open(BytesIO(encoded))) == array).all()
+
+
+def test_encode_png_compression_level():
+    array = numpy.tile(numpy.arange(256, dtype=numpy.uint8), (256, 1))
+
+    fast = png.encode_png(array, 0)
+    best = png.encode_png(array, 9)
+
+    assert len(best) < len(fast)
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        numpy.zeros((10, 10, 3), numpy.float32),
+        numpy.zeros((10, 10, 5), numpy.uint8),
+        numpy.zeros((0, 10, 3), numpy.uint8),
+        numpy.zeros(10, numpy.uint8),
+    ],
+)
+def test_target_invalid_image_array(array):
+    with pytest.raises(ValueError):
+        Target.image(array)
+
+
+def test_transferred_image_array():
+    array = image_array(10, 20, 3)
+
+    with transferred_image(Target.image(array).values.image) as image:
+        decoded = Image.open(BytesIO(b64decode(image)))
+        assert (numpy.asarray(decoded) == array).all()
+
+
+def test_image_key_of_array_view():
+    array = image_array(20, 20, 3)
+
+    assert image_key(array[5:10, 5:10]) == image_key(array[5:10, 5:10].copy())
+    assert image_key(array[5:10, 5:10]) != image_key(array[5:10, 6:11])
+
+
+def test_cropped_check_settings_crops_array():
+    array = image_array(100, 100, 4)
+    check_settings = Target.region(array, Region(10, 20, 30, 40))
+
+    values = cropped_check_settings(check_settings).values
+
+    assert values.target_region is None
+    assert (values.image == array[20:60, 10:40]).all()
@@ -0,0 +1,323 @@
+import asyncio
+from threading import Event
+
+import pytest
+from websocket import ABNF
+
+from applitools.common import EyesError, MatchResult
+from applitools.common.errors import USDKFailure
+from applitools.common.selenium import Configuration
+from applitools.images import AsyncEyes as AsyncImagesEyes
+from applitools.images import Target as ImagesTarget
+from applitools.selenium import (
+    AsyncClassicRunner,
+    AsyncEyes,
+    AsyncTestResultsHandle,
+    Target,
+    async_eyes,
+)
+from applitools.selenium.async_command_executor import (
+    AsyncCommandExecutor,
+    AsyncUSDKConnection,
+)
+
+
+class FakeAsyncConnection(object):
+    def __init__(self, results):
+        self.results = results
+        self.commands = []
+
+    def notification(self, name, payload):
+        self.commands.append((name, payload))
+
+    async def command(self, name, payload, wait_result, wait_timeout):
+        self.commands.append((name, payload))
+        await asyncio.sleep(0)
+        return {"payload": {"result": self.results.get(name)}}
+
+
+@pytest.fixture
+def connection():
+    return FakeAsyncConnection(
+        {
+            "Core.makeManager": {"applitools-ref-id": "manager"},
+            "EyesManager.openEyes": {"applitools-ref-id": "eyes"},
+            "Eyes.check": [{"asExpected": True, "windowId": "1"}],
+            "Eyes.close": [{"status": "Passed", "name": "Test"}],
+            "EyesManager.closeManager": {"results": [], "passed": 0},
+        }
+    )
+
+
+@pytest.fixture
+def runner(connection):
+    runner = AsyncClassicRunner()
+    runner._commands = AsyncCommandExecutor(connection)
+    return runner
+
+
+def test_async_runner_get_server_info():
+    server_info = asyncio.run(AsyncClassicRunner.get_server_info())
+
+    assert server_info.logs_dir
+
+
+def test_async_eyes_check(runner, connection):
+    eyes = AsyncEyes(runner)
+
+    async def scenario():
+        await eyes.open(None, "App", "Test")
+        match_results = await asyncio.gather(
+            eyes.check("Step 1", Target.window()),
+            eyes.check("Step 2", Target.window()),
+        )
+        test_results = await eyes.close(False)
+        summary = await runner.get_all_test_results()
+        return match_results, test_results, summary
+
+    match_results, test_results, summary = asyncio.run(scenario())
+
+    assert match_results == [MatchResult(True, "1"), MatchResult(True, "1")]
+    assert test_results.is_passed
+    assert len(summary) == 0
+    assert [name for name, _ in connection.commands] == [
+        "Core.makeManager",
+        "EyesManager.openEyes",
+        "Eyes.check",
+        "Eyes.check",
+        "Eyes.close",
+        "EyesManager.closeManager",
+    ]
+
+
+def test_async_eyes_set_viewport_size(monkeypatch, connection):
+    monkeypatch.setattr(
+        AsyncCommandExecutor,
+        "get_instance",
+        classmethod(lambda cls, *_: AsyncCommandExecutor(connection)),
+    )
+    monkeypatch.setattr(async_eyes, "marshal_webdriver_ref", lambda _: "driver")
+
+    asyncio.run(AsyncEyes.set_viewport_size(None, {"width": 800, "height": 600}))
+
+    assert connection.commands == [
+        (
+            "Core.setViewportSize",
+            {"target": "driver", "size": {"width": 800, "height": 600}},
+        )
+    ]
+
+
+def test_async_eyes_close_async_handles_are_gathered(runner):
+    async def scenario():
+        handles = []
+        for close in ("close_async", "close_async", "abort_async"):
+            eyes = AsyncEyes(runner)
+            await eyes.open(None, "App", "Test")
+            handles.append(await getattr(eyes, close)())
+        return handles, await runner.gather(handles + [None])
+
+    handles, results = asyncio.run(scenario())
+
+    assert all(isinstance(h, AsyncTestResultsHandle) for h in handles)
+    assert [r.is_passed for r in results[:2]] == [True, True]
+    assert results[2:] == [None, None]  # abort has no results in the fake
+    assert not runner._pending_results
+
+
+def test_async_runner_gather_returns_exceptions():
+    async def scenario():
+        runner = AsyncClassicRunner()
+        failed = asyncio.get_running_loop().create_future()
+        failed.set_exception(USDKFailure("close failed", "stack"))
+        handle = AsyncTestResultsHandle(failed, Configuration())
+
+        with pytest.raises(USDKFailure):
+            await runner.gather([handle])
+        return failed, await runner.gather([handle, None], return_exceptions=True)
+
+    failed, results = asyncio.run(scenario())
+
+    assert results == [failed.exception(), None]
+
+
+def test_async_runner_resolved_handles_are_dropped_from_pending_results(runner):
+    async def scenario():
+        closed = asyncio.get_running_loop().create_future()
+        pending = asyncio.get_running_loop().create_future()
+        closed.set_result([])
+        closed_handle = AsyncTestResultsHandle(closed, Configuration())
+        pending_handle = AsyncTestResultsHandle(pending, Configuration())
+        runner._add_pending_results(closed_handle)
+        runner._add_pending_results(pending_handle)
+
+        assert await closed_handle.result() is None
+        with pytest.raises(asyncio.TimeoutError):
+            await pending_handle.result(0.01)
+        return pending
+
+    pending = asyncio.run(scenario())
+
+    assert list(runner._pending_results) == [pending]
+
+
+def test_async_runner_gather_times_out_without_cancelling_test():
+    async def scenario():
+        runner = AsyncClassicRunner()
+        pending = asyncio.get_running_loop().create_future()
+
+        with pytest.raises(EyesError, match="didn't finish in 0.01 seconds"):
+            await runner.gather(
+                [AsyncTestResultsHandle(pending, Configuration())], 0.01
+            )
+        return pending
+
+    assert not asyncio.run(scenario()).cancelled()
+
+
+def test_async_runner_iter_test_results_streams_closed_tests(runner, connection):
+    async def scenario():
+        for _ in range(2):
+            eyes = AsyncEyes(runner)
+            await eyes.open(None, "App", "Test")
+            await eyes.close_async()
+        streamed = []
+        async for container in runner.iter_test_results():
+            commands = [name for name, _ in connection.commands]
+            streamed.append((container, "EyesManager.closeManager" in commands))
+        return streamed
+
+    streamed = asyncio.run(scenario())
+
+    assert [(c.test_results.is_passed, closed) for c, closed in streamed] == [
+        (True, False),
+        (True, False),
+    ]
+    assert connection.commands[-1][0] == "EyesManager.closeManager"
+    assert not runner._pending_results
+
+
+def test_async_runner_iter_test_results_raises_first_failure(runner, connection):
+    async def scenario():
+        failed = asyncio.get_running_loop().create_future()
+        failed.set_exception(USDKFailure("close failed", "stack"))
+        pending = asyncio.get_running_loop().create_future()
+        runner._add_pending_results(AsyncTestResultsHandle(failed, Configuration()))
+        runner._add_pending_results(AsyncTestResultsHandle(pending, Configuration()))
+        async for _ in runner.iter_test_results():
+            pass
+
+    with pytest.raises(USDKFailure):
+        asyncio.run(scenario())
+    assert connection.commands[-1][0] == "EyesManager.closeManager"
+    assert not runner._pending_results
+
+
+def test_async_eyes_open_sends_user_test_id(runner, connection):
+    generated, configured = AsyncEyes(runner), AsyncEyes(runner)
+    configured.configure.user_test_id = "configured"
+
+    async def scenario():
+        await generated.open(None, "App", "Test")
+        await configured.open(None, "App", "Test")
+
+    asyncio.run(scenario())
+    opened = [p for n, p in connection.commands if n == "EyesManager.openEyes"]
+
+    assert opened[0]["config"]["open"]["userTestId"].startswith("Test--")
+    assert opened[1]["config"]["open"]["userTestId"] == "configured"
+    assert generated.configure.user_test_id is None
+
+
+def test_async_eyes_check_without_open(runner):
+    eyes = AsyncEyes(runner)
+
+    with pytest.raises(EyesError):
+        asyncio.run(eyes.check(Target.window()))
+
+
+def test_async_images_eyes_check(runner, connection):
+    eyes = AsyncImagesEyes(runner)
+
+    async def scenario():
+        await eyes.open("App", "Test")
+        return await eyes.check("Step", ImagesTarget.image("image.png"))
+
+    assert asyncio.run(scenario()) is True
+    assert connection.commands[-1][1]["target"] == {"image": "image.png"}
+    assert connection.commands[-1][1]["settings"]["name"] == "Step"
+
+
+def test_async_eyes_check_many(runner, connection):
+    eyes = AsyncEyes(runner)
+
+    async def scenario():
+        await eyes.open(None, "App", "Test")
+        return await eyes.check_many([Target.window(), None, "Step"])
+
+    assert asyncio.run(scenario()) == [MatchResult(True, "1")] * 3
+    checks = [payload for name, payload in connection.commands if name == "Eyes.check"]
+    assert len(checks) == 3
+    assert checks[2]["settings"]["name"] == "Step"
+
+
+def test_async_images_eyes_check_many_sends_checks_before_awaiting(runner):
+    class PipelinedConnection(FakeAsyncConnection):
+        in_flight = max_in_flight = 0
+
+        async def command(self, name, payload, wait_result, wait_timeout):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                return await super(PipelinedConnection, self).command(
+                    name, payload, wait_result, wait_timeout
+                )
+            finally:
+                self.in_flight -= 1
+
+    connection = PipelinedConnection(
+        {
+            "Core.makeManager": {"applitools-ref-id": "manager"},
+            "EyesManager.openEyes": {"applitools-ref-id": "eyes"},
+            "Eyes.check": [{"asExpected": True, "windowId": "1"}],
+        }
+    )
+    runner._commands = AsyncCommandExecutor(connection)
+    eyes = AsyncImagesEyes(runner)
+
+    async def scenario():
+        await eyes.open("App", "Test")
+        return await eyes.check_many(
+            [ImagesTarget.image("1.png"), ImagesTarget.image("2.png")]
+        )
+
+    assert asyncio.run(scenario()) == [MatchResult(True, "1")] * 2
+    assert connection.max_in_flight == 2
+    targets = [p["target"] for name, p in connection.commands if name == "Eyes.check"]
+    assert targets == [{"image": "1.png"}, {"image": "2.png"}]
+
+
+def test_async_connection_timed_out_command_is_evicted():
+    class FakeWebSocket(object):
+        def send(self, data):
+            pass
+
+        def recv_data(self):
+            return ABNF.OPCODE_CLOSE, self.closed.wait() and b""
+
+        def abort(self):
+            pass
+
+        def close(self):
+            self.closed.set()
+
+    websocket = FakeWebSocket()
+    websocket.closed = Event()
+    connection = AsyncUSDKConnection(websocket)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(connection.command("Eyes.check", {}, True, 0.01))
+
+    assert connection.in_flight == 0
+    assert connection.stats.timed_out_commands == 1
+    connection.close()
@@ -0,0 +1,133 @@
+import json
+import sys
+from concurrent.futures import TimeoutError
+from time import sleep
+
+import pytest
+from six import PY2
+from six.moves.queue import Queue
+from websocket import ABNF
+
+from applitools.selenium.command_executor import CommandExecutor
+from applitools.selenium.connection import NO_WAIT_KEY_PREFIX, USDKConnection
+
+
+class FakeWebSocket(object):
+    def __init__(self):
+        self.incoming = Queue()
+        self.sent = Queue()
+
+    def send(self, data):
+        self.sent.put(json.loads(data))
+
+    def recv_data(self):
+        return ABNF.OPCODE_TEXT, self.incoming.get()
+
+    def respond(self, key, result=None):
+        self.incoming.put(json.dumps({"key": key, "payload": {"result": result}}))
+
+    def abort(self):
+        pass
+
+    def close(self):
+        self.incoming.put("")
+
+
+@pytest.fixture
+def websocket():
+    return FakeWebSocket()
+
+
+@pytest.fixture
+def connection(websocket):
+    connection = USDKConnection(websocket)
+    yield connection
+    connection.close()
+
+
+def _wait_for_stats(connection, counter, value):
+    for _ in range(100):
+        if getattr(connection.stats, counter) == value:
+            return
+        sleep(0.01)
+    assert getattr(connection.stats, counter) == value
+
+
+def test_command_response(connection, websocket):
+    websocket.send = lambda data: websocket.incoming.put(
+        json.dumps({"key": json.loads(data)["key"], "payload": {"result": "ok"}})
+    )
+
+    response = connection.command("Server.getInfo", {}, True, 1)
+
+    assert response == {"key": response["key"], "payload": {"result": "ok"}}
+    assert connection.in_flight == 0
+
+
+def test_timed_out_command_is_evicted(connection, websocket):
+    with pytest.raises(TimeoutError):
+        connection.command("Eyes.check", {}, True, 0.01)
+
+    assert connection.in_flight == 0
+    assert connection.stats.timed_out_commands == 1
+
+    websocket.respond(websocket.sent.get()["key"])
+
+    _wait_for_stats(connection, "orphaned_responses", 1)
+    assert connection._receiver_thread.is_alive()
+
+
+def test_timed_out_checks_of_check_many_are_evicted(connection, websocket):
+    keys = []
+
+    def respond_to_first_check(data):
+        keys.append(json.loads(data)["key"])
+        if len(keys) == 1:
+            websocket.respond(keys[0], {"asExpected": True})
+
+    websocket.send = respond_to_first_check
+    commands = CommandExecutor(connection)
+
+    with pytest.raises(TimeoutError):
+        commands.eyes_check_many({}, [(None, {}), (None, {})], wait_timeout=0.05)
+
+    assert len(keys) == 2
+    assert connection.in_flight == 0
+    assert connection.stats.timed_out_commands == 1
+
+
+def test_async_command_response_resolves_future(connection, websocket):
+    future = connection.command_async("Eyes.close", {})
+
+    assert connection.in_flight == 1
+    websocket.respond(websocket.sent.get()["key"], "closed")
+
+    assert future.result(1)["payload"] == {"result": "closed"}
+    assert connection.in_flight == 0
+
+
+def test_fire_and_forget_command_is_not_registered(connection, websocket):
+    assert connection.command("Eyes.close", {}, False, 1) is None
+    assert connection.in_flight == 0
+
+    key = websocket.sent.get()["key"]
+    assert key.startswith(NO_WAIT_KEY_PREFIX)
+    websocket.respond(key)
+
+    _wait_for_stats(connection, "unawaited_responses", 1)
+    assert connection.stats.orphaned_responses == 0
+
+
+@pytest.mark.skipif(
+    PY2 or sys.platform == "win32", reason="Fake server is python3, unix only"
+)
+def test_create_connects_over_unix_socket(tmp_path):
+    from benchmarks.fake_universal_server import FakeUniversalServer
+
+    with FakeUniversalServer(socket_path=str(tmp_path / "usdk.sock")) as server:
+        connection = USDKConnection.create(server)
+        response = connection.command("Server.getInfo", {}, True, 5)
+        connection.close()
+
+    assert response["payload"]["result"] == {"logsDir": "/tmp"}
+    assert server.commands == {"Server.getInfo": 1}
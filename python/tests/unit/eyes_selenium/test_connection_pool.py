@@ -0,0 +1,122 @@
+from threading import Event, Thread
+
+import pytest
+from mock import Mock
+
+from applitools.selenium.connection_pool import (
+    CommandExecutorPool,
+    PoolAffinity,
+    PoolRouting,
+)
+
+
+@pytest.fixture
+def factory():
+    return Mock(side_effect=lambda: Mock(in_flight=0))
+
+
+def test_pool_of_one_shares_executor(factory):
+    pool = CommandExecutorPool(factory)
+
+    assert pool.acquire() is pool.acquire()
+    assert factory.call_count == 1
+
+
+def test_pool_round_robin(factory):
+    pool = CommandExecutorPool(factory, 3)
+
+    executors = [pool.acquire() for _ in range(6)]
+
+    assert executors[:3] == executors[3:]
+    assert len(set(map(id, executors))) == 3
+    assert factory.call_count == 3
+
+
+def test_pool_least_in_flight(factory):
+    pool = CommandExecutorPool(factory, 3, PoolRouting.LEAST_IN_FLIGHT)
+    first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+    first.in_flight, second.in_flight, third.in_flight = 2, 0, 1
+
+    assert len({id(first), id(second), id(third)}) == 3
+    assert pool.acquire() is second
+
+
+def test_pool_thread_affinity(factory):
+    pool = CommandExecutorPool(factory, 2, affinity=PoolAffinity.THREAD)
+    acquired = []
+
+    def acquire_twice():
+        acquired.append((pool.acquire(), pool.acquire()))
+
+    threads = [Thread(target=acquire_twice) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(first is second for first, second in acquired)
+    assert acquired[0][0] is not acquired[1][0]
+
+
+def test_pool_from_env(monkeypatch, factory):
+    monkeypatch.setenv("APPLITOOLS_CONNECTION_POOL_SIZE", "4")
+    monkeypatch.setenv("APPLITOOLS_CONNECTION_POOL_ROUTING", "least-in-flight")
+    monkeypatch.setenv("APPLITOOLS_CONNECTION_POOL_AFFINITY", "thread")
+
+    pool = CommandExecutorPool.from_env(factory)
+
+    assert pool.size == 4
+    assert pool._routing is PoolRouting.LEAST_IN_FLIGHT
+    assert pool._affinity is PoolAffinity.THREAD
+
+
+def test_pool_invalid_size(factory):
+    with pytest.raises(ValueError):
+        CommandExecutorPool(factory, 0)
+
+
+def test_pool_prewarm_creates_all_executors(factory):
+    pool = CommandExecutorPool(factory, 2)
+    pool.prewarm()
+
+    assert factory.call_count == 2
+    assert [pool.acquire(), pool.acquire()] == pool._executors
+    assert factory.call_count == 2
+
+
+def test_pool_prewarm_failure_is_retried_by_acquire():
+    factory = Mock(side_effect=[RuntimeError, Mock(in_flight=0)])
+    pool = CommandExecutorPool(factory)
+    pool.prewarm()
+
+    assert pool.acquire() is not None
+    assert factory.call_count == 2
+
+
+def test_pool_acquire_does_not_wait_for_other_slot_connecting():
+    connecting, release = Event(), Event()
+    connected = Mock(in_flight=0)
+
+    def create():
+        if factory.call_count == 1:
+            return connected
+        connecting.set()
+        release.wait(5)
+        return Mock(in_flight=0)
+
+    factory = Mock(side_effect=create)
+    pool = CommandExecutorPool(factory, 2)
+    pool.acquire()
+    thread = Thread(target=pool.acquire)
+    thread.start()
+    connecting.wait(5)
+
+    acquired = []
+    third = Thread(target=lambda: acquired.append(pool.acquire()))
+    third.start()
+    third.join(1)
+    acquired_while_connecting = list(acquired)
+    release.set()
+    thread.join()
+
+    assert acquired_while_connecting == [connected]
@@ -1,5 +1,6 @@
 import mock
 import pytest
+from six import PY2
 
 from applitools.common import EyesError, MatchLevel, StitchMode
 from applitools.common.selenium import Configuration
@@ -116,3 +117,35 @@ def test_eyes_configuration_alias_setter():
     eyes.configuration = new_configuration
 
     assert eyes.configure is new_configuration
+
+
+@pytest.mark.skipif(PY2, reason="Fake server is python3 only")
+def test_check_many_returns_results_in_order():
+    from benchmarks.fake_universal_server import FakeUniversalServer
+    from benchmarks.scenarios import FakeDriver
+
+    with FakeUniversalServer() as server, server.installed():
+        eyes = Eyes()
+        eyes.open(FakeDriver(), "App", "Test")
+
+        results = eyes.check_many([Target.window(), Target.region("#id")])
+        eyes.close(False)
+
+    assert len(results) == 2 and all(r.as_expected for r in results)
+    assert server.commands["Eyes.check"] == 2
+
+
+@pytest.mark.skipif(PY2, reason="Fake server is python3 only")
+def test_check_many_normalizes_check_settings_as_check():
+    from benchmarks.fake_universal_server import FakeUniversalServer
+    from benchmarks.scenarios import FakeDriver
+
+    with FakeUniversalServer() as server, server.installed():
+        eyes = Eyes()
+        eyes.open(FakeDriver(), "App", "Test")
+
+        results = eyes.check_many([None, "Step"])
+        eyes.close(False)
+
+    assert len(results) == 2 and all(r.as_expected for r in results)
+    assert server.commands["Eyes.check"] == 2
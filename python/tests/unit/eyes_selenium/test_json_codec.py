@@ -0,0 +1,42 @@
+import pytest
+
+from applitools.selenium.json_codec import JsonCodec, available_codecs, get_codec
+
+MESSAGE = {"name": "Eyes.check", "key": "1", "payload": {"text": "שלום"}}
+
+
+@pytest.mark.parametrize("name", sorted(available_codecs()))
+def test_codec_roundtrip(name):
+    codec = available_codecs()[name]
+
+    data = codec.dumps(MESSAGE)
+
+    assert codec.loads(data) == MESSAGE
+    assert JsonCodec.loads(data) == MESSAGE
+
+
+@pytest.mark.parametrize("name", sorted(available_codecs()))
+def test_codec_loads_bytes(name):
+    codec = available_codecs()[name]
+
+    assert codec.loads(JsonCodec.dumps(MESSAGE).encode("utf-8")) == MESSAGE
+
+
+def test_get_codec_by_name():
+    assert get_codec("json") is JsonCodec
+
+
+def test_get_codec_from_env(monkeypatch):
+    monkeypatch.setenv("APPLITOOLS_JSON_CODEC", "json")
+
+    assert get_codec() is JsonCodec
+
+
+def test_get_codec_unavailable_falls_back_to_json():
+    assert get_codec("no-such-codec") is JsonCodec
+
+
+def test_get_codec_default_is_the_fastest_available():
+    preferred = [n for n in ("orjson", "ujson", "json") if n in available_codecs()]
+
+    assert get_codec().name == preferred[0]
@@ -0,0 +1,99 @@
+import pytest
+
+from applitools.common.errors import USDKFailure
+from applitools.selenium import ClassicRunner
+from applitools.selenium.command_executor import CommandExecutor
+from applitools.selenium.metrics import InMemoryMetrics, set_metrics_sink
+
+
+@pytest.fixture
+def metrics():
+    yield set_metrics_sink(InMemoryMetrics())
+    set_metrics_sink(None)
+
+
+class FailingConnection(object):
+    def command(self, name, payload, wait_result, wait_timeout):
+        return {"payload": {"error": {"message": "Failed", "stack": "Stack"}}}
+
+
+def test_in_memory_metrics_aggregation():
+    metrics = InMemoryMetrics(buckets=(0.1, 1.0))
+    metrics.command_sent("Eyes.check", 100, True)
+    metrics.command_sent("Eyes.check", 200, True)
+    metrics.command_sent("Eyes.check", 300, True)
+    metrics.command_sent("Eyes.close", 10, False)
+    metrics.command_completed("Eyes.check", 0.05, 20, None)
+    metrics.command_completed("Eyes.check", 0.5, None, "TimeoutError")
+    metrics.command_error("Eyes.check", "USDKFailure")
+
+    check = metrics.snapshot()["Eyes.check"]
+    close = metrics.snapshot()["Eyes.close"]
+
+    assert check.sent == 3
+    assert check.completed == 2
+    assert check.in_flight == 1
+    assert check.errors == 2
+    assert check.request_bytes == 600
+    assert check.response_bytes == 20
+    assert check.latency_counts == [1, 1, 0]
+    assert check.latency_sum == pytest.approx(0.55)
+    assert check.latency_quantile(0.5) == 0.1
+    assert check.latency_quantile(0.99) == 1.0
+    assert (close.sent, close.in_flight) == (1, 0)
+
+
+def test_in_memory_metrics_snapshot_is_a_copy():
+    metrics = InMemoryMetrics()
+    metrics.command_sent("Eyes.check", 100, True)
+
+    snapshot = metrics.snapshot()
+    metrics.command_completed("Eyes.check", 0.05, 20, None)
+
+    assert snapshot["Eyes.check"].in_flight == 1
+
+
+def test_in_memory_metrics_prometheus_text():
+    metrics = InMemoryMetrics(buckets=(0.1, 1.0))
+    metrics.command_sent("Eyes.check", 100, True)
+    metrics.command_completed("Eyes.check", 0.05, 20, None)
+
+    text = metrics.prometheus_text()
+
+    assert "# TYPE applitools_usdk_command_duration_seconds histogram\n" in text
+    assert (
+        'applitools_usdk_command_duration_seconds_bucket{command="Eyes.check",le="0.1"} 1\n'
+        in text
+    )
+    assert (
+        'applitools_usdk_command_duration_seconds_bucket{command="Eyes.check",le="+Inf"} 1\n'
+        in text
+    )
+    assert (
+        'applitools_usdk_command_duration_seconds_count{command="Eyes.check"} 1\n'
+        in text
+    )
+    assert 'applitools_usdk_commands_in_flight{command="Eyes.check"} 0\n' in text
+    assert (
+        'applitools_usdk_command_request_bytes_total{command="Eyes.check"} 100\n'
+        in text
+    )
+
+
+def test_metrics_of_universal_server_command(metrics):
+    ClassicRunner.get_server_info()
+
+    server_info = metrics.snapshot()["Server.getInfo"]
+    assert server_info.completed == 1
+    assert server_info.in_flight == 0
+    assert server_info.request_bytes > 0
+    assert server_info.response_bytes > 0
+
+
+def test_metrics_of_universal_server_error(metrics):
+    commands = CommandExecutor(FailingConnection())
+
+    with pytest.raises(USDKFailure):
+        commands.server_get_info()
+
+    assert metrics.snapshot()["Server.getInfo"].errors == 1
@@ -1,6 +1,18 @@
-from mock import call, patch
+from concurrent.futures import Future, TimeoutError
 
-from applitools.selenium import ClassicRunner, RunnerOptions, VisualGridRunner
+import pytest
+from mock import ANY, call, patch
+from six import PY2
+
+from applitools.common.errors import EyesError, USDKFailure
+from applitools.common.selenium import Configuration
+from applitools.selenium import (
+    ClassicRunner,
+    Eyes,
+    RunnerOptions,
+    TestResultsHandle,
+    VisualGridRunner,
+)
 from applitools.selenium.__version__ import __version__
 from applitools.selenium.command_executor import ManagerType
 
@@ -42,3 +54,188 @@ def test_runner_get_server_info():
     server_info = ClassicRunner.get_server_info()
 
     assert server_info.logs_dir
+
+
+def test_iter_test_results_yields_failure_of_async_close():
+    get_instance = "applitools.selenium.command_executor.CommandExecutor.get_instance"
+    with patch(get_instance) as get_instance:
+        get_instance().manager_close_manager.return_value = {"results": []}
+        runner = ClassicRunner()
+        failed = Future()
+        failed.set_exception(USDKFailure("close failed", "stack"))
+        runner._add_pending_results(TestResultsHandle(failed, Configuration()))
+
+        results = list(runner.iter_test_results(should_raise_exception=False))
+
+        assert [r.exception for r in results] == [failed.exception()]
+        get_instance().manager_close_manager.assert_called_once_with(
+            runner._ref, False, ANY
+        )
+
+
+def test_iter_test_results_does_not_repeat_failed_async_close():
+    get_instance = "applitools.selenium.command_executor.CommandExecutor.get_instance"
+    with patch(get_instance) as get_instance:
+        get_instance().manager_close_manager.return_value = {
+            "results": [
+                {"error": {"message": "close failed", "stack": ""}, "userTestId": "1"}
+            ]
+        }
+        runner = ClassicRunner()
+        failed = Future()
+        failed.set_exception(USDKFailure("close failed", "stack"))
+        runner._add_pending_results(TestResultsHandle(failed, Configuration(), "1"))
+
+        results = list(runner.iter_test_results(should_raise_exception=False))
+
+    assert [r.exception for r in results] == [failed.exception()]
+
+
+def test_iter_test_results_raises_first_failure():
+    get_instance = "applitools.selenium.command_executor.CommandExecutor.get_instance"
+    with patch(get_instance):
+        runner = ClassicRunner()
+        failed, pending = Future(), Future()
+        failed.set_exception(USDKFailure("close failed", "stack"))
+        runner._add_pending_results(TestResultsHandle(failed, Configuration()))
+        runner._add_pending_results(TestResultsHandle(pending, Configuration()))
+        close_manager = runner._commands.manager_close_manager
+        close_manager.return_value = {"results": []}
+
+        with pytest.raises(USDKFailure):
+            next(runner.iter_test_results())
+
+    close_manager.assert_called_once_with(runner._ref, False, ANY)
+    assert not runner._pending_results
+
+
+@pytest.mark.skipif(PY2, reason="Fake server is python3 only")
+def test_iter_test_results_streams_closed_tests_before_close_manager():
+    from benchmarks.fake_universal_server import FakeUniversalServer
+    from benchmarks.scenarios import FakeDriver
+
+    with FakeUniversalServer(steps_per_test=1, close_delay=0.05) as server:
+        with server.installed():
+            runner = VisualGridRunner()
+            for _ in range(3):
+                eyes = Eyes(runner)
+                eyes.open(FakeDriver(), "App", "Test")
+                eyes.close_async()
+            results = runner.iter_test_results()
+
+            first = next(results)
+            assert "EyesManager.closeManager" not in server.commands
+            rest = list(results)
+
+    assert server.commands["EyesManager.closeManager"] == 1
+    names = sorted(r.test_results.name for r in [first] + rest)
+    assert names == ["Test 0", "Test 1", "Test 2"]
+
+
+@pytest.mark.skipif(PY2, reason="Fake server is python3 only")
+def test_get_all_test_results_calls_on_result_per_test():
+    from benchmarks.fake_universal_server import FakeUniversalServer
+    from benchmarks.scenarios import FakeDriver
+
+    streamed = []
+    with FakeUniversalServer(steps_per_test=1, close_delay=0.01) as server:
+        with server.installed():
+            runner = ClassicRunner()
+            eyes = Eyes(runner)
+            eyes.open(FakeDriver(), "App", "Async close")
+            eyes.close_async()
+            eyes = Eyes(runner)
+            eyes.open(FakeDriver(), "App", "Abort")
+            eyes.abort()
+
+            summary = runner.get_all_test_results(on_result=streamed.append)
+
+    # fake server names the tests in the order they finish closing
+    assert sorted(r.test_results.name for r in streamed) == ["Test 0", "Test 1"]
+    assert sorted(r.test_results.name for r in summary) == ["Test 0", "Test 1"]
+
+
+def test_gather_returns_exceptions_in_order():
+    get_instance = "applitools.selenium.command_executor.CommandExecutor.get_instance"
+    with patch(get_instance):
+        runner = ClassicRunner()
+        failed, aborted = Future(), Future()
+        failed.set_exception(USDKFailure("close failed", "stack"))
+        aborted.set_result(None)  # abort of closed eyes
+        handles = [
+            TestResultsHandle(failed, Configuration()),
+            None,
+            TestResultsHandle(aborted, Configuration()),
+        ]
+
+        with pytest.raises(USDKFailure):
+            runner.gather(handles)
+        results = runner.gather(handles, return_exceptions=True)
+
+    assert results == [failed.exception(), None, None]
+
+
+def test_gathered_results_are_not_iterated_again():
+    get_instance = "applitools.selenium.command_executor.CommandExecutor.get_instance"
+    with patch(get_instance) as get_instance:
+        get_instance().manager_close_manager.return_value = {"results": []}
+        runner = ClassicRunner()
+        failed, pending = Future(), Future()
+        failed.set_exception(USDKFailure("close failed", "stack"))
+        pending.set_exception(USDKFailure("other failed", "stack"))
+        gathered = TestResultsHandle(failed, Configuration())
+        runner._add_pending_results(gathered)
+        runner._add_pending_results(TestResultsHandle(pending, Configuration()))
+
+        runner.gather([gathered], None, True)
+        results = list(runner.iter_test_results(should_raise_exception=False))
+
+    assert [r.exception for r in results] == [pending.exception()]
+
+
+def test_resolved_handles_are_dropped_from_pending_results():
+    get_instance = "applitools.selenium.command_executor.CommandExecutor.get_instance"
+    with patch(get_instance):
+        runner = ClassicRunner()
+        closed, pending = Future(), Future()
+        closed.set_result([])
+        closed_handle = TestResultsHandle(closed, Configuration())
+        pending_handle = TestResultsHandle(pending, Configuration())
+        runner._add_pending_results(closed_handle)
+        runner._add_pending_results(pending_handle)
+
+        assert closed_handle.result() is None
+        with pytest.raises(TimeoutError):
+            pending_handle.result(0.01)
+
+    assert list(runner._pending_results) == [pending]
+
+
+def test_gather_times_out():
+    get_instance = "applitools.selenium.command_executor.CommandExecutor.get_instance"
+    with patch(get_instance):
+        runner = ClassicRunner()
+
+        with pytest.raises(EyesError, match="didn't finish in 0.01 seconds"):
+            runner.gather([TestResultsHandle(Future(), Configuration())], 0.01)
+
+
+@pytest.mark.skipif(PY2, reason="Fake server is python3 only")
+def test_close_async_handles_resolve_to_test_results():
+    from benchmarks.fake_universal_server import FakeUniversalServer
+    from benchmarks.scenarios import FakeDriver
+
+    with FakeUniversalServer(steps_per_test=1, close_delay=0.01) as server:
+        with server.installed():
+            runner = VisualGridRunner()
+            handles = []
+            for _ in range(3):
+                eyes = Eyes(runner)
+                eyes.open(FakeDriver(), "App", "Test")
+                handles.append(eyes.close_async())
+
+            results = runner.gather(handles)
+
+    assert all(isinstance(h, TestResultsHandle) and h.done() for h in handles)
+    assert sorted(r.name for r in results) == ["Test 0", "Test 1", "Test 2"]
+    assert "EyesManager.closeManager" not in server.commands
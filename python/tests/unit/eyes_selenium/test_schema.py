@@ -1,5 +1,6 @@
 from datetime import datetime
 
+import pytest
 from mock import ANY
 from selenium.webdriver.common.by import By
 
@@ -19,11 +20,13 @@ from applitools.common import (
     IosDeviceInfo,
     IosDeviceName,
     IosVersion,
+    LazyTestResults,
     MatchLevel,
     MatchResult,
     ProxySettings,
     RectangleSize,
     Region,
+    RegionSet,
     ScreenOrientation,
     ServerInfo,
     SessionType,
@@ -42,8 +45,9 @@ from applitools.common.test_results import (
 from applitools.core import BatchClose, TextRegionSettings, VisualLocatorSettings
 from applitools.core.cut import FixedCutProvider
 from applitools.core.extract_text import OCRRegion
-from applitools.selenium import TargetPath, schema
+from applitools.selenium import TargetPath, schema, schema_compiler
 from applitools.selenium.fluent import SeleniumCheckSettings
+from benchmarks import payloads
 
 
 class DummyElement(object):
@@ -647,3 +651,167 @@ def test_test_results_summary_demarshal():
         ],
     )
     assert result[1].exception.args == ("error message",)
+
+
+@pytest.mark.parametrize("backend", ["compiled", "marshmallow"])
+def test_close_manager_results_lazy_demarshal(monkeypatch, backend):
+    monkeypatch.setenv("APPLITOOLS_SCHEMA_BACKEND", backend)
+    monkeypatch.setattr(schema_compiler, "_loaders", {})
+    data = payloads.close_manager_result(tests=2, steps=3)
+    config = Configuration(server_url="https://server.url", api_key="key")
+
+    eager = schema.demarshal_close_manager_results(data, config)
+    lazy = schema.demarshal_close_manager_results(data, config, lazy=True)
+
+    test_results = lazy[0].test_results
+    assert isinstance(test_results, LazyTestResults)
+    assert test_results.is_passed
+    assert "steps_info" not in vars(test_results)
+    assert test_results.steps_info == eager[0].test_results.steps_info
+    assert test_results.default_match_settings is None
+    assert test_results._connection_config.api_key == "key"
+    assert [c.test_results.materialize() for c in lazy] == [
+        c.test_results for c in eager
+    ]
+
+
+@pytest.mark.parametrize("backend", ["compiled", "marshmallow"])
+def test_region_set_marshal(monkeypatch, backend):
+    monkeypatch.setenv("APPLITOOLS_SCHEMA_BACKEND", backend)
+    monkeypatch.setattr(schema_compiler, "_dumpers", {})
+    regions = [Region(1, 2, 3, 4), Region(5, 6, 7, 8)]
+    boxed = (
+        SeleniumCheckSettings()
+        .ignore("selector", *regions)
+        .floating(5, regions[0])
+        .floating(5, regions[1])
+    )
+    region_set = (
+        SeleniumCheckSettings()
+        .ignore("selector", RegionSet(regions))
+        .floating(5, RegionSet(regions))
+    )
+
+    dump = schema_compiler.dumper(schema.CheckSettings)
+
+    assert dump(region_set.values) == dump(boxed.values)
+    assert len(dump(region_set.values)["floatingRegions"]) == 2
+
+
+def test_marshal_check_settings_coalesces_regions():
+    check_settings = (
+        SeleniumCheckSettings()
+        .ignore("selector", Region(0, 0, 10, 10), Region(10, 0, 10, 10))
+        .ignore(RegionSet([(0, 0, 10, 10), (0, 10, 20, 5)]))
+        .layout(Region(0, 0, 10, 10))
+        .floating(5, Region(0, 0, 10, 10))
+        .floating(5, Region(0, 0, 10, 10))
+    )
+
+    marshaled = schema.marshal_check_settings(check_settings, coalesce_regions=True)
+
+    assert marshaled["ignoreRegions"] == [
+        {"region": {"type": "css selector", "selector": "selector"}},
+        {"region": {"x": 0.0, "y": 0.0, "width": 20.0, "height": 15.0}},
+    ]
+    assert marshaled["layoutRegions"] == [
+        {"region": {"x": 0.0, "y": 0.0, "width": 10.0, "height": 10.0}}
+    ]
+    assert len(marshaled["floatingRegions"]) == 2
+    assert len(check_settings.values.ignore_regions) == 4
+    assert len(schema.marshal_check_settings(check_settings)["ignoreRegions"]) == 5
+
+
+def test_configuration_marshaler_reuses_result_of_unmodified_configuration():
+    marshaler = schema.ConfigurationMarshaler()
+    config = Configuration(app_name="App", test_name="Test")
+
+    first = marshaler(config)
+
+    assert marshaler(config) is first
+    assert first == schema.marshal_configuration(config)
+
+
+@pytest.mark.parametrize(
+    "modify",
+    [
+        lambda c: c.set_test_name("Other"),
+        lambda c: c.set_match_level(MatchLevel.LAYOUT),
+        lambda c: c.set_ignore_caret(True),
+        lambda c: c.batch.with_batch_id("other"),
+        lambda c: c.batch.add_property("name", "value"),
+        lambda c: c.add_property("name", "value"),
+        lambda c: c.properties.append({"name": "name", "value": "value"}),
+        lambda c: c.add_browser(800, 600, BrowserType.CHROME),
+    ],
+)
+def test_configuration_marshaler_detects_modifications(modify):
+    marshaler = schema.ConfigurationMarshaler()
+    config = Configuration(app_name="App", test_name="Test")
+    first = marshaler(config)
+
+    modify(config)
+
+    assert marshaler(config) == schema.marshal_configuration(config) != first
+
+
+def test_configuration_marshaler_detects_other_configuration():
+    marshaler = schema.ConfigurationMarshaler()
+    config = Configuration(app_name="App", test_name="Test")
+    marshaler(config)
+
+    clone = config.clone().set_test_name("Other")
+
+    assert marshaler(clone)["open"]["testName"] == "Other"
+
+
+def _set_accessibility_level(config, level):
+    config.accessibility_validation.level = level
+
+
+@pytest.mark.parametrize(
+    "prepare, modify",
+    [
+        (
+            lambda c: c.add_property("k", "v1"),
+            lambda c: c.clear_properties().add_property("k", "v2"),
+        ),
+        (
+            lambda c: c.batch.add_property("k", "v1"),
+            lambda c: c.batch.clear_properties().add_property("k", "v2"),
+        ),
+        (
+            lambda c: c.set_accessibility_validation(
+                AccessibilitySettings(
+                    AccessibilityLevel.AA, AccessibilityGuidelinesVersion.WCAG_2_0
+                )
+            ),
+            lambda c: _set_accessibility_level(c, AccessibilityLevel.AAA),
+        ),
+        (
+            lambda c: c.set_proxy(ProxySettings("host", 8080)),
+            lambda c: setattr(c.proxy, "port", 8081),
+        ),
+        (
+            lambda c: c.set_viewport_size(RectangleSize(800, 600)),
+            lambda c: setattr(c.viewport_size, "width", 1024),
+        ),
+        (
+            lambda c: c.add_browser(800, 600, BrowserType.CHROME),
+            lambda c: setattr(c.browsers_info[0], "browser_type", BrowserType.FIREFOX),
+        ),
+        (
+            lambda c: c.set_visual_grid_options(VisualGridOption("k", "v1")),
+            lambda c: setattr(c.visual_grid_options[0], "value", "v2"),
+        ),
+    ],
+)
+def test_configuration_marshaler_detects_in_place_modifications(prepare, modify):
+    marshaler = schema.ConfigurationMarshaler()
+    config = Configuration(app_name="App", test_name="Test")
+    prepare(config)
+    first = marshaler(config)
+
+    modify(config)
+
+    assert marshaler(config) == schema.marshal_configuration(config) != first
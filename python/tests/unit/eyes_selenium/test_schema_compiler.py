@@ -0,0 +1,199 @@
+from datetime import datetime
+
+import pytest
+from marshmallow import Schema
+from selenium.webdriver.common.by import By
+
+from applitools.common import (
+    AccessibilityGuidelinesVersion,
+    AccessibilityLevel,
+    AccessibilityRegionType,
+    AccessibilitySettings,
+    AndroidDeviceInfo,
+    AndroidDeviceName,
+    BatchInfo,
+    ChromeEmulationInfo,
+    DeviceName,
+    IosDeviceInfo,
+    IosDeviceName,
+    MatchLevel,
+    ProxySettings,
+    RectangleSize,
+    Region,
+    RegionSet,
+    ScreenOrientation,
+    SessionType,
+    VisualGridOption,
+)
+from applitools.common.selenium import BrowserType, Configuration
+from applitools.core import TextRegionSettings, VisualLocatorSettings
+from applitools.core.cut import FixedCutProvider
+from applitools.images import Target as ImagesTarget
+from applitools.selenium import Target, schema, schema_compiler
+from applitools.selenium.schema_fields import check_error
+from benchmarks import payloads
+
+
+def all_schemas():
+    return sorted(
+        (
+            v
+            for v in vars(schema).values()
+            if isinstance(v, type)
+            and issubclass(v, (Schema, schema.USDKSchema))
+            and v not in (Schema, schema.USDKSchema)
+        ),
+        key=lambda s: s.__name__,
+    )
+
+
+def rich_configuration():
+    config = Configuration(app_name="App", test_name="Test")
+    config.api_key = "API KEY"
+    config.save_debug_screenshots = True
+    config.set_proxy(ProxySettings("host", 80, "user", "pass"))
+    config.set_session_type(SessionType.SEQUENTIAL)
+    config.set_viewport_size(RectangleSize(800, 600))
+    config.add_property("prop name", "prop value")
+    config.set_batch(BatchInfo("batch name", datetime(2000, 1, 1), "sequence name"))
+    config.batch.add_property("batch prop name", "batch prop value")
+    config.default_match_settings.accessibility_settings = AccessibilitySettings(
+        AccessibilityLevel.AA, AccessibilityGuidelinesVersion.WCAG_2_1
+    )
+    config.host_os = "host os"
+    config.stitch_overlap = 10
+    config.cut_provider = FixedCutProvider(1, 2, 3, 4)
+    config.set_visual_grid_options(VisualGridOption("key", "value"))
+    config.set_layout_breakpoints(1, 2, 3)
+    config.add_browser(800, 600, BrowserType.CHROME)
+    config.add_browser(ChromeEmulationInfo(DeviceName.iPhone_X))
+    config.add_mobile_device(AndroidDeviceInfo(AndroidDeviceName.Pixel_6))
+    config.add_mobile_device(
+        IosDeviceInfo(IosDeviceName.iPhone_X, ScreenOrientation.LANDSCAPE)
+    )
+    return config
+
+
+def rich_check_settings():
+    check_settings = (
+        Target.region("region selector")
+        .frame([By.CSS_SELECTOR, "frame selector"])
+        .scroll_root_element("scroll root selector")
+        .with_name("name")
+        .fully()
+        .match_level(MatchLevel.LAYOUT)
+        .lazy_load()
+        .visual_grid_options(VisualGridOption("key", "value"))
+        .ignore("ignore selector", padding={"top": 5}, region_id="ignore id")
+        .layout(Region(1, 2, 3, 4))
+        .content(Region(10.5, 11, 12, 13))
+        .floating(10, "floating selector")
+        .floating(20, Region(20, 21, 22, 23))
+        .accessibility("selector", AccessibilityRegionType.BoldText)
+        .accessibility(Region(30, 31, 32, 33), AccessibilityRegionType.LargeText)
+    )
+    check_settings.before_render_screenshot_hook("hook")
+    return check_settings
+
+
+MARSHALED = [
+    (schema.OpenSettings, rich_configuration),
+    (schema.EyesConfig, rich_configuration),
+    (schema.CloseSettings, rich_configuration),
+    (schema.OpenSettings, Configuration),
+    (schema.EyesConfig, Configuration),
+    (schema.CheckSettings, lambda: rich_check_settings().values),
+    (schema.CheckSettings, lambda: Target.window().values),
+    (
+        schema.CheckSettings,
+        lambda: Target.window()
+        .ignore(RegionSet([(1, 2, 3, 4)]), Region(5, 6, 7, 8))
+        .floating(5, RegionSet([(1, 2, 3, 4), (9, 9, 9, 9)]))
+        .values,
+    ),
+    (schema.CheckSettings, lambda: ImagesTarget.image("image").values),
+    (schema.CheckSettings, lambda: ImagesTarget.region("i", Region(1, 2, 3, 4)).values),
+    (schema.LocateSettings, lambda: VisualLocatorSettings("a", "b").values),
+    (schema.OCRSearchSettings, lambda: TextRegionSettings("pattern").ignore_case()),
+    (schema.Size, lambda: RectangleSize(800, 600)),
+    (schema.ImageTarget, lambda: {"image": "image"}),
+]
+
+
+@pytest.mark.parametrize("schema_class, make_object", MARSHALED)
+def test_compiled_dump_matches_marshmallow(schema_class, make_object):
+    obj = make_object()
+
+    compiled = schema_compiler.compile_dumper(schema_class)(obj)
+
+    assert compiled == check_error(schema_class().dump(obj))
+
+
+@pytest.mark.parametrize(
+    "schema_class, data",
+    [
+        (schema.TestResultsSummary, payloads.close_manager_result(tests=3, steps=3)),
+        (schema.TestResults, payloads.test_results_payload(steps=2)),
+        (schema.TestResults, {}),
+        (schema.MatchResult, {"asExpected": True, "windowId": "5"}),
+        (schema.Region, {"x": 1, "y": 2, "width": 3, "height": 4}),
+        (schema.Region, {"left": 1, "top": 2, "width": 3, "height": 4}),
+        (schema.ServerInfo, {"logsDir": "/tmp"}),
+        (schema.DesktopBrowserRenderer, {"name": "firefox", "width": 1, "height": 2}),
+        (
+            schema.TestResultContainer,
+            {
+                "result": {},
+                "error": None,
+                "renderer": {"iosDeviceInfo": {"deviceName": "iPhone X"}},
+            },
+        ),
+    ],
+)
+def test_compiled_load_matches_marshmallow(schema_class, data):
+    compiled = schema_compiler.compile_loader(schema_class)(data)
+
+    assert compiled == check_error(schema_class().load(data))
+
+
+def test_compiled_load_of_error():
+    data = {"result": {}, "error": {"message": "error", "stack": "stack"}}
+
+    compiled = schema_compiler.compile_loader(schema.TestResultContainer)(data)
+    expected = check_error(schema.TestResultContainer().load(data))
+
+    assert repr(compiled.exception) == repr(expected.exception)
+
+
+@pytest.mark.parametrize("schema_class", all_schemas(), ids=lambda s: s.__name__)
+def test_all_schemas_are_compiled(schema_class):
+    assert hasattr(schema_compiler.compile_dumper(schema_class), "source")
+    if schema_class not in (
+        schema.EyesConfig,  # these have attributes of nested objects
+        schema.StaticDriver,
+        schema.DeleteTestSettings,
+    ):
+        assert hasattr(schema_compiler.compile_loader(schema_class), "source")
+
+
+@pytest.mark.parametrize(
+    "load", [schema_compiler.compile_loader, lambda s: lambda d: s().load(d)]
+)
+def test_invalid_value_is_not_loaded(load):
+    with pytest.raises(RuntimeError, match="Internal serialization error"):
+        check_error(load(schema.MatchResult)({"asExpected": "maybe"}))
+
+
+def test_invalid_value_is_not_dumped():
+    with pytest.raises(RuntimeError, match="Internal serialization error"):
+        schema_compiler.compile_dumper(schema.Size)({"width": "wide"})
+
+
+def test_marshmallow_backend_is_used_when_requested(monkeypatch):
+    monkeypatch.setenv(schema_compiler.SCHEMA_BACKEND_ENV, "marshmallow")
+    monkeypatch.setattr(schema_compiler, "_dumpers", {})
+
+    dump = schema_compiler.dumper(schema.Size)
+
+    assert not hasattr(dump, "source")
+    assert dump(RectangleSize(1, 2)) == {"width": 1, "height": 2}
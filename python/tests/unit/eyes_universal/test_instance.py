@@ -1,3 +1,4 @@
+import os
 import sys
 from subprocess import PIPE, Popen
 from time import sleep
@@ -47,3 +48,56 @@ def test_automatic_eyes_universal_termination_on_python_termination(reason):
     # terminated eyes_universal leaving it as a zombie.
     # Looks like there is nothing we can do about it except accept.
     assert eyes_universal_status in ("terminated", "zombie")
+
+
+def test_prewarm_starts_single_server():
+    code = (
+        "import sys;"
+        "import applitools.eyes_universal as eyes_universal;"
+        "ready = eyes_universal.prewarm();"
+        "print(ready.wait(60), eyes_universal.get_instance());"
+        "sys.stdout.flush();"
+        "sys.stdin.readline();"
+    )
+    python_process = Popen([sys.executable, "-c", code], stdin=PIPE, stdout=PIPE)
+    output_line = python_process.stdout.readline()
+    children = psutil.Process(python_process.pid).children()
+    python_process.stdin.write(b"\n")
+    python_process.stdin.flush()
+    python_process.wait()
+
+    assert output_line.startswith(b"True SDKServer")
+    assert len(children) == 1
+
+
+def test_prewarm_after_server_start_is_ready(monkeypatch):
+    import applitools.eyes_universal as eyes_universal
+
+    get_instance()
+    monkeypatch.setattr(eyes_universal, "_prewarm_ready", None)
+
+    assert eyes_universal.prewarm().is_set()
+
+
+def test_import_with_prewarm_requested_starts_server():
+    code = (
+        "import sys;"
+        "import applitools.eyes_universal as eyes_universal;"
+        "import applitools.selenium;"
+        "ready = eyes_universal._prewarm_ready;"
+        "print(ready.wait(60), eyes_universal.get_instance());"
+        "sys.stdout.flush();"
+        "sys.stdin.readline();"
+    )
+    env = dict(os.environ, APPLITOOLS_UNIVERSAL_PREWARM="1")
+    python_process = Popen(
+        [sys.executable, "-c", code], stdin=PIPE, stdout=PIPE, env=env
+    )
+    output_line = python_process.stdout.readline()
+    children = psutil.Process(python_process.pid).children()
+    python_process.stdin.write(b"\n")
+    python_process.stdin.flush()
+    python_process.wait()
+
+    assert output_line.startswith(b"True SDKServer")
+    assert len(children) == 1
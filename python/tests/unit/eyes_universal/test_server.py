@@ -1,3 +1,5 @@
+import socket
+import sys
 from io import BytesIO
 
 import pytest
@@ -22,3 +24,27 @@ def test_sdk_server_parses_port(popen_mock):
     server = SDKServer()
 
     assert server.port == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="No unix sockets on windows")
+def test_sdk_server_falls_back_to_port_when_socket_is_not_listening(
+    popen_mock, tmp_path
+):
+    popen_mock.stdout = BytesIO(b"undefined\n1\n")
+
+    server = SDKServer(socket_path=str(tmp_path / "usdk.sock"))
+
+    assert server.socket_path is None
+    assert server.port == 1
+    popen_mock.kill.assert_called_once_with()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="No unix sockets on windows")
+def test_sdk_server_listens_on_socket(tmp_path):
+    server = SDKServer(socket_path=str(tmp_path / "usdk.sock"))
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(server.socket_path)
+    sock.close()
+    assert server.port is None
+    assert repr(server).startswith("SDKServer(socket_path=")
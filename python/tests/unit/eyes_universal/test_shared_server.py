@@ -0,0 +1,104 @@
+import json
+import socket
+import sys
+from subprocess import PIPE, Popen
+from time import sleep
+
+import psutil
+import pytest
+
+from applitools.eyes_universal.shared_server import SharedSDKServer, is_shared_mode
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="Client processes are not tracked on windows"
+)
+
+
+def start_client(directory):
+    # A python program that attaches to the shared server and waits on stdin
+    code = (
+        "import sys;"
+        "from applitools.eyes_universal.shared_server import SharedSDKServer;"
+        "server = SharedSDKServer({!r});"
+        "print(server.pid, server.port);"
+        "sys.stdout.flush();"
+        "sys.stdin.readline();"
+    ).format(directory)
+    process = Popen([sys.executable, "-c", code], stdin=PIPE, stdout=PIPE)
+    pid, port = map(int, process.stdout.readline().split())
+    return process, pid, port
+
+
+def stop_client(process):
+    process.stdin.write(b"\n")
+    process.stdin.flush()
+    process.wait()
+
+
+def is_running(pid):
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def test_shared_server_is_stopped_by_the_last_client(tmpdir):
+    directory = str(tmpdir.join("shared"))
+    first, server_pid, port = start_client(directory)
+    second, second_server_pid, second_port = start_client(directory)
+
+    assert (second_server_pid, second_port) == (server_pid, port)
+
+    stop_client(first)
+    sleep(0.5)
+    assert is_running(server_pid)
+
+    stop_client(second)
+    sleep(0.5)
+    assert not is_running(server_pid)
+
+
+def test_shared_server_survives_crashed_client(tmpdir):
+    directory = str(tmpdir.join("shared"))
+    crashed, server_pid, _ = start_client(directory)
+    crashed.kill()
+    crashed.wait()
+
+    server = SharedSDKServer(directory)
+    assert server.pid == server_pid
+
+    server.release()
+    sleep(0.5)
+    assert not is_running(server_pid)
+
+
+@pytest.mark.parametrize("server_alive", [True, False])
+def test_shared_server_is_not_attached_to_other_program_on_its_port(
+    tmpdir, server_alive
+):
+    # published server process, either exited or not the universal server
+    published = Popen([sys.executable, "-c", "input()"], stdin=PIPE)
+    if not server_alive:
+        stop_client(published)
+    other_program = socket.socket()
+    other_program.bind(("127.0.0.1", 0))
+    other_program.listen(1)
+    _, port = other_program.getsockname()
+    tmpdir.mkdir("shared").join("server.json").write(
+        json.dumps({"pid": published.pid, "port": port})
+    )
+
+    server = SharedSDKServer(str(tmpdir.join("shared")))
+    other_program.close()
+    server.release()
+    if server_alive:
+        stop_client(published)
+
+    assert (server.pid, server.port) != (published.pid, port)
+
+
+def test_is_shared_mode(monkeypatch):
+    monkeypatch.setenv("APPLITOOLS_UNIVERSAL_SHARED", "true")
+    assert is_shared_mode()
+    monkeypatch.setenv("APPLITOOLS_UNIVERSAL_SHARED", "0")
+    assert not is_shared_mode()
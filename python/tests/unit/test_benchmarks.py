@@ -0,0 +1,31 @@
+import pytest
+from six import PY2
+
+pytestmark = pytest.mark.skipif(PY2, reason="Benchmarks are python3 only")
+
+
+def test_benchmarks_quick_run(capsys):
+    from benchmarks.__main__ import main
+    from benchmarks.scenarios import SCENARIOS
+
+    report = main(["--quick", "--no-save"])
+
+    assert sorted(report["results"]) == sorted(SCENARIOS)
+    assert report["results"]["selenium_check_throughput"]["checks_per_second"] > 0
+    assert "images_check_throughput" in capsys.readouterr().out
+
+
+def test_fake_universal_server_counts_commands():
+    from applitools.selenium import ClassicRunner
+    from benchmarks.fake_universal_server import FakeUniversalServer
+
+    with FakeUniversalServer() as server, server.installed():
+        ClassicRunner()
+        server_info = ClassicRunner.get_server_info()
+
+    assert server_info.logs_dir == "/tmp"
+    assert server.commands == {
+        "Core.makeCore": 1,
+        "Core.makeManager": 1,
+        "Server.getInfo": 1,
+    }